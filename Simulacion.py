@@ -1,7 +1,14 @@
 from plane import plane
-from heap import heap
+from heap import heap, espacio_aereo
+from historia import nuevo_registro
+from estados import REINSERTADO, ATERRIZO
 import random
+from array import array
+from typing import NamedTuple
+import numpy as np
 from analisis import MetricasSimulacion
+from politicas import politica_base
+from simulacion_vectorizada import _generador
 
 # ============================================================
 # ENUNCIADO / PARTE 1 y PARTE 3
@@ -9,176 +16,324 @@ from analisis import MetricasSimulacion
 # SE USA EN EL EJERCICIO 3 (probabilidad de 5 aviones en una hora).
 # ============================================================
 
-def run_simulacion(lambda_por_min, minutos = 1080, seed = None):
-    if seed is not None:
-        random.seed(seed)
+def run_simulacion(lambda_por_min, minutos = 1080, seed = None, rng = None):
+    # GENERADOR PROPIO DE LA CORRIDA (random.Random(seed) REPRODUCE LO QUE DABA random.seed(seed))
+    if rng is None:
+        rng = random.Random(seed)
 
     # FILAS DE AVIONES
     avs = heap()         # FILA PRINCIPAL
-    desviados = heap()   # DESVIADOS POR CONGESTIÓN
-    montevideo = heap()  # AVIONES QUE SE VAN A MONTEVIDEO
-    viento = heap()      # DESVIADOS POR DÍA VENTOSO
-    tormenta = heap()    # DESVIADOS POR TORMENTA
+    desviados = heap(ordenar_al_modificar = True)   # DESVIADOS POR CONGESTIÓN
+    montevideo = heap(ordenar_al_modificar = True)  # AVIONES QUE SE VAN A MONTEVIDEO
+    viento = heap(ordenar_al_modificar = True)      # DESVIADOS POR DÍA VENTOSO
+    tormenta = heap(ordenar_al_modificar = True)    # DESVIADOS POR TORMENTA
+    espacio = espacio_aereo(avs, desviados, montevideo, viento, tormenta, rng = rng)
     next_id = 1
 
     # RECORRE CADA MINUTO DEL PERIODO SIMULADO
     for minuto in range(minutos):
         # CON PROBABILIDAD λ APARECE UN NUEVO AVIÓN
-        if random.random() < lambda_por_min:
-            nuevo = plane(
-                id = next_id, 
-                minuto_aparicion = minuto, 
-                fila = avs,
-                desviados = desviados,
-                mtvd = montevideo,
-                viento = viento,
-                tormenta = tormenta
-            )
+        if rng.random() < lambda_por_min:
+            nuevo = plane(id = next_id, minuto_aparicion = minuto, espacio = espacio)
             avs.agregar_avion(nuevo)
             next_id += 1
 
     # DEVUELVE SOLO LOS AVIONES EN FILA (se usa para contar arribos)
     return avs.aviones
 
+# ============================================================
+# ENUNCIADO / PARTE 3
+# SOLO ARRIBOS, SIN AVIONES NI FILAS: n_sim VENTANAS DE "minutos" MINUTOS A LA VEZ.
+# EN CADA MINUTO LLEGA UN AVIÓN CON PROBABILIDAD λ (MISMO PROCESO QUE run_simulacion),
+# SORTEADO COMO UNA MATRIZ (ventanas × minutos) DE BERNOULLIS, EN BLOQUES PARA ACOTAR MEMORIA.
+# LOS NÚMEROS SON LOS DE random.Random(seed) (un MT19937 sembrado igual, ver simulacion_vectorizada),
+# VENTANA TRAS VENTANA: CON LA MISMA SEMILLA LA VENTANA 0 TIENE LOS ARRIBOS DE run_simulacion.
+# DEVUELVE LA CANTIDAD DE ARRIBOS POR VENTANA Y, SI SE PIDEN, LOS MINUTOS DE CADA ARRIBO
+# (arreglos planos "ventana" y "minuto", ordenados por ventana y minuto).
+# ============================================================
+
+def simular_arribos(lambda_por_min, minutos = 60, n_sim = 1, seed = None, con_tiempos = True, bloque = 50_000):
+    rng = _generador(seed)
+    conteos = np.empty(n_sim, dtype = np.int64)
+    ventanas, tiempos = [], []
+
+    for inicio in range(0, n_sim, bloque):
+        fin = min(inicio + bloque, n_sim)
+        llegadas = rng.random_sample((fin - inicio, minutos)) < lambda_por_min
+        conteos[inicio:fin] = llegadas.sum(axis = 1)
+        if con_tiempos:
+            v, m = np.nonzero(llegadas)
+            ventanas.append(v + inicio)
+            tiempos.append(m)
+
+    resultado = {"conteos": conteos}
+    if con_tiempos:
+        resultado["ventana"] = np.concatenate(ventanas) if ventanas else np.empty(0, dtype = np.int64)
+        resultado["minuto"] = np.concatenate(tiempos) if tiempos else np.empty(0, dtype = np.int64)
+    return resultado
+
+# ============================================================
+# ENUNCIADO / PARTE 3
+# ESTIMACIÓN MONTE CARLO DE P(N = k) ARRIBOS EN UNA VENTANA, CON ERROR ESTÁNDAR E IC 95%.
+# ============================================================
+
+def estimar_prob_arribos(k, lambda_por_min = 1/60, minutos = 60, n_sim = 200_000, seed = None):
+    conteos = simular_arribos(lambda_por_min, minutos, n_sim, seed, con_tiempos = False)["conteos"]
+    p_hat = float(np.mean(conteos == k))
+    se = float(np.sqrt(p_hat * (1 - p_hat) / n_sim))   # error estándar
+    ic = (p_hat - 1.96 * se, p_hat + 1.96 * se)      # IC 95%
+    return p_hat, se, ic
+
+# ============================================================
+# MODO POR EVENTOS: CON EL ESPACIO AÉREO VACÍO, EL PRÓXIMO EVENTO ES EL PRÓXIMO ARRIBO.
+# DEVUELVE EL PRIMER MINUTO DESDE t EN QUE LLEGA UN AVIÓN (o minutos SI NO LLEGA NINGUNO),
+# SORTEANDO UN NÚMERO POR MINUTO COMO EL BUCLE NORMAL (mismos resultados con la misma semilla).
+# ============================================================
+
+def _proximo_arribo(t, minutos, lambda_por_min, rng):
+    while t < minutos and rng.random() >= lambda_por_min:
+        t += 1
+    return t
+
 # ============================================================
 # ENUNCIADO / PARTES 1, 4, 5 y 6
 # FUNCIÓN COMPLETA DE SIMULACIÓN CON HISTORIA DETALLADA:
 # GUARDA TIEMPOS, POSICIONES, VELOCIDADES Y ESTADOS DE CADA AVIÓN.
 # SE USA EN EL EJERCICIO 1 (visualización), EJERCICIO 4 (congestión),
 # EJERCICIO 5 (día ventoso) y EJERCICIO 6 (tormenta).
+# ES EL ÚNICO MOTOR: LA MEJORA Y LOS PRIORITARIOS SON ESTE MISMO BUCLE CON OTRA
+# politica (ver politicas.py, simulacion_mejorado.py y simulacion_prioritarios.py).
 # ============================================================
 
 def simular_con_historia(lambda_por_min, minutos, seed = None, dia_ventoso = True,
-                         inicio_tormenta = None, metricas = MetricasSimulacion()):
-    
-    if seed is not None:
-        random.seed(seed)
+                         inicio_tormenta = None, metricas = None, por_eventos = False, rng = None, record = "full",
+                         politica = None):
+    # CORRE TODOS LOS MINUTOS Y DEVUELVE EL RESULTADO FINAL
+    # (sin metricas, unas nuevas: un MetricasSimulacion() por defecto sería el mismo en todas las llamadas)
+    if metricas is None:
+        metricas = MetricasSimulacion()
+    pasos = _correr_minutos(lambda_por_min, minutos, seed, dia_ventoso, inicio_tormenta, metricas, por_eventos, rng, record, politica,
+                            por_minuto = False)
+    while True:
+        try:
+            next(pasos)
+        except StopIteration as fin:
+            return fin.value
+
+
+def _correr_minutos(lambda_por_min, minutos, seed, dia_ventoso, inicio_tormenta, metricas, por_eventos, rng, record, politica,
+                    por_minuto = True):
+    # EL BUCLE DE LA SIMULACIÓN COMO GENERADOR: DESPUÉS DE CADA MINUTO SIMULADO DEVUELVE
+    # (t, filas, contadores) CON LAS FILAS Y LOS CONTADORES VIVOS; AL TERMINAR, EL RESULTADO
+    # DE simular_con_historia (StopIteration.value). CON por_minuto = False NO SE DETIENE EN
+    # CADA MINUTO (simular_con_historia: corre todo de una y solo devuelve el resultado)
+
+    # GENERADOR PROPIO DE LA CORRIDA (random.Random(seed) REPRODUCE LO QUE DABA random.seed(seed))
+    if rng is None:
+        rng = random.Random(seed)
+    # POLÍTICA DE LA CORRIDA (modelo base si no se pide otra); SUS MÉTODOS SE RESUELVEN UNA VEZ ACÁ
+    if politica is None:
+        politica = politica_base()
+    politica.preparar(minutos)
+    inicio_minuto, llegada, contar = politica.inicio_minuto, politica.llegada, politica.contar
         
     # FILAS DE AVIONES
     avs = heap()
-    desviados = heap()
-    montevideo = heap()
-    viento = heap()
-    tormenta = heap()
+    desviados = heap(ordenar_al_modificar = True)
+    montevideo = heap(ordenar_al_modificar = True)
+    viento = heap(ordenar_al_modificar = True)
+    tormenta = heap(ordenar_al_modificar = True)
     next_id = 1
-    historia = {}  # GUARDA LA TRAYECTORIA DE CADA AVIÓN
-
-    # DICCIONARIOS PARA GUARDAR MÉTRICAS MINUTO A MINUTO
-    congestion = {t: 0 for t in range(minutos)}
-    desvios_montevideo = {t: 0 for t in range(minutos)}
-    desvios_fila = {t: 0 for t in range(minutos)}
-    desvios_viento = {t: 0 for t in range(minutos)}
-    desvios_tormenta = {t: 0 for t in range(minutos)}  
+    # GUARDA LA TRAYECTORIA DE CADA AVIÓN (record = "full"), UNA FILA POR AVIÓN ("summary") O NADA ("off")
+    historia = nuevo_registro(record, politica.nombres)
+    espacio = espacio_aereo(avs, desviados, montevideo, viento, tormenta, historia, rng, politica)
+    # MÉTODOS QUE SE LLAMAN POR AVIÓN Y POR MINUTO, RESUELTOS UNA VEZ
+    registrar, registrar_estado, nuevo_avion = historia.registrar, historia.registrar_estado, historia.nuevo_avion
+    registrar_aviones = metricas.registrar_aviones
+    en_fila = avs.aviones
+    azar = rng.random
+
+    # CONTADORES MINUTO A MINUTO (arreglos de enteros de largo fijo; se devuelven como arreglos numpy).
+    # LA CONGESTIÓN LA CUENTA LA POLÍTICA (la mejora lleva además la señal de control)
+    series_politica = politica.series()
+    congestion = series_politica["congestion"]
+    desvios_montevideo = array("q", [0]) * minutos
+    desvios_fila = array("q", [0]) * minutos
+    desvios_viento = array("q", [0]) * minutos
+    desvios_tormenta = array("q", [0]) * minutos
  
 
+    filas = (avs, desviados, viento, tormenta)
+    contadores = (congestion, desvios_montevideo, desvios_fila, desvios_viento, desvios_tormenta)
+
     # EJERCICIO 6 
     duracion_tormenta = 30
 
     # RECORRE TODOS LOS MINUTOS DE SIMULACIÓN
-    for t in range(minutos):
+    t = 0
+    while t < minutos:
+        # MODO POR EVENTOS: SI NO HAY NADIE EN EL AIRE, UN MINUTO SIN ARRIBOS NO CAMBIA NADA
+        # (sus métricas quedan en 0), ASÍ QUE SE SALTA DIRECTO AL PRÓXIMO ARRIBO.
+        if por_eventos and not (avs.aviones or desviados.aviones or viento.aviones or tormenta.aviones):
+            desde = t
+            t = _proximo_arribo(t, minutos, lambda_por_min, rng)
+            politica.saltar(desde, t)
+            if t == minutos:
+                break
+            llega = True
+        else:
+            llega = azar() < lambda_por_min
 
         # CHEQUEA SI LA TORMENTA ESTÁ ACTIVA (PARTE 6)
         tormenta_activa = (
             inicio_tormenta is not None and 
             inicio_tormenta <= t < inicio_tormenta + duracion_tormenta
         )
+        inicio_minuto(t)
 
         # ----------------------------------------------
         # GENERACIÓN DE NUEVOS AVIONES SEGÚN λ
         # ----------------------------------------------
 
-        if random.random() < lambda_por_min:
-            a = plane(id = next_id, 
-                      minuto_aparicion = t, 
-                      fila = avs, 
-                      desviados = desviados, 
-                      mtvd = montevideo, 
-                      viento = viento, 
-                      tormenta = tormenta,
-                      historia = historia
-            )
-
-            metricas.registrar_aviones()
+        if llega:
+            a = plane(id = next_id, minuto_aparicion = t, espacio = espacio)
+
+            registrar_aviones()
             avs.agregar_avion(a)
-            historia[a.id] = {"t": [], "x": [], "v": [], "estado": [], "vmax": []}
+            # AJUSTES DE LA POLÍTICA AL APARECER (clase de prioridad, techo de la mejora)
+            nuevo_avion(a.id, llegada(a, rng))
             next_id += 1
 
         # ----------------------------------------------
         # ACTUALIZA EL ESTADO DE TODOS LOS AVIONES EN FILA
         # ----------------------------------------------
         
-        for a in list(avs.aviones):
-            a.avanzar(minuto_actual = t, 
-                      dt = 1.0, 
-                      hay_viento = dia_ventoso,  
-                      tormenta_activa = tormenta_activa, 
-                      metricas = metricas
-            )
-
-            # MÉTRICA DE CONGESTIÓN: velocidad < vmax
-            if (a.estado in ["En fila", "Reinsertado"]) and a.velocidad_actual < a.v_max:
-                congestion[t] += 1
-
-            # SI ATERRIZÓ 
-            if a.estado == "Aterrizó":
-                historia[a.id]["t"].append(t)
-                historia[a.id]["estado"].append(a.estado)
-        
-            
-            # SI NO ATERRIZÓ → REGISTRAR SU POSICIÓN Y VELOCIDAD
-            if a.estado != "Aterrizó":
-                historia[a.id]["t"].append(t)
-                historia[a.id]["x"].append(a.distancia_mn_aep)
-                historia[a.id]["v"].append(a.velocidad_actual)
-                historia[a.id]["estado"].append(a.estado)
-                historia[a.id]["vmax"].append(a.v_max)
+        for a in en_fila[:]:
+            a.avanzar(t, 1.0, dia_ventoso, tormenta_activa, metricas)
+
+            # MÉTRICA DE CONGESTIÓN: velocidad < vmax (y por debajo del techo, en la mejora)
+            contar(a, t)
+
+            # SI ATERRIZÓ SOLO SE REGISTRA EL ESTADO; SI NO, SU POSICIÓN Y VELOCIDAD
+            codigo = a.codigo
+            if codigo == ATERRIZO:
+                registrar_estado(a.id, t, codigo)
+            else:
+                registrar(a.id, t, a.distancia_mn_aep, a.velocidad_actual, codigo, a.v_max)
         # ----------------------------------------------
         # ACTUALIZA AVIONES DESVIADOS (congestión)
         # ----------------------------------------------
         
-        for d in list(desviados.aviones):
+        for d in desviados.aviones[:]:
             desvios_fila[t] += 1
-            d.avanzar(t, dt = 1.0, hay_viento = dia_ventoso, tormenta_activa = tormenta_activa, metricas = metricas)
-            if d.estado == "Reinsertado":
+            d.avanzar(t, 1.0, dia_ventoso, tormenta_activa, metricas)
+            if d.codigo == REINSERTADO:
                 metricas.registrar_reinsercion(d.id)
 
         # ----------------------------------------------
         # ACTUALIZA AVIONES DESVIADOS POR VIENTO
         # ----------------------------------------------
         
-        for v in list(viento.aviones):
+        for v in viento.aviones[:]:
             desvios_viento[t] += 1
-            v.avanzar(t, dt = 1.0, hay_viento = dia_ventoso,
-                      tormenta_activa = tormenta_activa, metricas = metricas)
+            v.avanzar(t, 1.0, dia_ventoso, tormenta_activa, metricas)
 
         # ----------------------------------------------
         # ACTUALIZA AVIONES DESVIADOS POR TORMENTA
         # ----------------------------------------------
         
-        for r in list(tormenta.aviones):
+        for r in tormenta.aviones[:]:
             desvios_tormenta[t] += 1
-            r.avanzar(t, dt = 1.0, hay_viento = dia_ventoso,
-                      tormenta_activa = tormenta_activa, metricas = metricas)
+            r.avanzar(t, 1.0, dia_ventoso, tormenta_activa, metricas)
         
         # ----------------------------------------------
         # ACTUALIZA AVIONES QUE YA SE FUERON A MONTEVIDEO
         # ----------------------------------------------
             
-        for av in list(montevideo.aviones):
+        for av in montevideo.aviones[:]:
             desvios_montevideo[t] += 1
-            historia[av.id]["t"].append(t)
-            historia[av.id]["estado"].append(av.estado)
+            historia.registrar_estado(av.id, t, av.codigo)
             montevideo.aviones.remove(av)
+
+        if por_minuto:
+            yield t, filas, contadores
+        t += 1
         
     # AL FINAL: CUÁNTOS AVIONES QUEDARON EN EL AIRE
     metricas.en_vuelo(len(avs.aviones) + len(desviados.aviones) + len(viento.aviones) + len(tormenta.aviones))
 
     # DEVUELVE LA HISTORIA COMPLETA + MÉTRICAS MINUTO A MINUTO
     return {
-        "historia": historia,
-        "congestion": congestion,
-        "desvios_montevideo": desvios_montevideo,
-        "desvios_fila": desvios_fila,
-        "desvios_viento": desvios_viento,
-        "desvios_tormenta": desvios_tormenta
-        }
\ No newline at end of file
+        "historia": historia if record == "full" else None,
+        "resumen": historia.resumen if record == "full" else (historia if record == "summary" else None),
+        **{nombre: np.frombuffer(serie, dtype = np.int64) for nombre, serie in series_politica.items()},
+        "desvios_montevideo": np.frombuffer(desvios_montevideo, dtype = np.int64),
+        "desvios_fila": np.frombuffer(desvios_fila, dtype = np.int64),
+        "desvios_viento": np.frombuffer(desvios_viento, dtype = np.int64),
+        "desvios_tormenta": np.frombuffer(desvios_tormenta, dtype = np.int64)
+        }
+# ============================================================
+# SIMULACIÓN MINUTO A MINUTO (GENERADOR)
+# DEVUELVE UNA FOTO INMUTABLE POR MINUTO (aviones en el aire con su posición, velocidad
+# y estado + los contadores del minuto) SIN GUARDAR LA HISTORIA (record = "off" por defecto),
+# ASÍ QUE SE PUEDE PROCESAR UNA CORRIDA LARGA EN MEMORIA CONSTANTE. CORTAR EL for (o
+# llamar a .close()) TERMINA LA SIMULACIÓN AHÍ. CON LA MISMA SEMILLA ES LA MISMA CORRIDA
+# QUE simular_con_historia, QUE QUEDA COMO VALOR DE RETORNO DEL GENERADOR.
+# ============================================================
+
+class foto_minuto(NamedTuple):
+    t: int
+    id: np.ndarray             # AVIONES EN EL AIRE: FILA, DESVIADOS, VIENTO Y TORMENTA (en ese orden)
+    x: np.ndarray              # DISTANCIA A AEP (MN)
+    v: np.ndarray              # VELOCIDAD ACTUAL
+    vmax: np.ndarray
+    estado: np.ndarray         # CÓDIGO DE ESTADO (ver estados.py)
+    congestion: int            # CONTADORES DEL MINUTO (los mismos de simular_con_historia)
+    desvios_montevideo: int
+    desvios_fila: int
+    desvios_viento: int
+    desvios_tormenta: int
+
+
+_CONTADORES = ("congestion", "desvios_montevideo", "desvios_fila", "desvios_viento", "desvios_tormenta")
+
+
+def _solo_lectura(valores, tipo):
+    arreglo = np.fromiter(valores, dtype = tipo)
+    arreglo.flags.writeable = False
+    return arreglo
+
+
+def _foto(t, aviones, contadores):
+    return foto_minuto(
+        t,
+        _solo_lectura((a.id for a in aviones), np.int32),
+        _solo_lectura((a.distancia_mn_aep for a in aviones), np.float64),
+        _solo_lectura((a.velocidad_actual for a in aviones), np.float64),
+        _solo_lectura((a.v_max for a in aviones), np.float64),
+        _solo_lectura((a.codigo for a in aviones), np.int8),
+        *(int(c[t]) for c in contadores),
+    )
+
+
+def simular_por_minuto(lambda_por_min, minutos, seed = None, dia_ventoso = True, inicio_tormenta = None,
+                       metricas = None, por_eventos = False, rng = None, record = "off", politica = None):
+    if metricas is None:
+        metricas = MetricasSimulacion()
+    pasos = _correr_minutos(lambda_por_min, minutos, seed, dia_ventoso, inicio_tormenta, metricas, por_eventos, rng, record, politica)
+    siguiente = 0
+    while True:
+        try:
+            t, filas, contadores = next(pasos)
+        except StopIteration as fin:
+            resultado = fin.value
+            break
+        # LOS MINUTOS QUE SALTA EL MODO POR EVENTOS (espacio aéreo vacío, contadores en 0) SALEN COMO FOTOS VACÍAS
+        for saltado in range(siguiente, t):
+            yield _foto(saltado, (), contadores)
+        yield _foto(t, [a for fila in filas for a in fila.aviones], contadores)
+        siguiente = t + 1
+    contadores = tuple(resultado[c] for c in _CONTADORES)
+    for saltado in range(siguiente, minutos):
+        yield _foto(saltado, (), contadores)
+    return resultado
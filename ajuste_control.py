@@ -0,0 +1,167 @@
+import itertools
+import math
+import random
+import numpy as np
+import pandas as pd
+from concurrent.futures import ProcessPoolExecutor
+from simulacion_mejorado import simular_con_historia_v2
+from analisis import MetricasSimulacion, analizar_montevideo, calcular_atraso_promedio, tiempo_ideal
+
+# ============================================================
+# AJUSTE DEL CONTROL DE LA MEJORA (politica_mejorada) PARA CADA λ
+# CADA CANDIDATO ES UN DICCIONARIO CON LOS PARÁMETROS DEL CONTROL (umbrales, ventanas y niveles).
+# SE BUSCA POR HALVING SUCESIVO: TODOS LOS CANDIDATOS CORREN POCAS RÉPLICAS, SE QUEDA LA MEJOR
+# FRACCIÓN 1/eta SEGÚN ATRASO Y FRECUENCIA DE DESVÍOS A MONTEVIDEO, LOS QUE SIGUEN CORREN eta VECES
+# MÁS RÉPLICAS, Y ASÍ HASTA n_rep_max. TODOS LOS CANDIDATOS USAN LAS MISMAS SEMILLAS (seed + rep,
+# como correr_experimentos), ASÍ LAS DIFERENCIAS SON DEL CONTROL Y NO DEL AZAR.
+# DEVUELVE EL FRENTE DE PARETO (atraso, montevideo) DE LOS QUE LLEGARON AL FINAL.
+# ============================================================
+
+_OBJETIVOS = ("atraso_prom", "montevideo_freq")
+
+
+def grilla_control(umbral_fuerte = (2, 3, 4), umbral_suave = (1, 2, 3), ventana_fuerte = (1, 2, 3),
+                   ventana_suave = (1, 2, 3), ventana_calma = (2, 3, 5),
+                   nivel_fuerte = ((20.0, 4), (20.0, 3), (30.0, 4)), nivel_suave = ((10.0, 3), (10.0, 2), (5.0, 3))):
+    """
+    Todas las combinaciones de parámetros del control (lista de diccionarios),
+    salvo las que tienen el umbral suave por encima o igual al fuerte.
+    """
+    nombres = ("umbral_fuerte", "umbral_suave", "ventana_fuerte", "ventana_suave", "ventana_calma", "nivel_fuerte", "nivel_suave")
+    valores = (umbral_fuerte, umbral_suave, ventana_fuerte, ventana_suave, ventana_calma, nivel_fuerte, nivel_suave)
+    return [dict(zip(nombres, combinacion)) for combinacion in itertools.product(*valores)
+            if combinacion[1] < combinacion[0]]
+
+
+def frente_pareto(valores):
+    """
+    Máscara de los puntos no dominados (se minimizan todas las columnas de valores).
+    """
+    valores = np.asarray(valores, dtype = float)
+    menor_igual = (valores[:, None, :] <= valores[None, :, :]).all(axis = 2)
+    menor = (valores[:, None, :] < valores[None, :, :]).any(axis = 2)
+    # dominado[j]: ALGÚN i ES <= EN TODO Y < EN ALGO
+    return ~(menor_igual & menor).any(axis = 0)
+
+
+def _capas_pareto(valores):
+    # NÚMERO DE FRENTE DE CADA PUNTO (0 = no dominado, 1 = no dominado sin el frente 0, ...)
+    capa = np.full(len(valores), -1)
+    restantes = np.arange(len(valores))
+    k = 0
+    while len(restantes):
+        frente = frente_pareto(valores[restantes])
+        capa[restantes[frente]] = k
+        restantes = restantes[~frente]
+        k += 1
+    return capa
+
+
+def _mejores(valores, n):
+    # LOS n MEJORES: PRIMERO POR FRENTE DE PARETO; DENTRO DEL MISMO FRENTE, POR LA SUMA DE SUS
+    # PUESTOS EN CADA OBJETIVO (premia a los equilibrados antes que a los extremos)
+    capa = _capas_pareto(valores)
+    puestos = valores.argsort(axis = 0, kind = "stable").argsort(axis = 0, kind = "stable").sum(axis = 1)
+    orden = np.lexsort((np.arange(len(valores)), puestos, capa))
+    return sorted(orden[:n].tolist())
+
+
+# ============================================================
+# TRABAJO DE UN PROCESO: UN CANDIDATO, UN λ Y UN TRAMO DE RÉPLICAS
+# ============================================================
+
+def _evaluar(control, lam, reps, seed, minutos, dia_ventoso, inicio_tormenta):
+    t_ideal = tiempo_ideal()
+    valores = []
+    for rep in reps:
+        sim_data = simular_con_historia_v2(lam, minutos, seed = seed + rep, dia_ventoso = dia_ventoso,
+                                           inicio_tormenta = inicio_tormenta, metricas = MetricasSimulacion(),
+                                           record = "summary", control = control)
+        valores.append((calcular_atraso_promedio(sim_data, t_ideal), analizar_montevideo(sim_data)["frecuencia"]))
+    return valores
+
+
+def ajustar_control(lambdas, candidatos = None, n_muestras = None, n_rep_inicial = 4, n_rep_max = 64, eta = 2,
+                    minutos = 1080, dia_ventoso = False, hay_tormenta = False, seed = 0,
+                    n_workers = None, executor = None, todos = False):
+    """
+    Busca, para cada λ, los parámetros del control de la mejora con mejor compromiso
+    entre atraso promedio y frecuencia de desvíos a Montevideo.
+
+    candidatos = lista de diccionarios de parámetros (por defecto grilla_control());
+    n_muestras = si se da, se usa una muestra al azar (reproducible con seed) de ese tamaño.
+    Devuelve un DataFrame con el frente de Pareto de cada λ: una fila por candidato con
+    sus parámetros, las réplicas con que se evaluó y el promedio de cada objetivo.
+    Con todos = True devuelve todos los candidatos evaluados, con la ronda en que
+    quedaron afuera (None si llegaron al final) y una columna "frente".
+    """
+    if eta < 2:
+        raise ValueError(f"eta tiene que ser al menos 2 (se recibió {eta!r})")
+    candidatos = grilla_control() if candidatos is None else list(candidatos)
+    if n_muestras is not None and n_muestras < len(candidatos):
+        candidatos = random.Random(f"control-{seed}").sample(candidatos, n_muestras)
+
+    # LA MISMA TORMENTA QUE correr_experimentos CON ESA seed
+    inicio_tormenta = random.Random(f"tormenta-{seed}").uniform(0, minutos) if hay_tormenta else None
+    argumentos = (seed, minutos, dia_ventoso, inicio_tormenta)
+
+    # valores[(λ, candidato)] = (atraso, montevideo) DE CADA RÉPLICA CORRIDA, EN ORDEN DE rep.
+    # UN CANDIDATO QUE SIGUE SOLO CORRE LAS RÉPLICAS QUE LE FALTAN
+    valores = {(lam, c): [] for lam in lambdas for c in range(len(candidatos))}
+    vivos = {lam: list(range(len(candidatos))) for lam in lambdas}
+    afuera = {}
+    n_rep = min(n_rep_inicial, n_rep_max)
+    ronda = 0
+
+    pool = None
+    if executor is not None or (n_workers is not None and n_workers > 1):
+        pool = executor if executor is not None else ProcessPoolExecutor(max_workers = n_workers)
+    try:
+        while vivos:
+            # ----------------------------------------------
+            # RONDA: CADA CANDIDATO VIVO DE CADA λ LLEGA A n_rep RÉPLICAS
+            # ----------------------------------------------
+            trabajos = [(lam, c, range(len(valores[(lam, c)]), n_rep)) for lam, cs in vivos.items() for c in cs]
+            if pool is not None:
+                tareas = [(lam, c, pool.submit(_evaluar, candidatos[c], lam, reps, *argumentos)) for lam, c, reps in trabajos]
+                for lam, c, tarea in tareas:
+                    valores[(lam, c)].extend(tarea.result())
+            else:
+                for lam, c, reps in trabajos:
+                    valores[(lam, c)].extend(_evaluar(candidatos[c], lam, reps, *argumentos))
+
+            # ----------------------------------------------
+            # SE QUEDA 1/eta DE CADA λ (o termina ese λ)
+            # ----------------------------------------------
+            for lam in list(vivos):
+                cs = vivos[lam]
+                if n_rep >= n_rep_max or len(cs) == 1:
+                    del vivos[lam]
+                    continue
+                promedios = np.array([np.mean(valores[(lam, c)], axis = 0) for c in cs])
+                siguen = [cs[k] for k in _mejores(promedios, max(1, math.ceil(len(cs) / eta)))]
+                afuera.update(((lam, c), ronda) for c in cs if c not in siguen)
+                vivos[lam] = siguen
+            n_rep = min(n_rep * eta, n_rep_max)
+            ronda += 1
+    finally:
+        if pool is not None and executor is None:
+            pool.shutdown()
+
+    # ----------------------------------------------
+    # TABLA: UNA FILA POR (λ, candidato); FRENTE DE PARETO ENTRE LOS QUE LLEGARON AL FINAL
+    # ----------------------------------------------
+    filas = []
+    for lam in lambdas:
+        for c, control in enumerate(candidatos):
+            v = np.asarray(valores[(lam, c)], dtype = float)
+            filas.append({"lambda": lam, "candidato": c, **control, "n_rep": len(v),
+                          **dict(zip(_OBJETIVOS, v.mean(axis = 0))), "ronda_eliminado": afuera.get((lam, c))})
+    tabla = pd.DataFrame(filas)
+    tabla["ronda_eliminado"] = tabla["ronda_eliminado"].astype("Int64")
+    tabla["frente"] = False
+    for lam, grupo in tabla[tabla["ronda_eliminado"].isna()].groupby("lambda", sort = False):
+        tabla.loc[grupo.index[frente_pareto(grupo[list(_OBJETIVOS)].to_numpy())], "frente"] = True
+    if todos:
+        return tabla
+    return tabla[tabla["frente"]].sort_values(["lambda", "atraso_prom"], kind = "stable").reset_index(drop = True)
@@ -1,5 +1,7 @@
 import numpy as np
 import pandas as pd
+from estados import ESTADOS, ATERRIZO, MONTEVIDEO
+from historia import historia_vuelos, resumen_vuelos
 
 # ============================================================
 # ENUNCIADO / SOPORTE GENERAL
@@ -46,6 +48,17 @@ class MetricasSimulacion:
     def registrar_desvio_tormenta(self, cantidad=1):
         self.desvios_tormenta += cantidad
 
+    # SUMA LAS MÉTRICAS DE OTRA CORRIDA (p. ej. LAS QUE DEVUELVE UN PROCESO DEL POOL)
+    def combinar(self, otra):
+        self.aterrizajes += otra.aterrizajes
+        self.aviones += otra.aviones
+        self.volando += otra.volando
+        self.reinserciones += otra.reinserciones
+        self.reinserciones_unicas |= otra.reinserciones_unicas
+        self.desvios_montevideo += otra.desvios_montevideo
+        self.desvios_viento += otra.desvios_viento
+        self.desvios_tormenta += otra.desvios_tormenta
+        return self
 
     # ---------------- RESUMEN ----------------
 
@@ -86,20 +99,42 @@ def analizar_congestion(df):
     """
     # Nuevo: promedio de minutos en congestión por avión aterrizado
     # congestion debe ser el diccionario de la simulación (data)
-    minutos_por_avion = []
-    historia = df["historia"]
-    for datos in historia.values():
-        if len(datos["estado"]) == 0 or "Aterrizó" not in datos["estado"]:
-            continue
-        # Minutos en congestión: estado en fila/reinsertado y velocidad < v_max
-        minutos_cong = 0
-        for est, vel, vmax in zip(datos["estado"], datos["v"], datos["vmax"]):
-            if est in ["En fila", "Reinsertado"] and vel < vmax:
-                minutos_cong += 1
-        minutos_por_avion.append(minutos_cong)
-    promedio = np.mean(minutos_por_avion) if minutos_por_avion else 0.0
+    # LOS SIMULADORES DEVUELVEN EL RESUMEN QUE ACUMULARON DURANTE LA CORRIDA: TOTAL YA CERRADO
+    resumen = df.get("resumen")
+    if resumen is not None:
+        return {"promedio": resumen.congestion(ATERRIZO)["promedio"]}
+
+    # SI NO (historia guardada como dict), SE CUENTA SOBRE LA TABLA LARGA
+    # Minutos en congestión: estado en fila/reinsertado y velocidad < v_max
+    aterrizados = _aterrizados(df["historia"])
+    promedio = np.mean(aterrizados["congestion"].to_numpy()) if len(aterrizados) else 0.0
     return {"promedio": promedio}
 
+def serie_por_minuto(serie):
+    """
+    Serie por minuto como arreglo numpy: una fila (minutos) o una matriz (réplicas × minutos).
+    También acepta el formato viejo {t: valor}.
+    """
+    if isinstance(serie, dict):
+        return np.fromiter(serie.values(), dtype = np.int64, count = len(serie))
+    return np.asarray(serie)
+
+def estadisticas_por_minuto(serie):
+    """
+    Frecuencia (proporción de minutos con valor > 0), promedio por minuto, máximo y total
+    de una serie por minuto. Con una matriz (réplicas × minutos) da un valor por réplica,
+    cada uno en una sola reducción sobre el eje de los minutos.
+    """
+    serie = serie_por_minuto(serie)
+    minutos = serie.shape[-1]
+    total = serie.sum(axis = -1)
+    return {
+        "frecuencia": np.count_nonzero(serie, axis = -1) / minutos,
+        "promedio": total / minutos,
+        "maxima": serie.max(axis = -1),
+        "total": total,
+    }
+
 def analizar_congestion_control(df):
     """
     Analiza congestión_control específicamente para simulaciones con mejora.
@@ -110,63 +145,42 @@ def analizar_congestion_control(df):
     if "congestion_control" not in df:
         return {"promedio": 0.0}
     
-    congestion_control = df["congestion_control"]
-    minutos = len(congestion_control)
-    minutos_con_congestion = sum(1 for c in congestion_control.values() if c > 0)
-    frecuencia = minutos_con_congestion / minutos
-    promedio = sum(congestion_control.values()) / minutos
-    
+    stats = estadisticas_por_minuto(df["congestion_control"])
     return {
-        "frecuencia": frecuencia,
-        "promedio": promedio
+        "frecuencia": stats["frecuencia"],
+        "promedio": stats["promedio"]
     }
 
 def calcular_congestion_total(congestion_por_minuto):
     """Calcula métricas de congestión del sistema completo"""
-    minutos_con_congestion = sum(1 for c in congestion_por_minuto.values() if c > 0)
-    total_minutos = len(congestion_por_minuto)
-    congestion_total = sum(congestion_por_minuto.values())
-    
+    stats = estadisticas_por_minuto(congestion_por_minuto)
     return {
-        "frecuencia_congestion": minutos_con_congestion / total_minutos,
-        "congestion_promedio": congestion_total / total_minutos,
-        "congestion_maxima": max(congestion_por_minuto.values()),
-        "minutos_totales_congestion": congestion_total
+        "frecuencia_congestion": stats["frecuencia"],
+        "congestion_promedio": stats["promedio"],
+        "congestion_maxima": stats["maxima"],
+        "minutos_totales_congestion": stats["total"]
     }
 
 def calcular_congestion_por_tramo(historia):
     """Analiza congestión según la distancia al AEP - promedio por avión que aterriza"""
-    tramos = {
-        "lejos": [],      # > 50 MN
-        "medio": [],      # 15-50 MN  
-        "cerca": []       # < 15 MN
-    }
-    
-    for avion_id, datos in historia.items():
-        if "Aterrizó" not in datos["estado"]:
-            continue
-        
-        # Contar minutos de congestión por tramo para este avión
-        minutos_por_tramo = {"lejos": 0, "medio": 0, "cerca": 0}
-        
-        for i, (distancia, estado, velocidad, vmax) in enumerate(
-            zip(datos["x"], datos["estado"], datos["v"], datos["vmax"])
-        ):
-            if estado in ["En fila", "Reinsertado"] and velocidad < vmax:
-                if distancia > 50:
-                    minutos_por_tramo["lejos"] += 1
-                elif distancia > 15:
-                    minutos_por_tramo["medio"] += 1
-                else:
-                    minutos_por_tramo["cerca"] += 1
-        
-        # Agregar los minutos de este avión a cada tramo
-        for tramo in tramos:
-            tramos[tramo].append(minutos_por_tramo[tramo])
-    
-    # Calcular promedio por avión para cada tramo
-    return {tramo: np.mean(valores) if valores else 0.0 for tramo, valores in tramos.items()}
-    
+    # CON EL RESUMEN POR AVIÓN (o una historia que lo lleva) SE USAN LOS TOTALES ACUMULADOS
+    resumen = historia if isinstance(historia, resumen_vuelos) else getattr(historia, "resumen", None)
+    if resumen is not None:
+        cong = resumen.congestion(ATERRIZO)
+        return {tramo: cong[tramo] for tramo in ("lejos", "medio", "cerca")}
+
+    # TRAMOS: lejos > 50 MN, medio 15-50 MN, cerca < 15 MN (promedio por avión aterrizado)
+    aterrizados = _aterrizados(historia)
+    return {tramo: np.mean(aterrizados[tramo].to_numpy()) if len(aterrizados) else 0.0
+            for tramo in ("lejos", "medio", "cerca")}
+
+def _aterrizados(historia):
+    # congestion_por_avion DE LOS AVIONES QUE ATERRIZARON, DESDE LA TABLA LARGA DE UNA HISTORIA
+    if len(historia) == 0:
+        return pd.DataFrame(columns = ["congestion", "lejos", "medio", "cerca"])
+    por_avion = congestion_por_avion(_tabla_historia(historia))
+    return por_avion[por_avion["aterrizo"]]
+
 def IC_globales(df):
     # Agrupar por lambda
     grouped = df.groupby("lambda")["congestion_prom"]
@@ -198,42 +212,34 @@ def analizar_montevideo(data):
     - frecuencia = proporción de minutos con al menos 1 desvío
     - promedio = desvíos promedio por minuto
     """
-    desvios = data["desvios_montevideo"]
-    minutos = len(desvios)
-    minutos_con_desvio = sum(1 for c in desvios.values() if c > 0)
-    frecuencia = minutos_con_desvio / minutos
-    promedio = sum(desvios.values()) / minutos
-    return {"frecuencia": frecuencia, "promedio": promedio}
+    stats = estadisticas_por_minuto(data["desvios_montevideo"])
+    return {"frecuencia": stats["frecuencia"], "promedio": stats["promedio"]}
 
 def analizar_viento(data):
     """
     PARTE 5
     Analiza desvíos por viento (go-around → trayectoria río).
     """
-    desvios = data["desvios_viento"]
-    minutos = len(desvios)
-    minutos_con_desvio = sum(1 for c in desvios.values() if c > 0)
-    frecuencia = minutos_con_desvio / minutos
-    promedio = sum(desvios.values()) / minutos
-    return {"frecuencia": frecuencia, "promedio": promedio}
+    stats = estadisticas_por_minuto(data["desvios_viento"])
+    return {"frecuencia": stats["frecuencia"], "promedio": stats["promedio"]}
 
 def analizar_tormenta(data):
     """
     PARTE 6
     Analiza desvíos por tormenta (cierre de AEP).
     """
-    desvios = data.get("desvios_tormenta", {})
-    minutos = len(desvios)
-    minutos_con_desvio = sum(1 for c in desvios.values() if c > 0)
-    frecuencia = minutos_con_desvio / minutos
-    promedio = sum(desvios.values()) / minutos
-    return {"frecuencia": frecuencia, "promedio": promedio}
+    stats = estadisticas_por_minuto(data["desvios_tormenta"])
+    return {"frecuencia": stats["frecuencia"], "promedio": stats["promedio"]}
 
 def calcular_atraso_promedio(data, t_ideal):
     """
     Calcula el atraso promedio comparando tiempo real de vuelo 
     contra tiempo ideal (sin congestión).
     """
+    resumen = data.get("resumen")
+    if resumen is not None:
+        return resumen.atraso_promedio(t_ideal)
+
     historia = data["historia"]
     atrasos = []
     for avion_id, datos in historia.items():
@@ -306,96 +312,266 @@ def analizar_congestion_promedio(df):
     
     return resumen
 
+# ============================================================
+# TABLA LARGA DE TRAYECTORIAS (escenario, λ, rep, avión, t, x, v, vmax, estado)
+# LAS ESTADÍSTICAS DE CONGESTIÓN POR AVIÓN, POR TRAMO Y POR CLASE SALEN DE
+# MÁSCARAS VECTORIZADAS + groupby SOBRE ESTA TABLA (sin recorrer minuto a minuto)
+# ============================================================
+
+_CLAVES_REPLICA = ("escenario", "lambda", "rep")
+
+def _unir_clases(partes):
+    # JUNTA LAS CLASES DE PRIORIDAD DE VARIAS HISTORIAS EN UN SOLO CATEGÓRICO.
+    # partes = (índices de clase o None, nombres de las clases o None, largo) DE CADA UNA;
+    # LAS QUE NO TIENEN CLASES QUEDAN EN NaN. None SI NINGUNA TIENE
+    categorias = list(dict.fromkeys(n for _, nombres, _ in partes if nombres is not None for n in nombres))
+    if not categorias:
+        return None
+    codigos = []
+    for clase, nombres, largo in partes:
+        if clase is None:
+            codigos.append(np.full(largo, -1, dtype = np.int8))
+        else:
+            mapa = np.array([categorias.index(n) for n in nombres], dtype = np.int8)
+            codigos.append(mapa[clase])
+    return pd.Categorical.from_codes(np.concatenate(codigos), categories = categorias)
+
+def _tabla_historia(historia):
+    # historia_vuelos (o historia_guardada) YA SABE ARMAR SU TABLA; UN dict VIEJO SE ARMA ACÁ
+    # (registros completos, después la salida a Montevideo y al final el aterrizaje / Montevideo)
+    if hasattr(historia, "tabla"):
+        return historia.tabla()
+    filas = []
+    for id_avion, datos in historia.items():
+        n_t, n_x, n_e = len(datos["t"]), len(datos["x"]), len(datos["estado"])
+        completos = n_x + n_e - n_t
+        for k, t in enumerate(datos["t"]):
+            con_x = k < n_x
+            e = k if k < completos else (k - n_x + completos if not con_x else None)
+            filas.append((id_avion, t,
+                          datos["x"][k] if con_x else np.nan, datos["v"][k] if con_x else np.nan,
+                          datos["vmax"][k] if con_x else np.nan, datos["estado"][e] if e is not None else None,
+                          datos.get("prio", False)))
+    tabla = pd.DataFrame(filas, columns = ["id", "t", "x", "v", "vmax", "estado", "prio"])
+    if not any(datos.get("prio") is not None for datos in historia.values()):
+        tabla = tabla.drop(columns = ["prio"])
+    return tabla
+
+def tabla_trayectorias(df, escenario = None):
+    """
+    Tabla larga con una fila por registro de cada avión de cada réplica del DataFrame
+    de experimentos: (escenario), lambda, rep, id, t, x, v, vmax, estado (y prio y clase).
+    """
+    # LAS historia_vuelos DAN SUS REGISTROS COMO ARREGLOS: SE CONCATENAN Y SE ARMA UN SOLO DataFrame
+    if all(hasattr(h, "registros") for h in df["historia"]):
+        partes = [h.registros() for h in df["historia"]]
+        largos = [len(p["t"]) for p in partes]
+        datos = {"lambda": np.repeat(df["lambda"].to_numpy(), largos), "rep": np.repeat(df["rep"].to_numpy(), largos)}
+        for c in partes[0] if partes else ():
+            if c != "clase" and all(c in p for p in partes):
+                datos[c] = np.concatenate([p[c] for p in partes])
+        if "estado" in datos:
+            datos["estado"] = pd.Categorical.from_codes(datos["estado"], categories = ESTADOS)
+        clase = _unir_clases([(p.get("clase"), h.clases, n) for p, h, n in zip(partes, df["historia"], largos)])
+        if clase is not None:
+            datos["clase"] = clase
+        tabla = pd.DataFrame(datos)
+    else:
+        partes = []
+        for lam, rep, historia in zip(df["lambda"], df["rep"], df["historia"]):
+            tabla = _tabla_historia(historia)
+            tabla.insert(0, "lambda", lam)
+            tabla.insert(1, "rep", rep)
+            partes.append(tabla)
+        tabla = pd.concat(partes, ignore_index = True)
+    if escenario is not None:
+        tabla.insert(0, "escenario", escenario)
+    return tabla
+
+def congestion_por_avion(tabla):
+    """
+    Una fila por avión (de cada réplica) desde la tabla larga:
+    - congestion / lejos / medio / cerca = minutos en fila o reinsertado con v < vmax (total y por tramo)
+    - minutos = registros con posición (los minutos que recorre el análisis por avión)
+    - aterrizo / montevideo = si terminó aterrizando o en Montevideo; prio si es prioritario y su clase
+    """
+    claves = [c for c in _CLAVES_REPLICA if c in tabla] + ["id"]
+    estado = tabla["estado"]
+    x = tabla["x"].to_numpy()
+    cong = (estado.isin(["En fila", "Reinsertado"]) & (tabla["v"] < tabla["vmax"])).to_numpy()
+    columnas = {c: tabla[c] for c in claves}
+    columnas.update({
+        "congestion": cong,
+        "lejos": cong & (x > 50),
+        "medio": cong & (x <= 50) & (x > 15),
+        "cerca": cong & (x <= 15),
+        "minutos": ~np.isnan(x),
+        "aterrizo": (estado == "Aterrizó").to_numpy(),
+        "montevideo": (estado == "Montevideo").to_numpy(),
+    })
+    agregados = {c: "sum" for c in ("congestion", "lejos", "medio", "cerca", "minutos")}
+    agregados.update({"aterrizo": "any", "montevideo": "any"})
+    for c in ("prio", "clase"):
+        if c in tabla:
+            columnas[c] = tabla[c]
+            agregados[c] = "first"
+    return pd.DataFrame(columnas).groupby(claves, sort = False, observed = True).agg(agregados).reset_index()
+
+def _estadisticas_congestion(por_avion, filtro, claves):
+    # PROMEDIOS POR AVIÓN (total y tramos) Y FRECUENCIA (minutos en congestión / minutos registrados)
+    # DE LOS AVIONES QUE CUMPLEN filtro, AGRUPADOS POR claves
+    grupos = por_avion[filtro].groupby(claves, sort = False, observed = True)
+    sumas = grupos[["congestion", "lejos", "medio", "cerca", "minutos"]].sum()
+    n = grupos.size()
+    return pd.DataFrame({
+        "aviones": n,
+        "congestion_prom": sumas["congestion"] / n,
+        "frecuencia_congestion": sumas["congestion"] / sumas["minutos"].where(sumas["minutos"] > 0),
+        "congestion_lejos": sumas["lejos"] / n,
+        "congestion_medio": sumas["medio"] / n,
+        "congestion_cerca": sumas["cerca"] / n,
+    }).fillna({"frecuencia_congestion": 0.0})
+
 def analizar_congestion_montevideo(df):
     """
     Analiza congestión específicamente para aviones que van a Montevideo.
     
     Parámetros:
-    - df: DataFrame con resultados de experimentos que incluye columnas de congestión
+    - df: DataFrame con resultados de experimentos (columna 'historia'),
+          o directamente una tabla larga de trayectorias (tabla_trayectorias / resultados.leer_trayectorias)
     
     Devuelve:
     - DataFrame con métricas de congestión promedio por lambda para aviones de Montevideo
     """
-    # Verificar que las columnas necesarias existen
-    if 'historia' not in df.columns:
-        print("⚠️  La columna 'historia' no está en el DataFrame.")
-        return None
-    
-    resultados = []
-    
-    for _, fila in df.iterrows():
-        historia = fila['historia']
-        lambda_val = fila['lambda']
-        
-        # Analizar solo aviones que van a Montevideo
-        aviones_montevideo = []
-        for avion_id, datos in historia.items():
-            if "Montevideo" in datos["estado"]:
-                aviones_montevideo.append((avion_id, datos))
-        
-        if not aviones_montevideo:
-            # Si no hay aviones de Montevideo, agregar valores cero
-            resultados.append({
-                'lambda': lambda_val,
-                'congestion_prom_montevideo': 0.0,
-                'frecuencia_congestion_montevideo': 0.0,
-                'congestion_lejos_montevideo': 0.0,
-                'congestion_medio_montevideo': 0.0,
-                'congestion_cerca_montevideo': 0.0
-            })
-            continue
-        
-        # Calcular congestión promedio para aviones de Montevideo
-        minutos_por_avion = []
-        minutos_con_congestion = 0
-        total_minutos = 0
-        for avion_id, datos in aviones_montevideo:
-            minutos_cong = 0
-            for est, vel, vmax in zip(datos["estado"], datos["v"], datos["vmax"]):
-                total_minutos += 1
-                if est in ["En fila", "Reinsertado"] and vel < vmax:
-                    minutos_cong += 1
-                    minutos_con_congestion += 1
-            minutos_por_avion.append(minutos_cong)
-        
-        congestion_prom = np.mean(minutos_por_avion) if minutos_por_avion else 0.0
-        frecuencia = minutos_con_congestion / total_minutos if total_minutos > 0 else 0.0
+    columnas_salida = {
+        "congestion_prom": "congestion_prom_montevideo",
+        "frecuencia_congestion": "frecuencia_congestion_montevideo",
+        "congestion_lejos": "congestion_lejos_montevideo",
+        "congestion_medio": "congestion_medio_montevideo",
+        "congestion_cerca": "congestion_cerca_montevideo",
+    }
 
-        tramos = {"lejos": [], "medio": [], "cerca": []}
-        
-        for avion_id, datos in aviones_montevideo:
-            minutos_por_tramo = {"lejos": 0, "medio": 0, "cerca": 0}
-            
-            for i, (distancia, estado, velocidad, vmax) in enumerate(
-                zip(datos["x"], datos["estado"], datos["v"], datos["vmax"])
-            ):
-                if estado in ["En fila", "Reinsertado"] and velocidad < vmax:
-                    if distancia > 50:
-                        minutos_por_tramo["lejos"] += 1
-                    elif distancia > 15:
-                        minutos_por_tramo["medio"] += 1
-                    else:
-                        minutos_por_tramo["cerca"] += 1
-            
-            for tramo in tramos:
-                tramos[tramo].append(minutos_por_tramo[tramo])
-        
-        # Calcular promedios por tramo
-        congestion_por_tramo = {
-            tramo: np.mean(valores) if valores else 0.0 
-            for tramo, valores in tramos.items()
-        }
-        
-        resultados.append({
-            'lambda': lambda_val,
-            'congestion_prom_montevideo': congestion_prom,
-            'frecuencia_congestion_montevideo': frecuencia,
-            'congestion_lejos_montevideo': congestion_por_tramo['lejos'],
-            'congestion_medio_montevideo': congestion_por_tramo['medio'],
-            'congestion_cerca_montevideo': congestion_por_tramo['cerca']
-        })
-    
-    return pd.DataFrame(resultados)
+    # TABLA LARGA: UNA FILA DE RESULTADO POR RÉPLICA PRESENTE EN LA TABLA
+    if "t" in df.columns and "estado" in df.columns:
+        por_avion = congestion_por_avion(df)
+        claves = [c for c in _CLAVES_REPLICA if c in por_avion]
+        replicas = por_avion[claves].drop_duplicates()
+    else:
+        # Verificar que las columnas necesarias existen
+        if 'historia' not in df.columns:
+            print("⚠️  La columna 'historia' no está en el DataFrame.")
+            return None
+
+        # LAS HISTORIAS DE LA SIMULACIÓN YA TRAEN LOS TOTALES DE MONTEVIDEO (ver historia.resumen_vuelos)
+        if all(getattr(h, "resumen", None) is not None for h in df["historia"]):
+            resultados = []
+            for lambda_val, historia in zip(df["lambda"], df["historia"]):
+                cong = historia.resumen.congestion(MONTEVIDEO)
+                resultados.append({
+                    'lambda': lambda_val,
+                    'congestion_prom_montevideo': cong["promedio"],
+                    'frecuencia_congestion_montevideo': historia.resumen.frecuencia_congestion(MONTEVIDEO),
+                    'congestion_lejos_montevideo': cong['lejos'],
+                    'congestion_medio_montevideo': cong['medio'],
+                    'congestion_cerca_montevideo': cong['cerca']
+                })
+            return pd.DataFrame(resultados)
+
+        # SI NO, SE ARMA LA TABLA LARGA DE A UN λ (para no tener todo el barrido en memoria).
+        # CADA RÉPLICA SE IDENTIFICA POR SU POSICIÓN EN df ("fila"), AUNQUE SE REPITAN λ Y rep
+        claves = ["fila"]
+        replicas = pd.DataFrame({"fila": np.arange(len(df))})
+        partes = []
+        for _, grupo in df.assign(fila = np.arange(len(df))).groupby("lambda", sort = False):
+            tabla = tabla_trayectorias(grupo.assign(rep = grupo["fila"]))
+            partes.append(congestion_por_avion(tabla).rename(columns = {"rep": "fila"}).drop(columns = ["lambda"]))
+        por_avion = pd.concat(partes, ignore_index = True)
+
+    stats = _estadisticas_congestion(por_avion, por_avion["montevideo"], claves)
+    # LAS RÉPLICAS SIN AVIONES A MONTEVIDEO QUEDAN EN CERO
+    resultado = replicas.merge(stats.reset_index(), on = claves, how = "left").fillna(0.0)
+    if "lambda" not in resultado:
+        resultado.insert(0, "lambda", df["lambda"].to_numpy())
+    return resultado.rename(columns = columnas_salida)[["lambda", *columnas_salida.values()]]
+
+def analizar_congestion_por_clase(df):
+    """
+    Congestión por clase de avión de los que aterrizaron, por réplica: promedio por avión,
+    frecuencia y minutos por tramo. La clase es la de la política (p. ej. sanitario / combustible /
+    regular / general con clases_aep(); prioritario / normal con p_prioritario); "normal" si no hay clases.
+
+    Parámetros:
+    - df: DataFrame de experimentos (columna 'historia') o tabla larga de trayectorias
+    """
+    tabla = df if ("t" in df.columns and "estado" in df.columns) else tabla_trayectorias(df)
+    por_avion = congestion_por_avion(tabla)
+    if "clase" not in por_avion:
+        # HISTORIAS SIN CLASES: LAS VIEJAS (dict) SOLO TRAEN LA MARCA prio
+        por_avion["clase"] = np.where(por_avion["prio"], "prioritario", "normal") if "prio" in por_avion else "normal"
+    claves = [c for c in _CLAVES_REPLICA if c in por_avion] + ["clase"]
+    return _estadisticas_congestion(por_avion, por_avion["aterrizo"], claves).reset_index()
+
+# ============================================================
+# TABLA POR AVIÓN COMPARTIDA POR LOS GRÁFICOS
+# UNA FILA POR AVIÓN DE CADA RÉPLICA (aparición, fin, último minuto, estado final,
+# minutos de congestión por tramo, atraso y prio), ARMADA CON LOS resumen_vuelos DE LAS
+# HISTORIAS. LO QUE CUESTA (el resumen de cada historia) QUEDA GUARDADO EN LA PROPIA HISTORIA,
+# ASÍ QUE PEDIRLA OTRA VEZ SOBRE EL MISMO df SOLO VUELVE A JUNTAR ESAS COLUMNAS. CADA LLAMADA
+# DEVUELVE UNA TABLA NUEVA: UN GRÁFICO QUE LA MODIFICA NO LE CAMBIA LOS DATOS A LOS DEMÁS.
+# ============================================================
+
+def _resumen_historia(historia):
+    # historia_vuelos / historia_guardada TRAEN SU RESUMEN (calculado una vez y guardado en la historia);
+    # UN dict VIEJO PASA POR LA TABLA LARGA
+    resumen = getattr(historia, "resumen", None)
+    if resumen is None:
+        resumen = historia_vuelos.desde_tabla(_tabla_historia(historia)).resumen
+    return resumen
+
+def tabla_aviones(df):
+    """
+    Tabla con una fila por avión de cada réplica del DataFrame de experimentos:
+    fila (posición de la réplica en df), lambda, rep, id, aparicion, fin, ultimo,
+    estado (final), congestion / lejos / medio / cerca (minutos), atraso (solo los que
+    aterrizaron o se fueron a Montevideo; NaN si no), prio y clase.
+    Cada llamada devuelve una tabla nueva (los resúmenes de las historias se calculan una sola vez).
+    """
+    resumenes = [_resumen_historia(h) for h in df["historia"]]
+    columnas = [r.columnas() for r in resumenes]
+    largos = [len(c["ids"]) for c in columnas]
+    unir = lambda campo: np.concatenate([c[campo] for c in columnas]) if columnas else np.zeros(0, dtype = np.int32)
+    estado = unir("estado")
+    lejos, medio, cerca = unir("cong_lejos"), unir("cong_medio"), unir("cong_cerca")
+    aparicion, fin = unir("aparicion"), unir("fin")
+    termino = (estado == ATERRIZO) | (estado == MONTEVIDEO)
+    tabla = pd.DataFrame({
+        "fila": np.repeat(np.arange(len(df)), largos),
+        "lambda": np.repeat(df["lambda"].to_numpy(), largos),
+    })
+    if "rep" in df:
+        tabla["rep"] = np.repeat(df["rep"].to_numpy(), largos)
+    tabla["id"] = unir("ids")
+    tabla["aparicion"] = aparicion
+    tabla["fin"] = fin
+    tabla["ultimo"] = unir("ultimo")
+    tabla["estado"] = pd.Categorical.from_codes(estado.astype(np.int8), categories = ESTADOS)
+    tabla["congestion"] = lejos + medio + cerca
+    tabla["lejos"] = lejos
+    tabla["medio"] = medio
+    tabla["cerca"] = cerca
+    tabla["atraso"] = np.where(termino, (fin - aparicion) - tiempo_ideal(), np.nan)
+    if any(c["prio"] is not None for c in columnas):
+        tabla["prio"] = np.concatenate([np.zeros(n, dtype = bool) if c["prio"] is None else c["prio"].astype(bool)
+                                        for c, n in zip(columnas, largos)])
+        tabla["clase"] = _unir_clases([(c["clase"], r.clases, n) for c, r, n in zip(columnas, resumenes, largos)])
+    return tabla
+
+def aviones_por_fila(aviones, n_filas, filtro = None):
+    # CANTIDAD DE AVIONES (que cumplen filtro) DE CADA RÉPLICA, INCLUIDAS LAS QUE NO TIENEN NINGUNO
+    fila = aviones["fila"].to_numpy()
+    if filtro is not None:
+        fila = fila[np.asarray(filtro)]
+    return np.bincount(fila, minlength = n_filas)
 
 def print_resumen_congestion(df):
     resumen = analizar_congestion_promedio(df)
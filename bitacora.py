@@ -0,0 +1,94 @@
+import os
+import sys
+import pickle
+import zlib
+import hashlib
+from cache_corridas import version_modelo
+
+# ============================================================
+# BITÁCORA DE UN BARRIDO DE correr_experimentos (para retomarlo si se corta)
+# CADA TRAMO DE RÉPLICAS TERMINADO (un λ y sus reps) SE GUARDA EN SU PROPIO ARCHIVO
+# CON LAS FILAS DEL DATAFRAME Y LAS MÉTRICAS DEL TRAMO:
+#
+# ruta/<barrido>/<λ>_<rep inicial>-<rep final>.bin
+#
+# <barrido> ES EL HASH DE LAS ENTRADAS DEL BARRIDO (salvo lambdas y n_rep, así se puede
+# agregar λ o réplicas) Y DE LA VERSIÓN DEL MODELO. <λ> VA SIEMPRE COMO repr(float(λ)) ("0.1"),
+# SEA UN float DE PYTHON O UN np.float64. CADA ARCHIVO SE ESCRIBE APARTE, SE BAJA A DISCO Y RECIÉN
+# AHÍ SE RENOMBRA (y se baja a disco la carpeta, para que el renombre también quede):
+# SI EL PROCESO MUERE, LO QUE QUEDA SON TRAMOS COMPLETOS.
+# ============================================================
+
+# ADEMÁS DEL MODELO, LAS FILAS LAS ARMA experimentos
+_MODULOS_FILAS = ("experimentos",)
+
+
+def _bajar_carpeta(ruta):
+    # fsync DE LA CARPETA: DEJA EN DISCO LA ENTRADA DEL ARCHIVO RECIÉN RENOMBRADO.
+    # (en Windows una carpeta no se puede abrir así; ahí el renombre ya es durable)
+    if not hasattr(os, "O_DIRECTORY"):
+        return
+    fd = os.open(ruta, os.O_RDONLY | os.O_DIRECTORY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def _version():
+    h = hashlib.sha256(version_modelo().encode())
+    for nombre in _MODULOS_FILAS:
+        __import__(nombre)
+        with open(sys.modules[nombre].__file__, "rb") as f:
+            h.update(f.read())
+    return h.hexdigest()[:16]
+
+
+class bitacora_barrido:
+    def __init__(self, ruta, caso, minutos, seed, dia_ventoso, inicio_tormenta, p_prioritario, record):
+        # COMO EN cache_corridas.clave: TIPOS DE PYTHON, ASÍ UNA seed DE numpy DA EL MISMO BARRIDO
+        entradas = (_version(), caso, int(minutos), None if seed is None else int(seed), bool(dia_ventoso),
+                    None if inicio_tormenta is None else float(inicio_tormenta),
+                    float(p_prioritario) if caso == "prioritario" else None, record)
+        self.barrido = hashlib.sha256(repr(entradas).encode()).hexdigest()[:16]
+        self.ruta = os.path.join(ruta, self.barrido)
+        os.makedirs(self.ruta, exist_ok = True)
+
+    # ---------------- ESCRITURA ----------------
+
+    def anotar(self, lam, reps, filas, metricas):
+        reps = list(reps)
+        archivo = os.path.join(self.ruta, f"{float(lam)!r}_{reps[0]}-{reps[-1]}.bin")
+        temporal = f"{archivo}.{os.getpid()}.tmp"
+        with open(temporal, "wb") as f:
+            f.write(zlib.compress(pickle.dumps((lam, reps, filas, metricas), protocol = pickle.HIGHEST_PROTOCOL), 1))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temporal, archivo)
+        _bajar_carpeta(self.ruta)
+
+    # ---------------- LECTURA ----------------
+
+    def tramos(self):
+        """
+        Tramos ya terminados: lista de (λ, reps, filas, metricas).
+        Los archivos a medio escribir (.tmp) o dañados se ignoran: esas réplicas se vuelven a correr.
+        """
+        tramos = []
+        for a in sorted(os.scandir(self.ruta), key = lambda a: a.name):
+            if not a.name.endswith(".bin"):
+                continue
+            try:
+                with open(a.path, "rb") as f:
+                    tramos.append(pickle.loads(zlib.decompress(f.read())))
+            except (OSError, EOFError, zlib.error, pickle.UnpicklingError):
+                continue
+        return tramos
+
+    def limpiar(self):
+        for a in os.scandir(self.ruta):
+            os.remove(a.path)
+
+    def __repr__(self):
+        n = sum(1 for a in os.scandir(self.ruta) if a.name.endswith(".bin"))
+        return f"<bitacora_barrido: {self.ruta} ({n} tramos)>"
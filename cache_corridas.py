@@ -0,0 +1,168 @@
+import os
+import sys
+import pickle
+import zlib
+import hashlib
+from collections import OrderedDict
+from simulacion import simular_con_historia
+from simulacion_mejorado import simular_con_historia_v2
+from simulacion_prioritarios import simular_con_historia_prioritarios
+from analisis import MetricasSimulacion
+
+# ============================================================
+# CACHE EN DISCO DE CORRIDAS DE SIMULACIÓN
+# CADA CORRIDA SE GUARDA BAJO EL HASH DE TODAS SUS ENTRADAS + LA VERSIÓN DEL MODELO
+# (hash del código fuente de la simulación), ASÍ QUE AL CAMBIAR EL MODELO LAS CORRIDAS
+# VIEJAS DEJAN DE USARSE SOLAS. EL ARCHIVO ES pickle COMPRIMIDO CON zlib.
+# CUANDO EL TOTAL SUPERA max_mb SE BORRAN LAS MENOS USADAS (LRU). EL ORDEN DE USO Y EL
+# TOTAL SE LLEVAN EN MEMORIA; LA CARPETA SE RECORRE UNA SOLA VEZ, AL ABRIR EL CACHE, Y EL
+# ORDEN INICIAL SALE DE LA FECHA DE MODIFICACIÓN (cada lectura la actualiza).
+# ============================================================
+
+SIMULADORES = {
+    "normal": simular_con_historia,
+    "mejora": simular_con_historia_v2,
+    "prioritario": simular_con_historia_prioritarios,
+}
+
+# MÓDULOS CUYO CÓDIGO DEFINE EL RESULTADO DE UNA CORRIDA
+_MODULOS_MODELO = ("simulacion", "simulacion_mejorado", "simulacion_prioritarios", "plane", "politicas",
+                   "heap", "historia", "estados", "analisis")
+
+
+def version_modelo():
+    h = hashlib.sha256()
+    for nombre in _MODULOS_MODELO:
+        __import__(nombre)
+        with open(sys.modules[nombre].__file__, "rb") as f:
+            h.update(f.read())
+    return h.hexdigest()[:16]
+
+
+class cache_corridas:
+    def __init__(self, ruta, max_mb = 1024):
+        self.ruta = ruta
+        self.max_bytes = int(max_mb * 1024 * 1024)
+        self.version = version_modelo()
+        self.aciertos = 0
+        self.fallos = 0
+        os.makedirs(ruta, exist_ok = True)
+        self._escanear()
+
+    def _escanear(self):
+        # ÍNDICE LRU: archivo → tamaño, DEL MENOS AL MÁS USADO, Y EL TOTAL EN BYTES
+        archivos = []
+        for carpeta in os.scandir(self.ruta):
+            if carpeta.is_dir():
+                for a in os.scandir(carpeta.path):
+                    if a.name.endswith(".bin"):
+                        st = a.stat()
+                        archivos.append((st.st_mtime, a.path, st.st_size))
+        self._indice = OrderedDict((camino, tam) for _, camino, tam in sorted(archivos))
+        self._total = sum(self._indice.values())
+
+    def _usado(self, archivo, tam):
+        # PASA AL FINAL DEL ÍNDICE (el más usado), CORRIGIENDO EL TOTAL SI CAMBIÓ EL TAMAÑO
+        self._total += tam - self._indice.pop(archivo, 0)
+        self._indice[archivo] = tam
+
+    # ---------------- CLAVE Y ARCHIVO ----------------
+
+    def clave(self, variante, lambda_por_min, minutos, seed, dia_ventoso, inicio_tormenta, p_prioritario, record):
+        # p_prioritario SOLO CAMBIA LA CORRIDA DE LA VARIANTE CON PRIORITARIOS
+        if variante != "prioritario":
+            p_prioritario = None
+        # TODO PASA A TIPOS DE PYTHON: repr(np.int64(3)) ES "np.int64(3)" Y DARÍA OTRA CLAVE QUE 3
+        entradas = (self.version, variante, float(lambda_por_min), int(minutos), None if seed is None else int(seed),
+                    bool(dia_ventoso), None if inicio_tormenta is None else float(inicio_tormenta),
+                    None if p_prioritario is None else float(p_prioritario), record)
+        return hashlib.sha256(repr(entradas).encode()).hexdigest()
+
+    def _archivo(self, clave):
+        return os.path.join(self.ruta, clave[:2], clave + ".bin")
+
+    # ---------------- LECTURA / ESCRITURA ----------------
+
+    def leer(self, clave):
+        archivo = self._archivo(clave)
+        try:
+            with open(archivo, "rb") as f:
+                crudo = f.read()
+            datos = pickle.loads(zlib.decompress(crudo))
+            os.utime(archivo)
+        except (OSError, EOFError, zlib.error, pickle.UnpicklingError):
+            return None
+        self._usado(archivo, len(crudo))
+        return datos
+
+    def guardar(self, clave, datos):
+        archivo = self._archivo(clave)
+        os.makedirs(os.path.dirname(archivo), exist_ok = True)
+        # SE ESCRIBE APARTE Y SE RENOMBRA: OTRO PROCESO NUNCA VE UN ARCHIVO A MEDIO ESCRIBIR
+        temporal = f"{archivo}.{os.getpid()}.tmp"
+        crudo = zlib.compress(pickle.dumps(datos, protocol = pickle.HIGHEST_PROTOCOL), 1)
+        with open(temporal, "wb") as f:
+            f.write(crudo)
+        os.replace(temporal, archivo)
+        self._usado(archivo, len(crudo))
+        self.desalojar()
+
+    def desalojar(self):
+        # BORRA LAS CORRIDAS MENOS USADAS HASTA QUEDAR DEBAJO DEL TAMAÑO MÁXIMO.
+        # CON VARIOS PROCESOS CADA UNO LLEVA SU ÍNDICE: UN ARCHIVO QUE OTRO YA BORRÓ SE SALTEA
+        while self._total > self.max_bytes and self._indice:
+            camino, tam = self._indice.popitem(last = False)
+            try:
+                os.remove(camino)
+            except OSError:
+                pass
+            self._total -= tam
+
+    def tamanio(self):
+        # TAMAÑO REAL EN DISCO (recorre la carpeta; incluye lo que escribieron otros procesos)
+        return sum(a.stat().st_size for c in os.scandir(self.ruta) if c.is_dir() for a in os.scandir(c.path))
+
+    def limpiar(self):
+        for c in os.scandir(self.ruta):
+            if c.is_dir():
+                for a in os.scandir(c.path):
+                    os.remove(a.path)
+        self._indice.clear()
+        self._total = 0
+
+    # ---------------- CORRIDA ----------------
+
+    def simular(self, variante, lambda_por_min, minutos, seed = None, dia_ventoso = True, inicio_tormenta = None,
+                metricas = None, p_prioritario = 0.05, por_eventos = False, record = "full"):
+        """
+        Igual que simular_con_historia* (variante = "normal", "mejora" o "prioritario"),
+        pero devuelve la corrida guardada si ya se hizo con las mismas entradas.
+        Las métricas de la corrida se suman a 'metricas' igual que si se simulara.
+        """
+        simulador = SIMULADORES[variante]
+        extra = {"p_prioritario": p_prioritario} if variante == "prioritario" else {}
+        if metricas is None:
+            metricas = MetricasSimulacion()
+
+        # SIN SEMILLA LA CORRIDA NO SE REPITE: NO SE GUARDA
+        if seed is None:
+            return simulador(lambda_por_min, minutos, seed = seed, dia_ventoso = dia_ventoso, inicio_tormenta = inicio_tormenta,
+                             metricas = metricas, por_eventos = por_eventos, record = record, **extra)
+
+        # por_eventos NO ENTRA EN LA CLAVE: DA EXACTAMENTE LA MISMA CORRIDA
+        clave = self.clave(variante, lambda_por_min, minutos, seed, dia_ventoso, inicio_tormenta, p_prioritario, record)
+        guardado = self.leer(clave)
+        if guardado is not None:
+            self.aciertos += 1
+            datos, metricas_corrida = guardado
+        else:
+            self.fallos += 1
+            metricas_corrida = MetricasSimulacion()
+            datos = simulador(lambda_por_min, minutos, seed = seed, dia_ventoso = dia_ventoso, inicio_tormenta = inicio_tormenta,
+                              metricas = metricas_corrida, por_eventos = por_eventos, record = record, **extra)
+            self.guardar(clave, (datos, metricas_corrida))
+        metricas.combinar(metricas_corrida)
+        return datos
+
+    def __repr__(self):
+        return f"<cache_corridas: {self.ruta} ({self.aciertos} aciertos, {self.fallos} fallos)>"
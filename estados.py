@@ -0,0 +1,14 @@
+# ============================================================
+# ENUNCIADO / PARTES 1–6
+# ESTADOS DE UN AVIÓN: LA SIMULACIÓN TRABAJA CON CÓDIGOS ENTEROS
+# Y EL TEXTO (ESTADOS[codigo]) ES EL QUE QUEDA EN LA HISTORIA Y EN LOS GRÁFICOS.
+# ============================================================
+
+EN_FILA, REINSERTADO, DESVIADO, RIO, TORMENTA, ATERRIZO, MONTEVIDEO = range(7)
+
+ESTADOS = ("En fila", "Reinsertado", "Desviado", "Rio", "Tormenta", "Aterrizó", "Montevideo")
+CODIGOS = {texto: codigo for codigo, texto in enumerate(ESTADOS)}
+
+# GRUPOS QUE SE CONSULTAN EN CADA PASO
+EN_APROXIMACION = (EN_FILA, REINSERTADO)     # EN LA FILA PRINCIPAL
+OUTBOUND = (DESVIADO, RIO, TORMENTA)         # SALIENDO, BUSCANDO GAP PARA REINSERTARSE
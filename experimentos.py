@@ -1,12 +1,15 @@
+import numpy as np
 import pandas as pd
 import random
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from simulacion import simular_con_historia
 from simulacion_mejorado import simular_con_historia_v2
 from simulacion_prioritarios import simular_con_historia_prioritarios
+from simulacion_vectorizada import simular_lote_con_historia
 from analisis import (
     MetricasSimulacion,
     analizar_congestion,
-    analizar_congestion_control,
     analizar_montevideo,
     analizar_viento,
     analizar_tormenta,
@@ -15,172 +18,383 @@ from analisis import (
     calcular_congestion_por_tramo,
     tiempo_ideal
 )
+from estados import ATERRIZO
 
 # ============================================================
-# PARTE 4, 5 y 6: CORRER EXPERIMENTOS PARA VARIOS λ
+# PARTE 4, 5 y 6: UNA RÉPLICA → UNA FILA DEL DATAFRAME
+# (LO USAN TANTO LA CORRIDA EN SERIE COMO LOS PROCESOS DEL POOL)
 # ============================================================
 
-def correr_experimentos(lambdas, n_rep = 100, p_prioritario = 0, minutos = 1080, metricas_lambda = {}, dia_ventoso = False, hay_tormenta = False, seed = 0, mejora = False):
+def _simular(caso, lam, seed, minutos, dia_ventoso, inicio_tormenta, metricas, p_prioritario, record = "full", cache = None):
+    # CON UN cache_corridas LAS CORRIDAS YA HECHAS SE LEEN DEL DISCO
+    if cache is not None:
+        return cache.simular(caso, lam, minutos, seed = seed, dia_ventoso = dia_ventoso, inicio_tormenta = inicio_tormenta,
+                             metricas = metricas, p_prioritario = p_prioritario, record = record)
+    if caso == "prioritario":
+        return simular_con_historia_prioritarios(
+            lambda_por_min = lam,
+            minutos = minutos,
+            seed = seed,
+            dia_ventoso = dia_ventoso,
+            inicio_tormenta = inicio_tormenta,
+            metricas = metricas,
+            p_prioritario = p_prioritario,
+            record = record
+        )
+    if caso == "mejora":
+        return simular_con_historia_v2(
+            lambda_por_min = lam,
+            minutos = minutos,
+            seed = seed,
+            dia_ventoso = dia_ventoso,
+            inicio_tormenta = inicio_tormenta,
+            metricas = metricas,
+            record = record
+        )
+    return simular_con_historia(
+        lambda_por_min = lam,
+        minutos = minutos,
+        seed = seed,
+        dia_ventoso = dia_ventoso,
+        inicio_tormenta = inicio_tormenta,
+        metricas = metricas,
+        record = record
+    )
 
-    t_ideal = tiempo_ideal()
-    resultados = []
 
-    if hay_tormenta:
-        random.seed()
-        inicio_tormenta = random.uniform(0,minutos)
-    else:
-        inicio_tormenta = None
+def _filas_resultado(caso, lam, reps, corridas, t_ideal, con_historia = True):
+    corridas = list(corridas)
+    if not corridas:
+        return []
 
-    #CASO NORMAL
-    if not mejora and p_prioritario == 0:
-
-        # RECORRE CADA VALOR DE λ 
-        for lam in lambdas:
-            metrica_ = metricas_lambda[lam]
-
-            # REPITE LA SIMULACIÓN n_rep VECES
-            for rep in range(n_rep):
-                seed_actual = seed + rep
-                sim_data = simular_con_historia(
-                lambda_por_min = lam,
-                minutos = minutos,seed = seed_actual,
-                dia_ventoso = dia_ventoso,
-                inicio_tormenta = inicio_tormenta,  # o un número si querés simular tormenta
-                metricas = metrica_)
-                            
-                congestion_stats = analizar_congestion(sim_data)
-                montevideo_stats = analizar_montevideo(sim_data)
-                viento_stats = analizar_viento(sim_data)
-                tormenta_stats = analizar_tormenta(sim_data)
-                atraso_prom = calcular_atraso_promedio(sim_data, t_ideal)
-                congestion_total = calcular_congestion_total(sim_data["congestion"])
-                congestion_tramo = calcular_congestion_por_tramo(sim_data["historia"])
-
-                resultados.append({
-                    "lambda": lam,
-                    "rep": rep,
-                    "congestion_prom": congestion_stats["promedio"],
-                    "montevideo_prom": montevideo_stats["promedio"],
-                    "montevideo_freq": montevideo_stats["frecuencia"],
-                    "viento_prom": viento_stats["promedio"],     
-                    "viento_freq": viento_stats["frecuencia"],
-                    "tormenta_prom": tormenta_stats["promedio"],
-                    "tormenta_freq": tormenta_stats["frecuencia"],
-                    "atraso_prom": atraso_prom,
-                    "frecuencia_congestion": congestion_total["frecuencia_congestion"],
-                    "congestion_maxima": congestion_total["congestion_maxima"],
-                    "congestion_lejos": congestion_tramo["lejos"],
-                    "congestion_medio": congestion_tramo["medio"],
-                    "congestion_cerca": congestion_tramo["cerca"],
-                    "historia": sim_data["historia"] 
-                })
+    # SERIES POR MINUTO DE TODAS LAS RÉPLICAS APILADAS (réplicas × minutos): FRECUENCIA,
+    # PROMEDIO Y MÁXIMO DE TODO EL BLOQUE SALEN DE UNA REDUCCIÓN POR SERIE
+    series = {clave: np.stack([sim_data[clave] for sim_data in corridas])
+              for clave in ("congestion", "congestion_control", "desvios_montevideo", "desvios_viento", "desvios_tormenta")
+              if clave in corridas[0]}
+    montevideo_stats = analizar_montevideo(series)
+    viento_stats = analizar_viento(series)
+    tormenta_stats = analizar_tormenta(series)
+    congestion_total = calcular_congestion_total(series["congestion"])
+    congestion_control_total = calcular_congestion_total(series["congestion_control"]) if "congestion_control" in series else None
+
+    filas = []
+    for i, (rep, sim_data) in enumerate(zip(reps, corridas)):
+        congestion_stats = analizar_congestion(sim_data)
+        atraso_prom = calcular_atraso_promedio(sim_data, t_ideal)
+        resumen = sim_data.get("resumen")
+        congestion_tramo = calcular_congestion_por_tramo(sim_data["historia"] if resumen is None else resumen)
+
+        resultado = {
+            "lambda": lam,
+            "rep": rep,
+            "congestion_prom": congestion_stats["promedio"],
+            "montevideo_prom": montevideo_stats["promedio"][i],
+            "montevideo_freq": montevideo_stats["frecuencia"][i],
+            "viento_prom": viento_stats["promedio"][i],
+            "viento_freq": viento_stats["frecuencia"][i],
+            "tormenta_prom": tormenta_stats["promedio"][i],
+            "tormenta_freq": tormenta_stats["frecuencia"][i],
+            "atraso_prom": atraso_prom,
+            "frecuencia_congestion": congestion_total["frecuencia_congestion"][i],
+            "congestion_maxima": congestion_total["congestion_maxima"][i],
+            "congestion_lejos": congestion_tramo["lejos"],
+            "congestion_medio": congestion_tramo["medio"],
+            "congestion_cerca": congestion_tramo["cerca"],
+        }
+        # con_historia = False → SOLO MÉTRICAS (SIN historia NI SERIES POR MINUTO)
+        if con_historia:
+            resultado["historia"] = sim_data["historia"]
 
-    #CASO PRIORITARIO
-    elif p_prioritario > 0 and not mejora:
-
-        for lam in lambdas:
-            for rep in range(n_rep):
-                metrica_ = metricas_lambda[lam]
-                sim_data = simular_con_historia_prioritarios(
-                    lambda_por_min = lam,
-                    minutos = minutos,
-                    seed = seed + rep,
-                    dia_ventoso = dia_ventoso,
-                    inicio_tormenta = inicio_tormenta,
-                    metricas = metrica_,
-                    p_prioritario = p_prioritario
-                )
-
-                congestion_stats = analizar_congestion(sim_data)
-                montevideo_stats = analizar_montevideo(sim_data)
-                viento_stats = analizar_viento(sim_data)
-                tormenta_stats = analizar_tormenta(sim_data)
-                atraso_prom = calcular_atraso_promedio(sim_data, t_ideal)
-                congestion_total = calcular_congestion_total(sim_data["congestion"])
-                congestion_tramo = calcular_congestion_por_tramo(sim_data["historia"])
-
-                # Proporción de aterrizajes prioritarios vs no prioritarios
-                prio_landed = 0
-                prio_total = 0
+        #CASO PRIORITARIO
+        if caso == "prioritario":
+            # Proporción de aterrizajes prioritarios vs no prioritarios
+            prio_landed = 0
+            prio_total = 0
+            if resumen is not None:
+                c = resumen.columnas()
+                prio_total = int(c["prio"].sum())
+                prio_landed = int((c["prio"] & (c["estado"] == ATERRIZO)).sum())
+                n_aviones = len(resumen)
+            else:
                 for avion in sim_data["historia"].values():
                     if avion.get("prio", False):
                         prio_total += 1
                         if "Aterrizó" in avion["estado"]:
                             prio_landed += 1
+                n_aviones = len(sim_data["historia"])
 
-                resultados.append({
-                    "lambda": lam,
-                    "rep": rep,
-                    "congestion_prom": congestion_stats["promedio"],
-                    "montevideo_prom": montevideo_stats["promedio"],
-                    "montevideo_freq": montevideo_stats["frecuencia"],
-                    "viento_prom": viento_stats["promedio"],
-                    "viento_freq": viento_stats["frecuencia"],
-                    "tormenta_prom": tormenta_stats["promedio"],
-                    "tormenta_freq": tormenta_stats["frecuencia"],
-                    "atraso_prom": atraso_prom,
-                    "frecuencia_congestion": congestion_total["frecuencia_congestion"],
-                    "congestion_maxima": congestion_total["congestion_maxima"],
-                    "congestion_lejos": congestion_tramo["lejos"],
-                    "congestion_medio": congestion_tramo["medio"],
-                    "congestion_cerca": congestion_tramo["cerca"],
-                    "historia": sim_data["historia"],
-                    "prio_landed_rate": (prio_landed / prio_total) if prio_total > 0 else 0.0,
-                    "prio_share": prio_total / max(1, len(sim_data["historia"]))
+            resultado["prio_landed_rate"] = (prio_landed / prio_total) if prio_total > 0 else 0.0
+            resultado["prio_share"] = prio_total / max(1, n_aviones)
+
+        #CASO CON MEJORA
+        elif caso == "mejora":
+            if con_historia:
+                resultado["congestion"] = sim_data["congestion"]
+
+            if congestion_control_total is not None:
+                if con_historia:
+                    resultado["congestion_control"] = sim_data["congestion_control"]
+                resultado.update({
+                    "frecuencia_congestion_control": congestion_control_total["frecuencia_congestion"][i],
+                    "congestion_control_maxima": congestion_control_total["congestion_maxima"][i]
                 })
-    
-    #CASO CON MEJORA
+
+        filas.append(resultado)
+    return filas
+
+
+# ============================================================
+# TRABAJO DE UN PROCESO DEL POOL: UN BLOQUE DE RÉPLICAS DE UN λ.
+# USA LA MISMA SEMILLA QUE LA CORRIDA EN SERIE (seed + rep) Y DEVUELVE
+# LAS FILAS YA REDUCIDAS JUNTO CON SUS MÉTRICAS (que el padre suma).
+# ============================================================
+
+def _correr_bloque(caso, lam, reps, seed, minutos, dia_ventoso, inicio_tormenta, p_prioritario, lote, record, cache = None):
+    metricas = MetricasSimulacion()
+    t_ideal = tiempo_ideal()
+
+    if lote:
+        corridas = simular_lote_con_historia(
+            lambda_por_min = lam,
+            minutos = minutos,
+            seeds = [seed + rep for rep in reps],
+            dia_ventoso = dia_ventoso,
+            inicio_tormenta = inicio_tormenta,
+            metricas = metricas)
     else:
-        for lam in lambdas:
-            metrica_ = metricas_lambda[lam]
-
-            # REPITE LA SIMULACIÓN n_rep VECES
-            for rep in range(n_rep):
-                seed_actual = seed + rep
-                sim_data = simular_con_historia_v2(
-                lambda_por_min = lam,
-                minutos = minutos,seed = seed_actual,
-                dia_ventoso = dia_ventoso,
-                inicio_tormenta = inicio_tormenta,  # o un número si querés simular tormenta
-                metricas = metrica_)
-                            
-                congestion_stats = analizar_congestion(sim_data)
-                montevideo_stats = analizar_montevideo(sim_data)
-                viento_stats = analizar_viento(sim_data)
-                tormenta_stats = analizar_tormenta(sim_data)
-                atraso_prom = calcular_atraso_promedio(sim_data, t_ideal)
-                congestion_total = calcular_congestion_total(sim_data["congestion"])
-                congestion_tramo = calcular_congestion_por_tramo(sim_data["historia"])
-                congestion_control_stats = analizar_congestion_control(sim_data)
-                congestion_control_total = calcular_congestion_total(sim_data["congestion_control"]) if "congestion_control" in sim_data else None
-
-                resultado = {
-                    "lambda": lam,
-                    "rep": rep,
-                    "congestion_prom": congestion_stats["promedio"],
-                    "montevideo_prom": montevideo_stats["promedio"],
-                    "montevideo_freq": montevideo_stats["frecuencia"],
-                    "viento_prom": viento_stats["promedio"],     
-                    "viento_freq": viento_stats["frecuencia"],
-                    "tormenta_prom": tormenta_stats["promedio"],
-                    "tormenta_freq": tormenta_stats["frecuencia"],
-                    "atraso_prom": atraso_prom,
-                    "frecuencia_congestion": congestion_total["frecuencia_congestion"],
-                    "congestion_maxima": congestion_total["congestion_maxima"],
-                    "congestion_lejos": congestion_tramo["lejos"],
-                    "congestion_medio": congestion_tramo["medio"],
-                    "congestion_cerca": congestion_tramo["cerca"],
-                    "historia": sim_data["historia"],
-                    "congestion": sim_data["congestion"]
-                }
-                
-                if congestion_control_total is not None:
-                    resultado.update({
-                        "congestion_control": sim_data["congestion_control"],
-                        "frecuencia_congestion_control": congestion_control_total["frecuencia_congestion"],
-                        "congestion_control_maxima": congestion_control_total["congestion_maxima"]
-                    })
-                
-                resultados.append(resultado)
-
-    return pd.DataFrame(resultados)
+        corridas = (_simular(caso, lam, seed + rep, minutos, dia_ventoso, inicio_tormenta, metricas, p_prioritario, record, cache) for rep in reps)
+
+    return _filas_resultado(caso, lam, reps, corridas, t_ideal, record == "full"), metricas
+
+
+def _bloques(n_rep, n_bloques):
+    # PARTE range(n_rep) EN n_bloques TRAMOS CONSECUTIVOS (CONSERVA EL ORDEN DE LAS RÉPLICAS)
+    n_bloques = max(1, min(n_rep, n_bloques))
+    cortes = [n_rep * i // n_bloques for i in range(n_bloques + 1)]
+    return [list(range(cortes[i], cortes[i + 1])) for i in range(n_bloques) if cortes[i] < cortes[i + 1]]
+
+
+# ============================================================
+# PARTE 4, 5 y 6: CORRER EXPERIMENTOS PARA VARIOS λ
+# ============================================================
+
+def correr_experimentos(lambdas, n_rep = 100, p_prioritario = 0, minutos = 1080, metricas_lambda = {}, dia_ventoso = False, hay_tormenta = False, seed = 0, mejora = False, lote = False,
+                        n_workers = None, executor = None, record = "full", guardar_en = None, escenario = None, cache = None,
+                        bitacora = None, objetivo_ic = None, tanda = 10):
+
+    # record = "full" GUARDA LA historia DE CADA RÉPLICA EN EL DATAFRAME; "summary" CALCULA LAS MISMAS
+    # MÉTRICAS DESDE UNA FILA POR AVIÓN Y NO GUARDA TRAYECTORIAS ("off" NO ALCANZA PARA LAS MÉTRICAS)
+    if record not in ("full", "summary"):
+        raise ValueError(f"correr_experimentos necesita record = 'full' o 'summary' (se recibió {record!r})")
+
+    t_ideal = tiempo_ideal()
+    resultados = []
+
+    # INICIO DE LA TORMENTA: SALE DE UN GENERADOR PROPIO DERIVADO DE seed (reproducible,
+    # y el mismo para todos los escenarios con la misma seed, así se comparan contra la misma tormenta)
+    if hay_tormenta:
+        inicio_tormenta = random.Random(f"tormenta-{seed}").uniform(0,minutos)
+    else:
+        inicio_tormenta = None
+
+    if mejora:
+        caso = "mejora"
+    elif p_prioritario > 0:
+        caso = "prioritario"
+    else:
+        caso = "normal"
+
+    # guardar_en = CARPETA DONDE GUARDAR LOS RESULTADOS (ver resultados.py). EL ESCENARIO POR DEFECTO
+    # SALE DEL CASO Y DE LAS CONDICIONES: "normal", "normal-ventoso", "mejora-tormenta", ...
+    if escenario is None:
+        escenario = "-".join([caso] + (["ventoso"] if dia_ventoso else []) + (["tormenta"] if hay_tormenta else []))
+
+    # lote = True: LAS RÉPLICAS DE CADA λ CORREN JUNTAS EN EL MOTOR VECTORIZADO, QUE SOLO TIENE
+    # LAS REGLAS DEL MODELO BASE (politica_base). LA MEJORA Y LOS PRIORITARIOS NO TIENEN LOTE.
+    if lote and caso != "normal":
+        raise ValueError(f"lote = True solo está disponible para el modelo base (se pidió el caso {caso!r})")
+
+    # objetivo_ic = {métrica: semiancho} → MODO ADAPTATIVO: CADA λ CORRE DE A tanda RÉPLICAS Y SE CORTA
+    # CUANDO EL IC 95% DE TODAS ESAS MÉTRICAS (1.96 · std / √n) QUEDA POR DEBAJO DE SU SEMIANCHO,
+    # O AL LLEGAR A n_rep. SON LAS MISMAS RÉPLICAS (seed + rep) QUE SE CORRERÍAN CON n_rep FIJO.
+    # LAS RÉPLICAS USADAS Y EL SEMIANCHO LOGRADO QUEDAN EN df.attrs["reps_usadas"] y df.attrs["semiancho_ic"]
+    if objetivo_ic is not None:
+        if bitacora is not None:
+            raise ValueError("objetivo_ic no se puede usar junto con bitacora")
+        df = _correr_adaptativo(caso, lambdas, n_rep, tanda, objetivo_ic, seed, minutos, dia_ventoso, inicio_tormenta,
+                                p_prioritario, lote, record, cache, metricas_lambda, n_workers, executor)
+        return _devolver(df, guardar_en, escenario)
+
+    # bitacora = CARPETA DONDE SE VA ANOTANDO CADA TRAMO DE RÉPLICAS TERMINADO (ver bitacora.py).
+    # SI EL BARRIDO SE CORTA, VOLVER A CORRERLO CON LA MISMA bitacora SOLO SIMULA LO QUE FALTA
+    if bitacora is not None:
+        from bitacora import bitacora_barrido
+        registro = bitacora_barrido(bitacora, caso, minutos, seed, dia_ventoso, inicio_tormenta, p_prioritario, record)
+        df = _correr_con_bitacora(registro, caso, lambdas, n_rep, seed, minutos, dia_ventoso, inicio_tormenta,
+                                  p_prioritario, lote, record, cache, metricas_lambda, n_workers, executor)
+        return _devolver(df, guardar_en, escenario)
+
+    # ----------------------------------------------
+    # EN PARALELO (n_workers > 1 o un executor propio): LAS RÉPLICAS DE CADA λ SE REPARTEN
+    # EN BLOQUES ENTRE PROCESOS. LAS FILAS SE JUNTAN EN EL ORDEN (λ, rep) DE LA CORRIDA EN SERIE,
+    # ASÍ QUE EL DATAFRAME Y LAS MÉTRICAS SON IDÉNTICOS. CON record = "summary" NO SE MANDA
+    # LA historia DE CADA RÉPLICA ENTRE PROCESOS.
+    # ----------------------------------------------
+
+    if executor is not None or (n_workers is not None and n_workers > 1):
+        pool = executor if executor is not None else ProcessPoolExecutor(max_workers = n_workers)
+        n_bloques = 4 * (n_workers or os.cpu_count() or 1)
+        try:
+            tareas = [
+                (lam, pool.submit(_correr_bloque, caso, lam, reps, seed, minutos, dia_ventoso,
+                                  inicio_tormenta, p_prioritario, lote, record, cache))
+                for lam in lambdas
+                for reps in _bloques(n_rep, n_bloques)
+            ]
+            for lam, tarea in tareas:
+                filas, metricas = tarea.result()
+                resultados.extend(filas)
+                metricas_lambda[lam].combinar(metricas)
+        finally:
+            if executor is None:
+                pool.shutdown()
+
+        return _devolver(pd.DataFrame(resultados), guardar_en, escenario)
+
+    # RECORRE CADA VALOR DE λ
+    for lam in lambdas:
+        metrica_ = metricas_lambda[lam]
+
+        # REPITE LA SIMULACIÓN n_rep VECES
+        # (con lote = True LAS n_rep RÉPLICAS CORREN JUNTAS EN EL MOTOR VECTORIZADO; MISMOS RESULTADOS)
+        # (cache = cache_corridas(...) REUSA LAS CORRIDAS YA HECHAS CON LAS MISMAS ENTRADAS; NO APLICA AL LOTE)
+        if lote:
+            corridas = simular_lote_con_historia(
+            lambda_por_min = lam,
+            minutos = minutos,
+            seeds = [seed + rep for rep in range(n_rep)],
+            dia_ventoso = dia_ventoso,
+            inicio_tormenta = inicio_tormenta,
+            metricas = metrica_)
+        else:
+            corridas = (_simular(caso, lam, seed + rep, minutos, dia_ventoso, inicio_tormenta, metrica_, p_prioritario, record, cache) for rep in range(n_rep))
+
+        resultados.extend(_filas_resultado(caso, lam, range(n_rep), corridas, t_ideal, record == "full"))
+
+    return _devolver(pd.DataFrame(resultados), guardar_en, escenario)
+
+
+def _correr_con_bitacora(registro, caso, lambdas, n_rep, seed, minutos, dia_ventoso, inicio_tormenta,
+                         p_prioritario, lote, record, cache, metricas_lambda, n_workers, executor):
+    # FILAS YA ANOTADAS: (λ, rep) → fila. SUS MÉTRICAS SE SUMAN COMO SI SE HUBIERAN CORRIDO AHORA
+    # (un tramo de un λ que no está en este barrido o con reps de más no se usa: sus métricas no se podrían separar)
+    filas = {}
+    for lam, reps, filas_tramo, metricas in registro.tramos():
+        if lam not in lambdas or reps[-1] >= n_rep or any((lam, rep) in filas for rep in reps):
+            continue
+        filas.update(((lam, rep), fila) for rep, fila in zip(reps, filas_tramo))
+        metricas_lambda[lam].combinar(metricas)
+
+    def anotar(lam, reps, filas_tramo, metricas):
+        registro.anotar(lam, reps, filas_tramo, metricas)
+        filas.update(((lam, rep), fila) for rep, fila in zip(reps, filas_tramo))
+        metricas_lambda[lam].combinar(metricas)
+
+    pendientes = {lam: [rep for rep in range(n_rep) if (lam, rep) not in filas] for lam in lambdas}
+    argumentos = (seed, minutos, dia_ventoso, inicio_tormenta, p_prioritario, lote, record)
+
+    if executor is not None or (n_workers is not None and n_workers > 1):
+        # CADA BLOQUE SE ANOTA APENAS TERMINA (no en el orden en que se mandó)
+        pool = executor if executor is not None else ProcessPoolExecutor(max_workers = n_workers)
+        n_bloques = 4 * (n_workers or os.cpu_count() or 1)
+        try:
+            tareas = {}
+            for lam, reps in pendientes.items():
+                for bloque in _bloques(len(reps), n_bloques):
+                    tramo = [reps[i] for i in bloque]
+                    tareas[pool.submit(_correr_bloque, caso, lam, tramo, *argumentos, cache)] = (lam, tramo)
+            for tarea in as_completed(tareas):
+                anotar(*tareas[tarea], *tarea.result())
+        finally:
+            if executor is None:
+                pool.shutdown()
+    else:
+        # EN SERIE SE ANOTA CADA RÉPLICA (el lote vectorizado corre y se anota por λ)
+        for lam, reps in pendientes.items():
+            tramos = [reps] if lote else [[rep] for rep in reps]
+            for tramo in tramos:
+                if tramo:
+                    anotar(lam, tramo, *_correr_bloque(caso, lam, tramo, *argumentos, cache))
+
+    return pd.DataFrame([filas[(lam, rep)] for lam in lambdas for rep in range(n_rep)])
+
+
+def _semiancho_ic(filas, metrica):
+    # SEMIANCHO DEL IC 95% DEL PROMEDIO (infinito con menos de 2 réplicas)
+    valores = np.array([fila[metrica] for fila in filas], dtype = float)
+    if len(valores) < 2:
+        return np.inf
+    return 1.96 * np.std(valores, ddof = 1) / np.sqrt(len(valores))
+
+
+def _correr_adaptativo(caso, lambdas, n_rep, tanda, objetivo_ic, seed, minutos, dia_ventoso, inicio_tormenta,
+                       p_prioritario, lote, record, cache, metricas_lambda, n_workers, executor):
+    # (CON n_rep Y tanda DE AL MENOS 1, TODO λ TIENE FILAS DESDE LA PRIMERA TANDA)
+    if n_rep < 1:
+        raise ValueError(f"n_rep tiene que ser al menos 1 réplica (se recibió {n_rep!r})")
+    if tanda < 1:
+        raise ValueError(f"tanda tiene que ser al menos 1 réplica (se recibió {tanda!r})")
+    filas = {lam: [] for lam in lambdas}
+    semiancho = {lam: {} for lam in lambdas}
+    activos = list(lambdas)
+    argumentos = (seed, minutos, dia_ventoso, inicio_tormenta, p_prioritario, lote, record)
+
+    pool = None
+    if executor is not None or (n_workers is not None and n_workers > 1):
+        pool = executor if executor is not None else ProcessPoolExecutor(max_workers = n_workers)
+        n_bloques = 4 * (n_workers or os.cpu_count() or 1)
+    try:
+        while activos:
+            # UNA TANDA MÁS DE CADA λ QUE TODAVÍA NO LLEGÓ (en paralelo, todas las tandas de la ronda juntas)
+            tandas = {lam: list(range(len(filas[lam]), min(len(filas[lam]) + tanda, n_rep))) for lam in activos}
+            if pool is not None:
+                tareas = []
+                for lam in activos:
+                    for bloque in _bloques(len(tandas[lam]), n_bloques):
+                        tramo = [tandas[lam][i] for i in bloque]
+                        tareas.append((lam, pool.submit(_correr_bloque, caso, lam, tramo, *argumentos, cache)))
+                for lam, tarea in tareas:
+                    filas_tanda, metricas = tarea.result()
+                    filas[lam].extend(filas_tanda)
+                    metricas_lambda[lam].combinar(metricas)
+            else:
+                for lam in activos:
+                    filas_tanda, metricas = _correr_bloque(caso, lam, tandas[lam], *argumentos, cache)
+                    filas[lam].extend(filas_tanda)
+                    metricas_lambda[lam].combinar(metricas)
+
+            # CORTA CADA λ POR SU CUENTA
+            for lam in list(activos):
+                faltan = [m for m in objetivo_ic if m not in filas[lam][0]]
+                if faltan:
+                    raise ValueError(f"objetivo_ic pide métricas que no están en los resultados: {faltan}")
+                semiancho[lam] = {m: float(_semiancho_ic(filas[lam], m)) for m in objetivo_ic}
+                if len(filas[lam]) >= n_rep or all(semiancho[lam][m] <= objetivo_ic[m] for m in objetivo_ic):
+                    activos.remove(lam)
+    finally:
+        if pool is not None and executor is None:
+            pool.shutdown()
+
+    df = pd.DataFrame([fila for lam in lambdas for fila in filas[lam]])
+    df.attrs["reps_usadas"] = {lam: len(filas[lam]) for lam in lambdas}
+    df.attrs["semiancho_ic"] = semiancho
+    return df
+
+
+def _devolver(df, guardar_en, escenario):
+    if guardar_en is not None:
+        # pyarrow SOLO HACE FALTA PARA GUARDAR
+        from resultados import guardar_resultados
+        guardar_resultados(df, guardar_en, escenario)
+    return df
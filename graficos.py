@@ -156,73 +156,39 @@ def plot_congestion_montevideo(df):
     import matplotlib.pyplot as plt
     import numpy as np
     import pandas as pd
-    from analisis import tiempo_ideal
+    from analisis import tabla_aviones, aviones_por_fila
 
-    lambdas = sorted(df["lambda"].unique())
     resultados = []
-    t_ideal = tiempo_ideal()
-
-    for lam, grupo in df.groupby("lambda"):
-        aterrizados = 0
-        montevideo = 0
-        min_cong_aterrizados = []
-        min_cong_montevideo = []
-        atraso_aterrizados = []
-        atraso_montevideo = []
+    # UNA FILA POR AVIÓN (se arma una vez por df y la comparten los gráficos)
+    aviones = tabla_aviones(df)
+    aterrizo = (aviones["estado"] == "Aterrizó").to_numpy()
+    mvd = (aviones["estado"] == "Montevideo").to_numpy()
+    total_por_fila = aviones_por_fila(aviones, len(df)).tolist()
+    mvd_por_fila = aviones_por_fila(aviones, len(df), mvd).tolist()
+    por_lambda = aviones["lambda"].to_numpy()
+
+    for lam, grupo in df.assign(fila = np.arange(len(df))).groupby("lambda"):
+        del_lambda = por_lambda == lam
+        min_cong_aterrizados = aviones["congestion"].to_numpy()[del_lambda & aterrizo]
+        min_cong_montevideo = aviones["congestion"].to_numpy()[del_lambda & mvd]
+        atraso_aterrizados = aviones["atraso"].to_numpy()[del_lambda & aterrizo]
+        atraso_montevideo = aviones["atraso"].to_numpy()[del_lambda & mvd]
+
+        # Frecuencia de desvíos por simulación
         freq_montevideo = 0
-
-        for historia in grupo["historia"]:
-            total_aviones = len(historia)
-            desvios_sim = 0
-            for avion in historia.values():
-                estado_final = avion["estado"][-1] if "estado" in avion and len(avion["estado"]) > 0 else None
-                
-                # Calcular minutos de congestión usando la misma lógica que otras funciones
-                minutos_cong = 0
-                if "estado" in avion and "v" in avion and "vmax" in avion:
-                    for est, vel, vmax in zip(avion["estado"], avion["v"], avion["vmax"]):
-                        if est in ["En fila", "Reinsertado"] and vel < vmax:
-                            minutos_cong += 1
-                
-                # Calcular atraso usando la misma lógica que otras funciones
-                atraso = 0
-                if "t" in avion and len(avion["t"]) > 0:
-                    minuto_aparicion = avion["t"][0]
-                    if estado_final == "Aterrizó":
-                        idx = avion["estado"].index("Aterrizó")
-                        minuto_aterrizo = avion["t"][idx]
-                        t_real = minuto_aterrizo - minuto_aparicion
-                        atraso = t_real - t_ideal
-                    elif estado_final == "Montevideo":
-                        # Para aviones que van a Montevideo, calcular tiempo hasta que cambian a estado Montevideo
-                        idx = avion["estado"].index("Montevideo")
-                        minuto_montevideo = avion["t"][idx]
-                        t_real = minuto_montevideo - minuto_aparicion
-                        # El atraso es el tiempo real menos el tiempo ideal (sin congestión)
-                        atraso = t_real - t_ideal
-                
-                if estado_final == "Aterrizó":
-                    aterrizados += 1
-                    min_cong_aterrizados.append(minutos_cong)
-                    atraso_aterrizados.append(atraso)
-                elif estado_final == "Montevideo":
-                    montevideo += 1
-                    min_cong_montevideo.append(minutos_cong)
-                    atraso_montevideo.append(atraso)
-                    desvios_sim += 1
-            # Frecuencia de desvíos por simulación
-            if total_aviones > 0:
-                freq_montevideo += desvios_sim / total_aviones
+        for fila in grupo["fila"]:
+            if total_por_fila[fila] > 0:
+                freq_montevideo += mvd_por_fila[fila] / total_por_fila[fila]
 
         n_sim = len(grupo)
         resultados.append({
             "lambda": lam,
-            "aterrizajes": aterrizados / n_sim,
-            "desvios_montevideo": montevideo / n_sim,
-            "prom_min_cong_aterrizados": np.mean(min_cong_aterrizados) if min_cong_aterrizados else 0,
-            "prom_min_cong_montevideo": np.mean(min_cong_montevideo) if min_cong_montevideo else 0,
-            "atraso_aterrizados": np.mean(atraso_aterrizados) if atraso_aterrizados else 0,
-            "atraso_montevideo": np.mean(atraso_montevideo) if atraso_montevideo else 0,
+            "aterrizajes": len(min_cong_aterrizados) / n_sim,
+            "desvios_montevideo": len(min_cong_montevideo) / n_sim,
+            "prom_min_cong_aterrizados": np.mean(min_cong_aterrizados) if len(min_cong_aterrizados) else 0,
+            "prom_min_cong_montevideo": np.mean(min_cong_montevideo) if len(min_cong_montevideo) else 0,
+            "atraso_aterrizados": np.mean(atraso_aterrizados) if len(atraso_aterrizados) else 0,
+            "atraso_montevideo": np.mean(atraso_montevideo) if len(atraso_montevideo) else 0,
             "freq_montevideo": freq_montevideo / n_sim
         })
 
@@ -268,58 +234,34 @@ def plot_congestion_montevideo(df):
     plt.show()
 
 def cambio_data(df):
-    from analisis import tiempo_ideal
+    from analisis import tabla_aviones, aviones_por_fila
     import pandas as pd
     import numpy as np
     
     resultados = []
-    t_ideal = tiempo_ideal()
-
-    for lam, grupo in df.groupby("lambda"):
-        aterrizados_total = 0
-        min_cong_aterrizados = []
-        atraso_aterrizados = []
+    aviones = tabla_aviones(df)
+    aterrizo = (aviones["estado"] == "Aterrizó").to_numpy()
+    total_por_fila = aviones_por_fila(aviones, len(df)).tolist()
+    mvd_por_fila = aviones_por_fila(aviones, len(df), (aviones["estado"] == "Montevideo").to_numpy()).tolist()
+    # Duración estimada de cada simulación (en minutos): último minuto registrado
+    max_t_por_fila = np.zeros(len(df), dtype = np.int64)
+    np.maximum.at(max_t_por_fila, aviones["fila"].to_numpy(), aviones["ultimo"].to_numpy())
+    max_t_por_fila = max_t_por_fila.tolist()
+    por_lambda = aviones["lambda"].to_numpy()
+
+    for lam, grupo in df.assign(fila = np.arange(len(df))).groupby("lambda"):
+        del_lambda = por_lambda == lam
+        min_cong_aterrizados = aviones["congestion"].to_numpy()[del_lambda & aterrizo]
+        atraso_aterrizados = aviones["atraso"].to_numpy()[del_lambda & aterrizo]
         freq_montevideo_acum = 0.0
         mvd_rates = []  # desvíos a MVD por minuto por simulación
 
-        for historia in grupo["historia"]:
-            total_aviones = len(historia)
-            desvios_sim = 0
-
-            # Duración estimada de la simulación (en minutos)
-            max_t = 0
-            for datos in historia.values():
-                if "t" in datos and len(datos["t"]) > 0:
-                    max_t = max(max_t, max(datos["t"]))
+        for fila in grupo["fila"]:
+            total_aviones = total_por_fila[fila]
+            desvios_sim = mvd_por_fila[fila]
+            max_t = max_t_por_fila[fila]
             total_minutos_sim = max_t + 1 if max_t > 0 else 1
 
-            for datos in historia.values():
-                estado_final = datos["estado"][-1] if "estado" in datos and len(datos["estado"]) > 0 else None
-
-                # Minutos de congestión (por avión aterrizado)
-                minutos_cong = 0
-                if "estado" in datos and "v" in datos and "vmax" in datos:
-                    for est, vel, vmax in zip(datos["estado"], datos["v"], datos["vmax"]):
-                        if est in ["En fila", "Reinsertado"] and vel < vmax:
-                            minutos_cong += 1
-                    
-                # Atraso para aterrizados
-                    atraso = 0
-                if "t" in datos and len(datos["t"]) > 0:
-                    minuto_aparicion = datos["t"][0]
-                    if estado_final == "Aterrizó":
-                        idx = datos["estado"].index("Aterrizó")
-                        minuto_aterrizo = datos["t"][idx]
-                        t_real = minuto_aterrizo - minuto_aparicion
-                        atraso = t_real - t_ideal
-                
-                    if estado_final == "Aterrizó":
-                        aterrizados_total += 1
-                        min_cong_aterrizados.append(minutos_cong)
-                        atraso_aterrizados.append(atraso)
-                    elif estado_final == "Montevideo":
-                        desvios_sim += 1
-
             # tasa de MVD por minuto en esta simulación
             mvd_rate = desvios_sim / total_minutos_sim if total_minutos_sim > 0 else 0.0
             mvd_rates.append(mvd_rate)
@@ -331,9 +273,9 @@ def cambio_data(df):
         n_sim = len(grupo)
         resultados.append({
             "lambda": lam,
-            "aterrizajes": (aterrizados_total / n_sim) if n_sim else 0,
-            "prom_min_cong_aterrizados": np.mean(min_cong_aterrizados) if min_cong_aterrizados else 0,
-            "atraso_aterrizados": np.mean(atraso_aterrizados) if atraso_aterrizados else 0,
+            "aterrizajes": (len(min_cong_aterrizados) / n_sim) if n_sim else 0,
+            "prom_min_cong_aterrizados": np.mean(min_cong_aterrizados) if len(min_cong_aterrizados) else 0,
+            "atraso_aterrizados": np.mean(atraso_aterrizados) if len(atraso_aterrizados) else 0,
             "montevideo_prom": float(np.mean(mvd_rates)) if mvd_rates else 0.0,
             "freq_montevideo": (freq_montevideo_acum / n_sim) if n_sim else 0.0
         })
@@ -1008,35 +950,29 @@ def plot_atraso_prioritarios_vs_normales(df):
     import numpy as np
     import pandas as pd
     import matplotlib.pyplot as plt
-    from analisis import tiempo_ideal
+    from analisis import tiempo_ideal, tabla_aviones, aviones_por_fila
 
     t0 = tiempo_ideal()
     registros = []
 
-    for _, fila in df.iterrows():
-        lam = fila["lambda"]
-        historia = fila.get("historia", {})
-        atrasos_prio, atrasos_norm = [], []
-
-        for datos in historia.values():
-            es_prio = datos.get("prio", False)
-            estados = datos.get("estado", [])
-            tiempos = datos.get("t", [])
-            if not estados or not tiempos:
-                continue
-            if "Aterrizó" in estados:
-                idx = estados.index("Aterrizó")
-                minuto_aterrizo = tiempos[idx]
-                minuto_aparicion = tiempos[0]
-                t_real = minuto_aterrizo - minuto_aparicion
-                atraso = t_real - t0
-                (atrasos_prio if es_prio else atrasos_norm).append(atraso)
+    # ATRASOS DE LOS QUE ATERRIZARON, CORTADOS POR RÉPLICA (la tabla está ordenada por fila)
+    aviones = tabla_aviones(df)
+    aterrizo = (aviones["estado"] == "Aterrizó").to_numpy()
+    cortes = np.cumsum(aviones_por_fila(aviones, len(df), aterrizo))[:-1]
+    atrasos = np.split(aviones["atraso"].to_numpy()[aterrizo], cortes)
+    if "prio" in aviones:
+        marcas = np.split(aviones["prio"].to_numpy()[aterrizo], cortes)
+    else:
+        marcas = [np.zeros(len(a), dtype = bool) for a in atrasos]
+
+    for lam, atrasos_fila, es_prio in zip(df["lambda"], atrasos, marcas):
+        atrasos_prio, atrasos_norm = atrasos_fila[es_prio], atrasos_fila[~es_prio]
 
         # Usar el λ exacto que viene en el DataFrame
         registros.append({
             "lambda": lam,
-            "atraso_prio": np.mean(atrasos_prio) if atrasos_prio else np.nan,
-            "atraso_normal": np.mean(atrasos_norm) if atrasos_norm else np.nan
+            "atraso_prio": np.mean(atrasos_prio) if len(atrasos_prio) else np.nan,
+            "atraso_normal": np.mean(atrasos_norm) if len(atrasos_norm) else np.nan
         })
 
     df_runs = pd.DataFrame(registros)
@@ -1,37 +1,303 @@
+import bisect
+from operator import sub
+from estados import DESVIADO, RIO, TORMENTA
+from politicas import politica_base
+
 # ============================================================
 # ENUNCIADO / PARTE 1
 # ESTA CLASE REPRESENTA LA FILA DE AVIONES EN APROXIMACIÓN.
 # MANTIENE LOS AVIONES ORDENADOS POR DISTANCIA AL AEROPUERTO.
+# LA FILA PRINCIPAL SE MANTIENE ORDENADA EN CADA OPERACIÓN (INSERCIÓN CON BISECCIÓN),
+# ASÍ QUE NUNCA HACE FALTA REORDENAR TODO NI REESCRIBIR TODOS LOS PUNTEROS.
+# CADA AVIÓN DE LA FILA PRINCIPAL TIENE SUS DOS VECINOS: "next" (LÍDER) Y "seguidor".
+# CON ELLOS SE VE SI UN AVIÓN QUEDÓ FUERA DE ORDEN SIN BUSCAR SU POSICIÓN.
+# LA LISTA SIGUE SIENDO UNA list DE PYTHON: INSERTAR O SACAR EN EL MEDIO CORRE LOS DE ATRÁS
+# (memmove, O(n) PERO CON n DE DECENAS DE AVIONES); LAS BAJAS POR LA PUNTA (ATERRIZAJES)
+# Y LAS ALTAS POR LA COLA (ARRIBOS) NO RENUMERAN A NADIE.
 # ============================================================
 
+# CONSULTAS DE primer_gap QUE RECORREN LA FILA ANTES DE RECONSTRUIR EL ÁRBOL DE BRECHAS
+_CONSULTAS_SIN_ARBOL = 4
+
+def _distancia(avion):
+    return avion.distancia_mn_aep
+
+def _eta(avion):
+    # MINUTOS HASTA AEP A LA VELOCIDAD ACTUAL (MISMA CUENTA QUE plane._eta)
+    return avion.distancia_mn_aep / (avion.velocidad_actual / 60.0)
+
 class heap:
-    def __init__(self):
+    def __init__(self, ordenar_al_modificar = False):
         # LISTA ORDENADA DE AVIONES (MENOR DISTANCIA PRIMERO)
         self.aviones = []
+        # LAS FILAS OUTBOUND (desviados, viento, tormenta, montevideo) NO AVISAN CUANDO SUS AVIONES
+        # SE MUEVEN: ESAS SE REORDENAN COMPLETAS EN CADA ALTA/BAJA, COMO SIEMPRE.
+        self.ordenar_al_modificar = ordenar_al_modificar
+        # SEGUIDOR AL QUE SE LE ASIGNÓ UN LÍDER "A MANO" (ver enlazar)
+        self._enlace_manual = None
+        # MAPA AVIÓN -> NÚMERO; SU POSICIÓN ES número - _base. SOLO LAS PRIMERAS "_validas" POSICIONES
+        # ESTÁN AL DÍA: UNA INSERCIÓN O BAJA EN EL MEDIO CORRE A LOS DE ATRÁS, QUE SE RENUMERAN RECIÉN
+        # AL CONSULTARLOS. EN LA PUNTA SOLO SE CORRE _base Y NADIE SE RENUMERA.
+        self._posicion = {}
+        self._base = 0
+        self._validas = 0
+        # ÍNDICE DE BRECHAS DE ETA: ÁRBOL DE SEGMENTOS DE MÁXIMOS SOBRE LAS POSICIONES.
+        # HOJA k = ETA(aviones[k]) - ETA(aviones[k-1]). CADA MOVIMIENTO SOLO LO MARCA COMO VIEJO.
+        # ARMARLO CUESTA LO MISMO QUE UNAS CINCO RECORRIDAS DE LA FILA, ASÍ QUE LAS PRIMERAS
+        # CONSULTAS CON EL ÁRBOL VIEJO RECORREN LA FILA Y RECIÉN SI SIGUEN LLEGANDO CONSULTAS
+        # (muchos desviados en el mismo minuto, p. ej. después de una tormenta) SE RECONSTRUYE
+        # Y LAS SIGUIENTES BAJAN POR EL ÁRBOL EN O(log n).
+        # _arbol_viejo: 0 = AL DÍA; SI NO, 1 + CONSULTAS HECHAS DESDE QUE QUEDÓ VIEJO.
+        self._arbol = []
+        self._hojas = 0
+        self._arbol_viejo = 1
+
+    # ---------------- UTILITARIOS INTERNOS ----------------
+
+    def _posicion_ordenada(self, avion, preferida):
+        # POSICIÓN QUE TENDRÍA EL AVIÓN SI SE LO PONE EN "preferida" Y SE ORDENA LA LISTA
+        # (SORT ESTABLE): ENTRE AVIONES A LA MISMA DISTANCIA SE RESPETA "preferida".
+        d = avion.distancia_mn_aep
+        lo = bisect.bisect_left(self.aviones, d, key = _distancia)
+        hi = bisect.bisect_right(self.aviones, d, lo = lo, key = _distancia)
+        return min(max(preferida, lo), hi)
+
+    def _enlazar_posicion(self, i):
+        # ENLAZA AL AVIÓN DE LA POSICIÓN i CON SU LÍDER ("next") Y AL LÍDER CON ÉL ("seguidor").
+        # i == len(aviones) CIERRA LA COLA: EL ÚLTIMO QUEDA SIN SEGUIDOR.
+        aviones = self.aviones
+        if i >= len(aviones):
+            if aviones and i == len(aviones):
+                aviones[-1].seguidor = None
+            return
+        avion = aviones[i]
+        lider = aviones[i - 1] if i > 0 else None
+        avion.next = lider
+        if lider is not None:
+            lider.seguidor = avion
+
+    def _invalidar_desde(self, i):
+        if i < self._validas:
+            self._validas = i
+        self._arbol_viejo = 1
+
+    def _brecha(self, k):
+        # BRECHA DE ETA ENTRE EL AVIÓN k Y SU LÍDER (EL PRIMERO NO TIENE)
+        if k == 0:
+            return float("-inf")
+        return _eta(self.aviones[k]) - _eta(self.aviones[k - 1])
+
+    def _construir_arbol(self):
+        # LAS HOJAS SALEN DE UNA SOLA PASADA DE ETAs Y CADA NIVEL DE ARRIBA ES EL max DE A PARES DEL DE ABAJO
+        n = len(self.aviones)
+        hojas = 1
+        while hojas < n:
+            hojas *= 2
+        arbol = [float("-inf")] * (2 * hojas)
+        etas = [a.distancia_mn_aep / (a.velocidad_actual / 60.0) for a in self.aviones]
+        arbol[hojas + 1:hojas + n] = map(sub, etas[1:], etas[:-1])
+        nivel = hojas
+        while nivel > 1:
+            arbol[nivel // 2:nivel] = map(max, arbol[nivel:2 * nivel:2], arbol[nivel + 1:2 * nivel:2])
+            nivel //= 2
+        self._arbol, self._hojas, self._arbol_viejo = arbol, hojas, 0
+
+    def _primer_gap_recorriendo(self, umbral):
+        # LA MISMA CONSULTA QUE primer_gap, RECORRIENDO LA FILA (se corta en el primer gap)
+        eta_lider = 0.0
+        for k, avion in enumerate(self.aviones):
+            eta = avion.distancia_mn_aep / (avion.velocidad_actual / 60.0)
+            if k and eta - eta_lider >= umbral:
+                return k
+            eta_lider = eta
+        return None
+
+    def _insertar(self, avion, preferida):
+        # INSERTA EN SU LUGAR Y SOLO TOCA LOS PUNTEROS DEL AVIÓN Y DE SU SEGUIDOR
+        i = self._posicion_ordenada(avion, preferida)
+        self.aviones.insert(i, avion)
+        if i == 0:
+            # NUEVA PUNTA: LOS DEMÁS SE CORREN UNO, QUE ES CORRER _base
+            self._base -= 1
+            self._posicion[avion] = self._base
+            self._validas += 1
+        elif i == len(self.aviones) - 1:
+            # AL FINAL: NO CORRE A NADIE
+            self._posicion[avion] = i + self._base
+            if self._validas == i:
+                self._validas = i + 1
+        else:
+            self._invalidar_desde(i)
+        self._arbol_viejo = 1
+        self._enlazar_posicion(i)
+        self._enlazar_posicion(i + 1)
+
+    def _quitar(self, i):
+        # SACA EL AVIÓN DE LA POSICIÓN i; SU SEGUIDOR PASA A APUNTAR A SU LÍDER
+        avion = self.aviones.pop(i)
+        self._posicion.pop(avion, None)
+        if i == 0:
+            # ATERRIZAJE (O BAJA DE LA PUNTA): LOS DEMÁS QUEDAN UNO MÁS ADELANTE SIN RENUMERARLOS
+            self._base += 1
+            if self._validas > 0:
+                self._validas -= 1
+        else:
+            self._invalidar_desde(i)
+        self._arbol_viejo = 1
+        self._enlazar_posicion(i)
+        avion.seguidor = None
+        return avion
+
+    def _reparar_enlace_manual(self):
+        # UN LÍDER ASIGNADO A MANO DURA HASTA LA PRÓXIMA OPERACIÓN SOBRE LA FILA
+        # (ANTES LO PISABA EL REORDENAMIENTO COMPLETO; SE CONSERVA ESA SEMÁNTICA).
+        seguidor = self._enlace_manual
+        if seguidor is not None:
+            self._enlace_manual = None
+            self._enlazar_posicion(self.get_index(seguidor))
+
+    # ---------------- OPERACIONES SOBRE LA FILA ----------------
 
     def actualizar_orden(self):
-        # ORDENA LA LISTA DE AVIONES POR DISTANCIA AL AEP
-        self.aviones.sort(key = lambda avion: avion.distancia_mn_aep)
-        
-        # ACTUALIZA LOS PUNTEROS "next":
-        # cada avión apunta a su líder inmediato (el que está justo adelante en la fila).
-        for i, avion in enumerate(self.aviones):
-            if i == 0:
-                avion.next = None  # EL MÁS CERCANO A AEP NO TIENE LÍDER
-            else:
-                avion.next = self.aviones[i - 1]
+        if self.ordenar_al_modificar:
+            # ORDENA LA LISTA DE AVIONES POR DISTANCIA AL AEP Y ACTUALIZA TODOS LOS PUNTEROS "next"
+            # (ESTAS FILAS NO TOCAN "seguidor": ESE ENLACE ES SOLO DE LA FILA PRINCIPAL)
+            aviones = self.aviones
+            aviones.sort(key = _distancia)
+            lider = None
+            for avion in aviones:
+                avion.next = lider
+                lider = avion
+            self._invalidar_desde(0)
+            return
+        # LA FILA PRINCIPAL YA ESTÁ ORDENADA: SOLO DEJA LOS PUNTEROS "next" COHERENTES
+        # (cada avión apunta a su líder inmediato, el que está justo adelante en la fila).
+        if self._enlace_manual is not None:
+            self._reparar_enlace_manual()
+
+    def reubicar(self, avion):
+        # EL AVIÓN CAMBIÓ SU DISTANCIA: SI QUEDÓ FUERA DE ORDEN CON SUS VECINOS,
+        # SE LO SACA Y SE LO VUELVE A INSERTAR. EN EL CASO HABITUAL NO SE MUEVE NADA.
+        # SUS VECINOS SALEN DE LOS ENLACES: SOLO SE BUSCA SU POSICIÓN SI HAY QUE MOVERLO.
+        if self.ordenar_al_modificar:
+            self.actualizar_orden()
+            return
+        if self._enlace_manual is not None:
+            # PRIMERO SE DESHACE EL LÍDER A MANO: ASÍ "next" VUELVE A SER EL DE LA FILA
+            self._reparar_enlace_manual()
+        d = avion.distancia_mn_aep
+        lider, seguidor = avion.next, avion.seguidor
+        if (lider is not None and lider.distancia_mn_aep > d) or \
+           (seguidor is not None and seguidor.distancia_mn_aep < d):
+            i = self.get_index(avion)
+            self._quitar(i)
+            self._insertar(avion, i)
+        # CAMBIÓ SU ETA: EL ÍNDICE DE BRECHAS QUEDA VIEJO
+        self._arbol_viejo = 1
+
+    def refrescar_eta(self, avion):
+        # EL AVIÓN CAMBIÓ SU VELOCIDAD SIN MOVERSE (p. ej. un líder al que le piden acelerar)
+        self._arbol_viejo = 1
+
+    def primer_gap(self, umbral):
+        # POSICIÓN DEL PRIMER AVIÓN QUE ESTÁ A ≥ umbral MINUTOS (ETA) DE SU LÍDER, O None.
+        # REINSERTARSE AHÍ ES QUEDAR ENTRE ESE AVIÓN Y SU LÍDER. CON EL ÁRBOL AL DÍA: O(log n).
+        if self.ordenar_al_modificar:
+            for k in range(1, len(self.aviones)):
+                if self._brecha(k) >= umbral:
+                    return k
+            return None
+        viejo = self._arbol_viejo
+        if viejo:
+            if viejo <= _CONSULTAS_SIN_ARBOL:
+                self._arbol_viejo = viejo + 1
+                return self._primer_gap_recorriendo(umbral)
+            self._construir_arbol()
+        if not self.aviones or self._arbol[1] < umbral:
+            return None
+        nodo = 1
+        while nodo < self._hojas:
+            nodo = 2 * nodo if self._arbol[2 * nodo] >= umbral else 2 * nodo + 1
+        return nodo - self._hojas
 
     def agregar_avion(self, avion):
-        # AGREGA UN NUEVO AVIÓN A LA FILA Y REORDENA LA LISTA.
-        self.aviones.append(avion)
-        self.actualizar_orden()
+        # AGREGA UN NUEVO AVIÓN A LA FILA EN SU LUGAR (DETRÁS DE LOS QUE ESTÁN A LA MISMA DISTANCIA).
+        self.insertar_avion(avion, len(self.aviones))
+
+    def insertar_avion(self, avion, posicion):
+        # INSERTA UN AVIÓN PEDIDO EN "posicion" (REINSERCIÓN), RESPETANDO EL ORDEN POR DISTANCIA.
+        if self.ordenar_al_modificar:
+            self.aviones.insert(posicion, avion)
+            self.actualizar_orden()
+            return
+        self._insertar(avion, posicion)
+        self._reparar_enlace_manual()
 
     def eliminar_avion(self, avion):
-        # ELIMINA UN AVIÓN DE LA FILA Y REORDENA LA LISTA.
+        # ELIMINA UN AVIÓN DE LA FILA.
         # IMPORTANTE: SE ACTUALIZAN LOS PUNTEROS NEXT PARA MANTENER COHERENCIA.
-        self.aviones.remove(avion)
-        self.actualizar_orden()
-        
+        if self.ordenar_al_modificar:
+            self.aviones.remove(avion)
+            self._posicion.pop(avion, None)
+            self.actualizar_orden()
+            return
+        if self._enlace_manual is avion:
+            self._enlace_manual = None
+        self._quitar(self.get_index(avion))
+        self._reparar_enlace_manual()
+
+    def enlazar(self, seguidor, lider):
+        # ASIGNA A MANO EL LÍDER DE UN SEGUIDOR (lo usa plane._descolar_y_reenlazar).
+        seguidor.next = lider
+        self._enlace_manual = seguidor
+
     def get_index(self, avion):
         # DEVUELVE EL ÍNDICE (POSICIÓN) DE UN AVIÓN EN LA FILA.
-        return self.aviones.index(avion)
\ No newline at end of file
+        # O(1) SALVO QUE HAYA QUE RENUMERAR LA COLA QUE QUEDÓ CORRIDA POR UNA INSERCIÓN/BAJA.
+        numero = self._posicion.get(avion)
+        if numero is not None and 0 <= numero - self._base < self._validas:
+            return numero - self._base
+        for k in range(self._validas, len(self.aviones)):
+            self._posicion[self.aviones[k]] = k + self._base
+        self._validas = len(self.aviones)
+        if avion not in self._posicion:
+            raise ValueError("el avión no está en la fila")
+        return self._posicion[avion] - self._base
+
+    def lider_de(self, avion):
+        # AVIÓN INMEDIATAMENTE ADELANTE EN LA FILA (None SI ES EL PRIMERO)
+        if not self.ordenar_al_modificar and self._enlace_manual is not avion:
+            return avion.next
+        i = self.get_index(avion)
+        return self.aviones[i - 1] if i > 0 else None
+
+    def seguidor_de(self, avion):
+        # AVIÓN INMEDIATAMENTE ATRÁS EN LA FILA (None SI ES EL ÚLTIMO)
+        if not self.ordenar_al_modificar:
+            return avion.seguidor
+        i = self.get_index(avion) + 1
+        return self.aviones[i] if i < len(self.aviones) else None
+
+
+# ============================================================
+# FILAS DE UNA SIMULACIÓN (principal, outbound, montevideo) Y SU HISTORIA.
+# SE CREA UNA VEZ POR SIMULACIÓN Y TODOS LOS AVIONES LA COMPARTEN
+# (cada avión guarda una sola referencia en vez de una por fila).
+# TAMBIÉN LLEVA EL GENERADOR ALEATORIO DE LA CORRIDA: NADA USA EL random GLOBAL.
+# ============================================================
+
+class espacio_aereo:
+    __slots__ = ("fila", "desviados", "mtvd", "viento", "tormenta", "historia", "rng", "outbound", "politica")
+
+    def __init__(self, fila, desviados, mtvd, viento, tormenta, historia = None, rng = None, politica = None):
+        self.fila = fila               # Fila principal de aproximación
+        self.desviados = desviados     # Desvíos por congestión (parte 4)
+        self.mtvd = mtvd               # Aviones que se fueron a Montevideo
+        self.viento = viento           # Desvíos por día ventoso (parte 5)
+        self.tormenta = tormenta       # Desvíos por tormenta (parte 6)
+        self.historia = historia       # Historia para registrar datos (o None)
+        self.rng = rng                 # Generador propio de la corrida (random.Random)
+        # REGLA DE SEPARACIÓN / TECHO DE VELOCIDAD DE LA CORRIDA (ver politicas.py)
+        self.politica = politica if politica is not None else politica_base()
+        # FILA OUTBOUND QUE LE CORRESPONDE A CADA ESTADO DE DESVÍO
+        self.outbound = {DESVIADO: desviados, RIO: viento, TORMENTA: tormenta}
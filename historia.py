@@ -0,0 +1,537 @@
+import numpy as np
+from array import array
+from collections.abc import Mapping, ItemsView, ValuesView
+from estados import ESTADOS, EN_FILA, REINSERTADO, ATERRIZO, MONTEVIDEO
+
+# ============================================================
+# ENUNCIADO / PARTES 1, 4, 5 y 6
+# HISTORIA DE LOS AVIONES GUARDADA EN COLUMNAS (en lugar de un dict de listas por avión).
+# MIENTRAS CORRE LA SIMULACIÓN LOS REGISTROS SE AGREGAN A ARREGLOS TIPADOS (array.array, sin
+# objetos Python por valor). AL LEERLA POR PRIMERA VEZ SE PASAN A ARREGLOS NUMPY ORDENADOS
+# POR AVIÓN, CON EL OFFSET DONDE EMPIEZA CADA UNO.
+#
+# historia[id] SIGUE DEVOLVIENDO {"t": [...], "x": [...], "v": [...], "estado": [...], "vmax": [...]}
+# (y "prio" en la simulación con clases de prioridad), ARMADO EN EL MOMENTO DESDE LAS COLUMNAS,
+# ASÍ QUE EL CÓDIGO DE ANÁLISIS Y LOS GRÁFICOS NO CAMBIAN.
+#
+# HAY TRES GRUPOS DE COLUMNAS PORQUE NO TODOS LOS REGISTROS TIENEN TODOS LOS CAMPOS:
+#   "t"      → todos los registros
+#   "x"      → x, v, vmax (avión en vuelo)
+#   "estado" → estado (todos salvo la salida a Montevideo desde outbound)
+# ============================================================
+
+_GRUPOS = {"t": ("t",), "x": ("x", "v", "vmax"), "estado": ("estado",)}
+_TIPOS = {"t": "i", "x": "d", "v": "d", "vmax": "d", "estado": "b"}
+_ETIQUETAS = np.array(ESTADOS, dtype = object)
+# CLASES DE LAS TABLAS QUE SOLO TRAEN LA MARCA "prio" (las de dos clases de politica_prioritaria)
+CLASES_PRIO = ("prioritario", "normal")
+
+
+def _prio(clase, clases):
+    # "prioritario" = CUALQUIER CLASE SALVO LA ÚLTIMA (la de menor prioridad)
+    return clase < len(clases) - 1
+
+
+class historia_vuelos(Mapping):
+    def __init__(self, clases = None):
+        self._ids = array("i")          # IDs en orden de aparición (crecientes)
+        # CLASE DE PRIORIDAD DE CADA AVIÓN: ÍNDICE EN clases (nombres, de mayor a menor prioridad).
+        # SOLO SI LA POLÍTICA TIENE CLASES (politica_clases); SI NO, clases ES None
+        self._clase = array("b")
+        self.clases = None if clases is None else tuple(clases)
+        # REGISTROS NUEVOS (todavía sin ordenar), UN JUEGO DE ARREGLOS POR TIPO DE REGISTRO
+        # (así registrar() hace una sola carga de id por registro):
+        #   completos: t, x, v, vmax, estado  /  salidas: t, x, v, vmax  /  estados: t, estado
+        self._limpiar()
+        # COLUMNAS ORDENADAS POR AVIÓN Y OFFSETS (se arman al leer)
+        self._columnas = None
+        self._offsets = None
+        # RESUMEN POR AVIÓN (ver resumen_vuelos): SE CALCULA DE LAS COLUMNAS AL PEDIRLO
+        self._resumen = None
+
+    def _limpiar(self):
+        self._id_c, self._t_c, self._x_c, self._v_c, self._vmax_c, self._e_c = \
+            array("i"), array("i"), array("d"), array("d"), array("d"), array("b")
+        self._id_s, self._t_s, self._x_s, self._v_s, self._vmax_s = \
+            array("i"), array("i"), array("d"), array("d"), array("d")
+        self._id_e, self._t_e, self._e_e = array("i"), array("i"), array("b")
+
+    # ---------------- REGISTROS (los usa la simulación) ----------------
+
+    def nuevo_avion(self, id_avion, clase = None):
+        self._ids.append(id_avion)
+        if clase is not None:
+            self._clase.append(clase)
+
+    def registrar(self, id_avion, t, x, v, codigo, vmax):
+        # AVIÓN EN VUELO: t, x, v, estado, vmax
+        self._id_c.append(id_avion)
+        self._t_c.append(t)
+        self._x_c.append(x)
+        self._v_c.append(v)
+        self._vmax_c.append(vmax)
+        self._e_c.append(codigo)
+
+    def registrar_estado(self, id_avion, t, codigo):
+        # ATERRIZÓ / MONTEVIDEO: SOLO t Y estado
+        self._id_e.append(id_avion)
+        self._t_e.append(t)
+        self._e_e.append(codigo)
+
+    def registrar_salida(self, id_avion, t, x, v, vmax):
+        # SALE A MONTEVIDEO DESDE OUTBOUND: t, x, v, vmax (el estado se registra en el minuto)
+        self._id_s.append(id_avion)
+        self._t_s.append(t)
+        self._x_s.append(x)
+        self._v_s.append(v)
+        self._vmax_s.append(vmax)
+
+    @property
+    def resumen(self):
+        # EL MISMO resumen_vuelos QUE ACUMULA record = "summary", CALCULADO DE UNA VEZ SOBRE LAS COLUMNAS
+        # (y guardado hasta que lleguen registros nuevos)
+        if self._resumen is None or len(self._id_c) or len(self._id_s) or len(self._id_e):
+            self._resumen = self._resumir()
+        return self._resumen
+
+    # ---------------- ARMADO DE COLUMNAS ----------------
+
+    @classmethod
+    def desde_columnas(cls, ids, id_t, t, id_x, x, v, vmax, id_estado, estado, clase = None, clases = None):
+        # ARMA LA HISTORIA DIRECTO DESDE ARREGLOS (registros en orden cronológico), SIN PASAR POR registrar()
+        h = cls(clases)
+        h._ids = array("i", np.asarray(ids, dtype = np.int32).tobytes())
+        if clase is not None:
+            h._clase = array("b", np.asarray(clase, dtype = np.int8).tobytes())
+        h._cargar({
+            "t": (id_t, [t]),
+            "x": (id_x, [x, v, vmax]),
+            "estado": (id_estado, [estado]),
+        })
+        return h
+
+    def _resumir(self):
+        c = self.columnas()
+        ids, col, off = c["ids"], c["columnas"], c["offsets"]
+        n_t, n_x, n_e = (np.diff(off[g]) for g in ("t", "x", "estado"))
+        con_t, con_e = n_t > 0, n_e > 0
+        aparicion = np.full(len(ids), -1, dtype = np.int32)
+        aparicion[con_t] = col["t"][off["t"][:-1][con_t]]
+        estado = np.full(len(ids), EN_FILA, dtype = np.int8)
+        estado[con_e] = col["estado"][off["estado"][1:][con_e] - 1]
+        # EL REGISTRO DE ATERRIZÓ / MONTEVIDEO ES EL ÚLTIMO DEL AVIÓN
+        fin = np.full(len(ids), -1, dtype = np.int32)
+        termino = (estado == ATERRIZO) | (estado == MONTEVIDEO)
+        ultimo = np.full(len(ids), -1, dtype = np.int32)
+        ultimo[con_t] = col["t"][off["t"][1:][con_t] - 1]
+        fin[termino] = ultimo[termino]
+        # CADA REGISTRO DE POSICIÓN SE APAREA CON EL ESTADO DE SU MISMA POSICIÓN DENTRO DEL AVIÓN
+        avion = np.repeat(np.arange(len(ids)), n_x)
+        pos = np.arange(len(avion)) - off["x"][:-1][avion]
+        par = pos < np.minimum(n_x, n_e)[avion]
+        fila_x = np.flatnonzero(par)
+        avion = avion[par]
+        e = col["estado"][off["estado"][:-1][avion] + pos[par]]
+        cong = ((e == EN_FILA) | (e == REINSERTADO)) & (col["v"][fila_x] < col["vmax"][fila_x])
+        x = col["x"][fila_x][cong]
+        avion = avion[cong]
+        tramos = [np.bincount(avion[sel], minlength = len(ids)) for sel in (x > 50, (x <= 50) & (x > 15), x <= 15)]
+        clase = np.frombuffer(self._clase, dtype = np.int8) if len(self._clase) else None
+        return resumen_vuelos.desde_columnas(ids, aparicion, fin, ultimo, estado, *tramos, n_x, n_e, clase, self.clases)
+
+    def _ordenar(self):
+        # PASA LOS REGISTROS NUEVOS A LAS COLUMNAS ORDENADAS POR AVIÓN. DE CADA AVIÓN VAN PRIMERO SUS
+        # REGISTROS COMPLETOS (en orden cronológico), DESPUÉS LA SALIDA A MONTEVIDEO Y AL FINAL EL
+        # ATERRIZAJE / MONTEVIDEO: ES EL ORDEN EN QUE LOS REGISTRA LA SIMULACIÓN.
+        if self._columnas is not None and not (len(self._id_c) or len(self._id_s) or len(self._id_e)):
+            return
+        def nuevos(*arreglos):
+            return np.concatenate([np.frombuffer(a, dtype = a.typecode) for a in arreglos])
+        self._cargar({
+            "t": (nuevos(self._id_c, self._id_s, self._id_e), [nuevos(self._t_c, self._t_s, self._t_e)]),
+            "x": (nuevos(self._id_c, self._id_s), [nuevos(self._x_c, self._x_s), nuevos(self._v_c, self._v_s),
+                                                   nuevos(self._vmax_c, self._vmax_s)]),
+            "estado": (nuevos(self._id_c, self._id_e), [nuevos(self._e_c, self._e_e)]),
+        })
+        # LOS REGISTROS YA ESTÁN EN LAS COLUMNAS: SE VACÍAN LOS ARREGLOS DE CARGA
+        self._limpiar()
+
+    def _cargar(self, grupos):
+        # grupos[g] = (ids de cada registro, [valores de cada campo de g]). ORDEN ESTABLE POR AVIÓN:
+        # CADA AVIÓN CONSERVA EL ORDEN DE LLEGADA. SI YA HABÍA COLUMNAS, LOS NUEVOS VAN DESPUÉS DE ELLAS.
+        ids = np.frombuffer(self._ids, dtype = np.int32)
+        columnas, offsets = {}, {}
+        for grupo, campos in _GRUPOS.items():
+            claves, valores = grupos[grupo]
+            claves = np.asarray(claves, dtype = np.int32)
+            valores = [np.asarray(val, dtype = _TIPOS[c]) for c, val in zip(campos, valores)]
+            if self._columnas is not None:
+                previas = np.repeat(ids[:len(self._offsets[grupo]) - 1], np.diff(self._offsets[grupo]))
+                claves = np.concatenate([previas, claves])
+                valores = [np.concatenate([self._columnas[c], nuevos]) for c, nuevos in zip(campos, valores)]
+            orden = np.argsort(claves, kind = "stable")
+            claves = claves[orden]
+            for c, val in zip(campos, valores):
+                columnas[c] = val[orden]
+            offsets[grupo] = np.append(np.searchsorted(claves, ids), len(claves))
+        self._columnas = columnas
+        self._offsets = offsets
+        self._resumen = None
+
+    def columnas(self):
+        # COLUMNAS NUMPY ORDENADAS POR AVIÓN + OFFSETS POR GRUPO (filas de ids[i] = offsets[i]:offsets[i+1])
+        self._ordenar()
+        return {
+            "ids": np.frombuffer(self._ids, dtype = np.int32),
+            "columnas": self._columnas,
+            "offsets": self._offsets,
+        }
+
+    # ---------------- TABLA LARGA (una fila por registro) ----------------
+
+    def registros(self):
+        # UNA FILA POR REGISTRO, EN ORDEN DE AVIÓN Y DE TIEMPO: id, t, x, v, vmax, estado (código), prio y clase (índice),
+        # COMO ARREGLOS NUMPY. x, v, vmax QUEDAN EN NaN Y estado EN -1 EN LOS REGISTROS QUE NO LOS TIENEN.
+        # CADA AVIÓN TIENE PRIMERO SUS REGISTROS COMPLETOS, DESPUÉS LA SALIDA A MONTEVIDEO
+        # (solo posición) Y AL FINAL EL ATERRIZAJE / MONTEVIDEO (solo estado)
+        c = self.columnas()
+        col, off = c["columnas"], c["offsets"]
+        n_t, n_x, n_e = (np.diff(off[g]) for g in ("t", "x", "estado"))
+        completos = n_x + n_e - n_t
+        avion = np.repeat(np.arange(len(c["ids"])), n_t)
+        k = np.arange(len(avion)) - off["t"][:-1][avion]
+        con_x = k < n_x[avion]
+        con_e = (k < completos[avion]) | ~con_x
+        datos = {"id": c["ids"][avion], "t": col["t"]}
+        for campo in ("x", "v", "vmax"):
+            valores = np.full(len(avion), np.nan)
+            valores[con_x] = col[campo][off["x"][:-1][avion[con_x]] + k[con_x]]
+            datos[campo] = valores
+        fila_e = off["estado"][:-1][avion] + np.where(k < completos[avion], k, k - n_x[avion] + completos[avion])
+        codigos = np.full(len(avion), -1, dtype = np.int8)
+        codigos[con_e] = col["estado"][fila_e[con_e]]
+        datos["estado"] = codigos
+        if len(self._clase):
+            clase = np.frombuffer(self._clase, dtype = np.int8)[avion]
+            datos["prio"] = _prio(clase, self.clases)
+            datos["clase"] = clase
+        return datos
+
+    def tabla(self):
+        # registros() COMO DataFrame, CON EL ESTADO Y LA CLASE EN TEXTO (categóricos)
+        import pandas as pd
+        datos = self.registros()
+        datos["estado"] = pd.Categorical.from_codes(datos["estado"], categories = ESTADOS)
+        if "clase" in datos:
+            datos["clase"] = pd.Categorical.from_codes(datos["clase"], categories = self.clases)
+        return pd.DataFrame(datos)
+
+    @classmethod
+    def desde_tabla(cls, tabla):
+        # LA INVERSA DE tabla(): ARMA LA HISTORIA DESDE UNA TABLA LARGA (p. ej. LEÍDA DE PARQUET)
+        import pandas as pd
+        tabla = tabla.sort_values("id", kind = "stable")
+        ids_fila = tabla["id"].to_numpy()
+        ids, primera = np.unique(ids_fila, return_index = True)
+        x = tabla["x"].to_numpy(dtype = np.float64)
+        con_x = ~np.isnan(x)
+        codigos = np.asarray(pd.Categorical(tabla["estado"], categories = ESTADOS).codes)
+        con_e = codigos >= 0
+        clase, clases = _clases_de_tabla(tabla)
+        return cls.desde_columnas(
+            ids, ids_fila, tabla["t"].to_numpy(),
+            ids_fila[con_x], x[con_x], tabla["v"].to_numpy()[con_x], tabla["vmax"].to_numpy()[con_x],
+            ids_fila[con_e], codigos[con_e], None if clase is None else clase[primera], clases)
+
+    # ---------------- VISTA COMPATIBLE: historia[id]["x"] ----------------
+
+    def _posicion(self, id_avion):
+        # LOS IDs SUELEN SER CONSECUTIVOS (1, 2, 3, ...): SE PRUEBA PRIMERO ESA POSICIÓN
+        if len(self._ids):
+            i = id_avion - self._ids[0]
+            if 0 <= i < len(self._ids) and self._ids[i] == id_avion:
+                return i
+        ids = np.frombuffer(self._ids, dtype = np.int32)
+        i = int(np.searchsorted(ids, id_avion))
+        if i < len(ids) and ids[i] == id_avion:
+            return i
+        return None
+
+    def __getitem__(self, id_avion):
+        i = self._posicion(id_avion)
+        if i is None:
+            raise KeyError(id_avion)
+        self._ordenar()
+        col, off = self._columnas, self._offsets
+        a, b = off["t"][i], off["t"][i + 1]
+        ax, bx = off["x"][i], off["x"][i + 1]
+        ae, be = off["estado"][i], off["estado"][i + 1]
+        datos = {
+            "t": col["t"][a:b].tolist(),
+            "x": col["x"][ax:bx].tolist(),
+            "v": col["v"][ax:bx].tolist(),
+            "estado": [ESTADOS[c] for c in col["estado"][ae:be].tolist()],
+            "vmax": col["vmax"][ax:bx].tolist(),
+        }
+        if len(self._clase):
+            datos["prio"] = bool(_prio(self._clase[i], self.clases))
+        return datos
+
+    def _recorrer(self):
+        # RECORRIDA COMPLETA (items / values): CADA COLUMNA SE PASA A LISTA UNA SOLA VEZ
+        # Y CADA AVIÓN ES UN CORTE DE ESAS LISTAS
+        self._ordenar()
+        col, off = self._columnas, self._offsets
+        t, x, v, vmax = (col[c].tolist() for c in ("t", "x", "v", "vmax"))
+        estado = _ETIQUETAS[col["estado"]].tolist()
+        ot, ox, oe = (off[g].tolist() for g in ("t", "x", "estado"))
+        prio = _prio(np.frombuffer(self._clase, dtype = np.int8), self.clases).tolist() if len(self._clase) else None
+        for i, id_avion in enumerate(self._ids.tolist()):
+            a, b = ot[i], ot[i + 1]
+            ax, bx = ox[i], ox[i + 1]
+            datos = {
+                "t": t[a:b],
+                "x": x[ax:bx],
+                "v": v[ax:bx],
+                "estado": estado[oe[i]:oe[i + 1]],
+                "vmax": vmax[ax:bx],
+            }
+            if prio is not None:
+                datos["prio"] = bool(prio[i])
+            yield id_avion, datos
+
+    def items(self):
+        return _Items(self)
+
+    def values(self):
+        return _Values(self)
+
+    def __contains__(self, id_avion):
+        return self._posicion(id_avion) is not None
+
+    def __iter__(self):
+        return iter(self._ids.tolist())
+
+    def __len__(self):
+        return len(self._ids)
+
+    def __repr__(self):
+        return f"<historia_vuelos: {len(self)} aviones>"
+
+
+class _Items(ItemsView):
+    def __iter__(self):
+        return self._mapping._recorrer()
+
+
+class _Values(ValuesView):
+    def __iter__(self):
+        for _, datos in self._mapping._recorrer():
+            yield datos
+
+
+def _clases_de_tabla(tabla):
+    # CLASE DE CADA FILA (índice) Y NOMBRES DE LAS CLASES DE UNA TABLA LARGA; UNA TABLA CON SOLO LA
+    # MARCA "prio" (guardada antes de que hubiera clases) ES DE DOS CLASES: prioritario / normal
+    import pandas as pd
+    if "clase" in tabla:
+        clase = tabla["clase"]
+        if not isinstance(clase.dtype, pd.CategoricalDtype):
+            clase = clase.astype("category")
+        return np.asarray(clase.cat.codes, dtype = np.int8), tuple(clase.cat.categories)
+    if "prio" in tabla:
+        return np.where(tabla["prio"].to_numpy(dtype = bool), 0, 1).astype(np.int8), CLASES_PRIO
+    return None, None
+
+
+# ============================================================
+# NIVELES DE DETALLE DE LA HISTORIA (record = "full" / "summary" / "off")
+# "summary": UNA FILA POR AVIÓN (aparición, minuto en que aterrizó o se fue a Montevideo,
+#            estado final, minutos de congestión por tramo y clase de prioridad).
+#            RECIBE LOS MISMOS registrar(...) QUE historia_vuelos Y VA ACUMULANDO. CUANDO UN AVIÓN
+#            ATERRIZA O SE VA A MONTEVIDEO SU APORTE QUEDA CERRADO EN LOS TOTALES, ASÍ QUE LAS
+#            MÉTRICAS DE CADA FILA DE experimentos SALEN SIN RECORRER LA HISTORIA.
+#            CON record = "full" historia_vuelos LO CALCULA AL PEDIRLO (historia.resumen).
+# "off":     NO GUARDA NADA POR MINUTO.
+# ============================================================
+
+class resumen_vuelos:
+    def __init__(self, clases = None):
+        self._pos = {}                  # id → fila
+        self.ids = array("i")
+        self.aparicion = array("i")     # PRIMER MINUTO REGISTRADO
+        self.fin = array("i")           # MINUTO EN QUE ATERRIZÓ / SE FUE A MONTEVIDEO (-1 si sigue volando)
+        self.ultimo = array("i")        # ÚLTIMO MINUTO REGISTRADO
+        self.estado = array("b")        # ÚLTIMO ESTADO REGISTRADO (código)
+        self.cong_lejos = array("i")    # MINUTOS EN CONGESTIÓN A > 50 MN
+        self.cong_medio = array("i")    # 15–50 MN
+        self.cong_cerca = array("i")    # < 15 MN
+        self.n_x = array("i")           # REGISTROS CON POSICIÓN (x, v, vmax)
+        self.n_estado = array("i")      # REGISTROS CON ESTADO
+        self.clase = array("b")         # CLASE DE PRIORIDAD (índice en clases), COMO EN historia_vuelos
+        self.clases = None if clases is None else tuple(clases)
+        # TOTALES QUE SE CIERRAN CUANDO CADA AVIÓN ATERRIZA O SE VA A MONTEVIDEO:
+        # [aviones, minutos en congestión, lejos, medio, cerca, minutos registrados]
+        self.cerrados = {ATERRIZO: [0, 0, 0, 0, 0, 0], MONTEVIDEO: [0, 0, 0, 0, 0, 0]}
+
+    def nuevo_avion(self, id_avion, clase = None):
+        self._pos[id_avion] = len(self.ids)
+        self.ids.append(id_avion)
+        self.aparicion.append(-1)
+        self.fin.append(-1)
+        self.ultimo.append(-1)
+        self.estado.append(EN_FILA)
+        self.cong_lejos.append(0)
+        self.cong_medio.append(0)
+        self.cong_cerca.append(0)
+        self.n_x.append(0)
+        self.n_estado.append(0)
+        if clase is not None:
+            self.clase.append(clase)
+
+    def registrar(self, id_avion, t, x, v, codigo, vmax):
+        i = self._pos[id_avion]
+        if self.aparicion[i] < 0:
+            self.aparicion[i] = t
+        self.ultimo[i] = t
+        self.estado[i] = codigo
+        self.n_x[i] += 1
+        self.n_estado[i] += 1
+        # MISMO CRITERIO QUE calcular_congestion_por_tramo: EN FILA/REINSERTADO Y v < vmax
+        if (codigo == EN_FILA or codigo == REINSERTADO) and v < vmax:
+            if x > 50:
+                self.cong_lejos[i] += 1
+            elif x > 15:
+                self.cong_medio[i] += 1
+            else:
+                self.cong_cerca[i] += 1
+
+    def registrar_estado(self, id_avion, t, codigo):
+        i = self._pos[id_avion]
+        if self.aparicion[i] < 0:
+            self.aparicion[i] = t
+        self.ultimo[i] = t
+        self.estado[i] = codigo
+        self.n_estado[i] += 1
+        if codigo == ATERRIZO or codigo == MONTEVIDEO:
+            # EL AVIÓN TERMINÓ: SU APORTE PASA A LOS TOTALES
+            self.fin[i] = t
+            lejos, medio, cerca = self.cong_lejos[i], self.cong_medio[i], self.cong_cerca[i]
+            total = self.cerrados[codigo]
+            total[0] += 1
+            total[1] += lejos + medio + cerca
+            total[2] += lejos
+            total[3] += medio
+            total[4] += cerca
+            # MINUTOS QUE RECORRE analizar_congestion_montevideo (estado y velocidad a la par)
+            total[5] += min(self.n_x[i], self.n_estado[i])
+
+    def registrar_salida(self, id_avion, t, x, v, vmax):
+        i = self._pos[id_avion]
+        if self.aparicion[i] < 0:
+            self.aparicion[i] = t
+        self.ultimo[i] = t
+        self.n_x[i] += 1
+
+    # ---------------- ARMADO DESDE COLUMNAS ----------------
+
+    @classmethod
+    def desde_columnas(cls, ids, aparicion, fin, ultimo, estado, cong_lejos, cong_medio, cong_cerca, n_x, n_estado,
+                       clase = None, clases = None):
+        # ARMA EL RESUMEN DE UNA CORRIDA QUE YA TERMINÓ (p. ej. DESDE LAS COLUMNAS DE historia_vuelos)
+        r = cls(clases)
+        for campo, valores in (("ids", ids), ("aparicion", aparicion), ("fin", fin), ("ultimo", ultimo), ("cong_lejos", cong_lejos),
+                               ("cong_medio", cong_medio), ("cong_cerca", cong_cerca), ("n_x", n_x), ("n_estado", n_estado)):
+            setattr(r, campo, array("i", np.asarray(valores, dtype = np.int32).tobytes()))
+        r.estado = array("b", np.asarray(estado, dtype = np.int8).tobytes())
+        if clase is not None:
+            r.clase = array("b", np.asarray(clase, dtype = np.int8).tobytes())
+        r._pos = {id_avion: i for i, id_avion in enumerate(r.ids)}
+        c = r.columnas()
+        lejos, medio, cerca = (c["cong_" + tramo].astype(np.int64) for tramo in ("lejos", "medio", "cerca"))
+        minutos = np.minimum(c["n_x"], c["n_estado"]).astype(np.int64)
+        for codigo in (ATERRIZO, MONTEVIDEO):
+            m = c["estado"] == codigo
+            r.cerrados[codigo] = [int(m.sum()), int((lejos + medio + cerca)[m].sum()), int(lejos[m].sum()),
+                                  int(medio[m].sum()), int(cerca[m].sum()), int(minutos[m].sum())]
+        return r
+
+    # ---------------- MÉTRICAS (sin recorrer trayectorias) ----------------
+
+    def columnas(self):
+        # ARREGLOS NUMPY (una posición por avión)
+        columnas = {c: np.frombuffer(getattr(self, c), dtype = np.int32)
+                    for c in ("ids", "aparicion", "fin", "ultimo", "cong_lejos", "cong_medio", "cong_cerca", "n_x", "n_estado")}
+        columnas["estado"] = np.frombuffer(self.estado, dtype = np.int8)
+        # clase = ÍNDICE EN self.clases; prio = CUALQUIER CLASE SALVO LA ÚLTIMA (None si no hay clases)
+        columnas["clase"] = np.frombuffer(self.clase, dtype = np.int8) if len(self.clase) else None
+        columnas["prio"] = None if columnas["clase"] is None else _prio(columnas["clase"], self.clases)
+        return columnas
+
+    def congestion(self, codigo = ATERRIZO):
+        # MINUTOS DE CONGESTIÓN PROMEDIO POR AVIÓN (total y por tramo) DE LOS QUE ATERRIZARON / FUERON A MONTEVIDEO
+        n, total, lejos, medio, cerca, _ = self.cerrados[codigo]
+        if n == 0:
+            return {"promedio": 0.0, "lejos": 0.0, "medio": 0.0, "cerca": 0.0}
+        return {"promedio": np.float64(total) / n, "lejos": np.float64(lejos) / n,
+                "medio": np.float64(medio) / n, "cerca": np.float64(cerca) / n}
+
+    def frecuencia_congestion(self, codigo = MONTEVIDEO):
+        # PROPORCIÓN DE MINUTOS REGISTRADOS EN CONGESTIÓN
+        _, total, _, _, _, minutos = self.cerrados[codigo]
+        return total / minutos if minutos > 0 else 0.0
+
+    def atraso_promedio(self, t_ideal):
+        # SE PROMEDIA EN ORDEN DE ID (como el recorrido de la historia) PARA DAR EXACTAMENTE EL MISMO NÚMERO
+        c = self.columnas()
+        aterrizo = c["estado"] == ATERRIZO
+        atrasos = (c["fin"][aterrizo] - c["aparicion"][aterrizo]) - t_ideal
+        return np.mean(atrasos) if len(atrasos) else 0.0
+
+    def tabla(self):
+        # LA MISMA INFORMACIÓN COMO DataFrame (estado con su texto)
+        import pandas as pd
+        c = self.columnas()
+        tabla = pd.DataFrame({
+            "id": c["ids"], "aparicion": c["aparicion"], "fin": c["fin"], "ultimo": c["ultimo"],
+            "estado": _ETIQUETAS[c["estado"]],
+            "cong_lejos": c["cong_lejos"], "cong_medio": c["cong_medio"], "cong_cerca": c["cong_cerca"],
+        })
+        if c["clase"] is not None:
+            tabla["prio"] = c["prio"]
+            tabla["clase"] = pd.Categorical.from_codes(c["clase"], categories = self.clases)
+        return tabla
+
+    def __len__(self):
+        return len(self.ids)
+
+    def __repr__(self):
+        return f"<resumen_vuelos: {len(self)} aviones>"
+
+
+class sin_historia:
+    # record = "off": ACEPTA LOS MISMOS REGISTROS Y NO GUARDA NADA
+    def __init__(self, clases = None):
+        pass
+
+    def nuevo_avion(self, id_avion, clase = None):
+        pass
+
+    def registrar(self, id_avion, t, x, v, codigo, vmax):
+        pass
+
+    def registrar_estado(self, id_avion, t, codigo):
+        pass
+
+    def registrar_salida(self, id_avion, t, x, v, vmax):
+        pass
+
+
+NIVELES = {"full": historia_vuelos, "summary": resumen_vuelos, "off": sin_historia}
+
+
+def nuevo_registro(record, clases = None):
+    # clases = NOMBRES DE LAS CLASES DE PRIORIDAD DE LA POLÍTICA (None si no tiene)
+    if record not in NIVELES:
+        raise ValueError(f"record debe ser 'full', 'summary' u 'off' (se recibió {record!r})")
+    return NIVELES[record](clases)
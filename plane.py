@@ -1,35 +1,49 @@
 from typing import Optional
-import random
+from estados import ESTADOS, CODIGOS, EN_FILA, REINSERTADO, DESVIADO, RIO, TORMENTA, ATERRIZO, MONTEVIDEO, EN_APROXIMACION, OUTBOUND
 
 # ============================================================
 # ENUNCIADO / PARTES 1–6
 # CLASE QUE REPRESENTA A CADA AVIÓN EN LA SIMULACIÓN
+# ES LA MISMA PARA EL MODELO BASE, LA MEJORA Y LOS PRIORITARIOS: LA REGLA DE SEPARACIÓN
+# Y EL TECHO DE VELOCIDAD LOS PONE LA POLÍTICA DE LA CORRIDA (espacio.politica, ver politicas.py)
 # ============================================================
 
 class plane:
-    def __init__(self, id, minuto_aparicion, fila, desviados, mtvd, viento, tormenta, historia=None):
+    # ATRIBUTOS FIJOS: SIN __dict__ POR AVIÓN (MENOS MEMORIA Y ACCESO MÁS RÁPIDO)
+    __slots__ = ("id", "codigo", "minuto_aparicion", "distancia_mn_aep", "velocidad_actual",
+                 "landed_minute", "next", "v_max", "v_min", "tiempo_en_min_aep", "espacio",
+                 "goaround_evaluado", "goaround_decidido", "goaround_trigger_dist", "prioritario", "clase", "seguidor")
+
+    def __init__(self, id, minuto_aparicion, espacio, prioritario = False):
         self.id = id 
-        self.estado = "En fila"             # ESTADO INICIAL
+        self.codigo = EN_FILA               # ESTADO INICIAL (CÓDIGO, VER estados.py)
         self.minuto_aparicion = minuto_aparicion
         self.distancia_mn_aep = 100.0       # ENUNCIADO: APARECE A 100 MN DE AEP
         self.velocidad_actual = 300.0       # VELOCIDAD INICIAL
         self.landed_minute = None           # MINUTO DE ATERRIZAJE
         self.next: Optional["plane"] = None # AVIÓN LÍDER INMEDIATO EN LA FILA
+        self.seguidor: Optional["plane"] = None # AVIÓN INMEDIATO DETRÁS (LO MANTIENE LA FILA PRINCIPAL)
         self.v_max = 0.0
         self.v_min = 0.0
         self.tiempo_en_min_aep = None       # ETA, SE ACTUALIZA EN avanzar()
-        # REFERENCIAS A LAS DIFERENTES FILAS/HEAPS
-        self.fila = fila               # Fila principal de aproximación
-        self.desviados = desviados     # Desvíos por congestión (parte 4)
-        self.mtvd = mtvd               # Aviones que se fueron a Montevideo
-        self.viento = viento           # Desvíos por día ventoso (parte 5)
-        self.tormenta = tormenta       # Desvíos por tormenta (parte 6)
-        self.historia = historia       # Referencia a la historia para registrar datos
+        # FILAS/HEAPS E HISTORIA DE LA SIMULACIÓN (UN espacio_aereo COMPARTIDO POR TODOS)
+        self.espacio = espacio
+        self.prioritario = prioritario      # SOLO LO USA LA POLÍTICA DE PRIORITARIOS
+        self.clase = 0                      # CLASE DE PRIORIDAD (0 = la mayor); LA SORTEA politica_clases
         #NOS ASEGURAMOS DE SOLO REVISAR UNA VEZ QUE EL AVION DEBE INTERRUMPIR ATERRIZAJE EN DIA VENTOSO, USAMOS:
         self.goaround_evaluado = False
         self.goaround_decidido = False
         self.goaround_trigger_dist = None  # en millas, entre 0 y 5
 
+    # ESTADO COMO TEXTO (ES LO QUE SE GUARDA EN LA HISTORIA Y SE GRAFICA)
+    @property
+    def estado(self):
+        return ESTADOS[self.codigo]
+
+    @estado.setter
+    def estado(self, texto):
+        self.codigo = CODIGOS[texto]
+
     # ========================================================
     # ENUNCIADO / PARTE 1
     # CALCULA EL ETA (MINUTOS HASTA LLEGAR A AEP) A VELOCIDAD DADA
@@ -40,12 +54,18 @@ class plane:
     
     def _descolar_y_reenlazar(self):
         leader = self.next
-        idx = self.fila.get_index(self)
+        follower = self.espacio.fila.seguidor_de(self)
         self.next = None
-        self.fila.eliminar_avion(self)
-        if 0 <= idx < len(self.fila.aviones):
-            follower = self.fila.aviones[idx]
-            follower.next = leader
+        self.espacio.fila.eliminar_avion(self)
+        if follower is not None:
+            self.espacio.fila.enlazar(follower, leader)
+
+    def desviar(self):
+        # SALE DE LA FILA A OUTBOUND POR CONGESTIÓN (A 200 KN)
+        self.codigo = DESVIADO
+        self.velocidad_actual = 200.0
+        self.espacio.desviados.agregar_avion(self)
+        self._descolar_y_reenlazar()
         
     # ========================================================
     # ENUNCIADO / PARTE 1
@@ -78,40 +98,24 @@ class plane:
         # CASO 1: AVIÓN EN FILA O REINSERTADO
         # ----------------------------------------------------
         
-        if self.estado in ("En fila","Reinsertado"):
+        if self.codigo in EN_APROXIMACION:
+            # (espacio, distancia y velocidad en variables locales: esto corre por avión y por minuto)
+            espacio = self.espacio
 
-            # SI TIENE LÍDER ADELANTE, APLICAR LA REGLA DE SEPARACIÓN
-            if self.next is not None and self.next.estado == "En fila":
-                eta_self = self._eta(self.distancia_mn_aep, self.velocidad_actual)
-                eta_next = self._eta(self.next.distancia_mn_aep, self.next.velocidad_actual)
-                gap = eta_self - eta_next  # DIFERENCIA DE ETA EN MINUTOS
-    
-                if gap < 4.0:
-                    # SI GAP < 4 → REDUZCO VELOCIDAD A VEL_LÍDER - 20
-                    nueva_v = self.next.velocidad_actual - 20.0
-                    if nueva_v < self.v_min:
-                        # SI ESO CAE DEBAJO DE VMIN → DESVÍO A OUTBOUND (congestión)
-                        self.estado = "Desviado"
-                        self.velocidad_actual = 200.0        # outbound
-                        self.desviados.agregar_avion(self)
-                        self._descolar_y_reenlazar() 
-                        return         
-                    else:
-                        self.velocidad_actual = nueva_v
-
-                elif gap >= 5.0:
-                    # SI GAP ≥ 5 → VOLVER A VMAX
-                    self.velocidad_actual = self.v_max
-            else:
-                # SI NO TIENE LÍDER → VMAX
-                self.velocidad_actual = self.v_max
+            # REGLA DE SEPARACIÓN CON EL LÍDER (según la política); SI LO DESVIÓ, TERMINÓ SU MINUTO
+            if espacio.politica.separar(self, minuto_actual):
+                return
 
             # AVANZA DISTANCIA HACIA AEP
-            self.distancia_mn_aep = max(0.0, self.distancia_mn_aep - (self.velocidad_actual / 60.0) * dt)
-            self.tiempo_en_min_aep = self._eta(self.distancia_mn_aep, self.velocidad_actual)
+            velocidad = self.velocidad_actual
+            distancia = self.distancia_mn_aep - (velocidad / 60.0) * dt
+            if distancia < 0.0:
+                distancia = 0.0
+            self.distancia_mn_aep = distancia
+            self.tiempo_en_min_aep = distancia / (velocidad / 60.0)
             
             # CUANDO ESTÁ A MENOS DE 5 MN → INTENTA ATERRIZAR
-            if 0.0 < self.distancia_mn_aep <= 5.0:
+            if 0.0 < distancia <= 5.0:
 
                 # -------------------------------------------------
                 # PARTE 5: DÍA VENTOSO (10% DE GO-AROUND)
@@ -119,9 +123,9 @@ class plane:
                 # -------------------------------------------------
                 
                 if tormenta_activa:
-                    self.estado = "Tormenta"
+                    self.codigo = TORMENTA
                     if metricas: metricas.registrar_desvio_tormenta()
-                    self.tormenta.agregar_avion(self)
+                    espacio.tormenta.agregar_avion(self)
                     self.velocidad_actual = 200.0
                     self._descolar_y_reenlazar()
                     return
@@ -129,41 +133,41 @@ class plane:
                     self.goaround_evaluado = True
                     if hay_viento:
                         # Chequeamos una sola vez
-                        self.goaround_decidido = (random.random() < 0.1)
+                        self.goaround_decidido = (espacio.rng.random() < 0.1)
                         if self.goaround_decidido:
                             # Elegimos dónde se gatilla dentro de 0-5 mn (puede ser bien cerca del suelo)
-                            self.goaround_trigger_dist = random.uniform(0.0, 5.0)
+                            self.goaround_trigger_dist = espacio.rng.uniform(0.0, 5.0)
                 if self.goaround_decidido and self.goaround_trigger_dist is not None \
-                and self.distancia_mn_aep <= self.goaround_trigger_dist:
-                    self.estado = "Rio"
+                and distancia <= self.goaround_trigger_dist:
+                    self.codigo = RIO
                     if metricas: metricas.registrar_desvio_viento()
-                    self.viento.agregar_avion(self)
+                    espacio.viento.agregar_avion(self)
                     self.velocidad_actual = 200.0
                     self._descolar_y_reenlazar()
                     return
                 
             # Aterrizaje real: cuando llegó a 0 mn
-            if self.distancia_mn_aep <= 0.0:
+            if distancia <= 0.0:
                 self.distancia_mn_aep = 0.0
-                self.estado = "Aterrizó"
+                self.codigo = ATERRIZO
                 if metricas: metricas.registrar_aterrizaje()
-                self.fila.eliminar_avion(self)
+                espacio.fila.eliminar_avion(self)
                 if self.landed_minute is None and minuto_actual is not None:
                     self.landed_minute = minuto_actual
                 return
             
             else:
-                self.estado = "En fila"
+                self.codigo = EN_FILA
 
-            # REORDENA LA FILA
-            self.fila.actualizar_orden()
+            # REUBICA AL AVIÓN EN LA FILA (SOLO SE MUEVE SI QUEDÓ FUERA DE ORDEN)
+            espacio.fila.reubicar(self)
             return
 
         # ----------------------------------------------------
         # CASO 3: DESVIADO, VIENTO O TORMENTA (OUTBOUND)
         # ----------------------------------------------------
         
-        if self.estado in ["Desviado", "Rio", "Tormenta"]:
+        if self.codigo in OUTBOUND:
             # BUSCAR UN GAP ≥ 10 MIN PARA REINSERTARSE 
             posicion = self.buscar_gap()
             
@@ -172,13 +176,13 @@ class plane:
                 # SI HAY GAP → SE REINSERTA
                 self.reinsertarse(posicion)
 
-                # Velocidad de reingreso: usar tu perfil y respetar límites del tramo
+                # Velocidad de reingreso: el techo de la política en la posición del gap pedido
                 self.calcular_rango_velocidad()
-                self.velocidad_actual = self.v_max
+                self.velocidad_actual = self.espacio.politica.techo(self, posicion)
 
-                # Estado y ordenar por distancia para mantener la fila prolija
-                self.fila.actualizar_orden()
-                self.estado = "Reinsertado"
+                # Estado y ubicar por distancia para mantener la fila prolija (y su ETA al día)
+                self.espacio.fila.reubicar(self)
+                self.codigo = REINSERTADO
                 return
             
             else:
@@ -187,21 +191,13 @@ class plane:
                 if self.distancia_mn_aep >= 100.0:
                     # SI YA PASÓ 100 MN → SE VA A MONTEVIDEO
                     # Registrar historia completa antes de ir a Montevideo
-                    if self.historia is not None:
-                        self.historia[self.id]["t"].append(minuto_actual)
-                        self.historia[self.id]["x"].append(self.distancia_mn_aep)
-                        self.historia[self.id]["v"].append(self.velocidad_actual)
-                        self.historia[self.id]["vmax"].append(self.v_max)
+                    if self.espacio.historia is not None:
+                        self.espacio.historia.registrar_salida(self.id, minuto_actual, self.distancia_mn_aep, self.velocidad_actual, self.v_max)
                         
-                    if self.estado == "Desviado":
-                        self.desviados.eliminar_avion(self)
-                    elif self.estado == "Rio":
-                        self.viento.eliminar_avion(self)
-                    elif self.estado == "Tormenta":
-                        self.tormenta.eliminar_avion(self)
+                    self.espacio.outbound[self.codigo].eliminar_avion(self)
 
-                    self.estado = "Montevideo"
-                    self.mtvd.agregar_avion(self)
+                    self.codigo = MONTEVIDEO
+                    self.espacio.mtvd.agregar_avion(self)
                     if metricas: metricas.registrar_desvio_montevideo()
                 return
 
@@ -211,22 +207,11 @@ class plane:
     # ========================================================
         
     def reinsertarse(self, posicion):
-        self.fila.aviones.insert(posicion, self)
+        # LA FILA LO UBICA POR DISTANCIA (RESPETANDO "posicion" ENTRE EMPATES) Y ACTUALIZA PUNTEROS
+        self.espacio.fila.insertar_avion(self, posicion)
         
         # ELIMINA DE SU HEAP ORIGINAL
-        if self.estado == "Desviado":
-            self.desviados.eliminar_avion(self)
-        elif self.estado == "Rio":
-            self.viento.eliminar_avion(self)
-        elif self.estado == "Tormenta":
-            self.tormenta.eliminar_avion(self)
-
-        # ACTUALIZA PUNTEROS
-        leader = self.fila.aviones[posicion - 1] if posicion > 0 else None
-        self.next = leader
-        if posicion + 1 < len(self.fila.aviones):
-            follower = self.fila.aviones[posicion + 1]
-            follower.next = self
+        self.espacio.outbound[self.codigo].eliminar_avion(self)
 
     # ========================================================
     # PARTE 4
@@ -234,27 +219,24 @@ class plane:
     # ========================================================
     
     def buscar_gap(self):
-        self.fila.actualizar_orden()
-        largo = len(self.fila.aviones)
-
-        # RECORRE TODOS LOS PARES ADYACENTES (AVIONES SEGUIDOS EN LA FILA)
-        for i in range(largo - 1):
-            avion_a = self.fila.aviones[i]
-            avion_b = self.fila.aviones[i + 1]
-
-            eta_a = self._eta(avion_a.distancia_mn_aep, avion_a.velocidad_actual)
-            eta_b = self._eta(avion_b.distancia_mn_aep, avion_b.velocidad_actual)
-
-            # SI GAP ≥ 10 → DEVUELVE POSICIÓN
-            if self.estado in ["Desviado", "Rio", "Tormenta"] and eta_b - eta_a >= 10.0 and self.distancia_mn_aep > 5.0:
-                return i + 1
+        fila = self.espacio.fila
+        fila.actualizar_orden()
+        largo = len(fila.aviones)
+
+        # PRIMER PAR DE AVIONES SEGUIDOS CON GAP ≥ 10 → DEVUELVE LA POSICIÓN DEL SEGUNDO
+        # (LA FILA MANTIENE UN ÍNDICE DE BRECHAS DE ETA, NO HACE FALTA RECORRER TODOS LOS PARES)
+        if self.codigo in OUTBOUND and self.distancia_mn_aep > 5.0:
+            posicion = fila.primer_gap(10.0)
+            if posicion is not None:
+                return posicion
             
         # SI NO ENCONTRÓ GAP INTERNO → CHEQUEA FINAL DE LA FILA
         if largo > 0:
+            ultimo = fila.aviones[-1]
             eta_1 = self._eta(self.distancia_mn_aep, self.velocidad_actual)
-            eta_2 = self._eta(self.fila.aviones[-1].distancia_mn_aep, self.fila.aviones[-1].velocidad_actual)
+            eta_2 = self._eta(ultimo.distancia_mn_aep, ultimo.velocidad_actual)
             
-            if self.estado in ["Desviado", "Rio", "Tormenta"] and self.distancia_mn_aep <= 100.0 and eta_1 - eta_2 >= 10.0:
+            if self.codigo in OUTBOUND and self.distancia_mn_aep <= 100.0 and eta_1 - eta_2 >= 10.0:
                 # Si no encontró gap interno: si todavía no salió de 100 mn, podés insertarlo al final
                 return largo                
             else:
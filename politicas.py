@@ -0,0 +1,303 @@
+from array import array
+from typing import NamedTuple
+from estados import EN_FILA, DESVIADO, EN_APROXIMACION
+
+# ============================================================
+# POLÍTICAS DE SEPARACIÓN / VELOCIDAD DE LA FILA PRINCIPAL
+# EL MOTOR (simulacion.py) ES UNO SOLO Y LA CLASE plane TAMBIÉN; LO QUE CAMBIA ENTRE
+# EL MODELO BASE, LA MEJORA Y LOS PRIORITARIOS ES LA POLÍTICA, QUE SE ELIGE UNA VEZ
+# POR CORRIDA (queda en espacio_aereo.politica):
+#   separar(avion, t)    → REGLA DE SEPARACIÓN CON EL LÍDER (True si el avión ya terminó su minuto)
+#   techo(avion, pos)    → VELOCIDAD A LA QUE VUELVE CUANDO TIENE MARGEN (y al reinsertarse)
+#   llegada(avion, rng)  → AJUSTES AL APARECER (devuelve la clase de prioridad o None)
+#   nombres              → NOMBRES DE LAS CLASES DE PRIORIDAD (None si la política no tiene clases)
+#   contar(avion, t)     → MÉTRICAS DE CONGESTIÓN DEL AVIÓN EN EL MINUTO
+#   inicio_minuto(t) / saltar(desde, hasta) → ESTADO PROPIO DE LA POLÍTICA (control de la mejora)
+# ============================================================
+
+def _eta(dist_mn, vel_kn):
+    return dist_mn / (vel_kn / 60.0)
+
+
+class politica_base:
+    # ENUNCIADO: GAP < 4 MIN → VEL. DEL LÍDER - 20 (o desvío si cae debajo de vmin); GAP ≥ 5 → VMAX
+    lideres = (EN_FILA,)              # ESTADOS DEL LÍDER QUE ACTIVAN LA REGLA
+    nombres = None
+
+    def preparar(self, minutos):
+        # SE LLAMA AL EMPEZAR CADA CORRIDA: SERIES POR MINUTO QUE LLENA LA POLÍTICA
+        self.congestion = array("q", [0]) * minutos
+
+    def series(self):
+        return {"congestion": self.congestion}
+
+    def inicio_minuto(self, t):
+        pass
+
+    def saltar(self, desde, hasta):
+        pass
+
+    def llegada(self, avion, rng):
+        return None
+
+    def techo(self, avion, posicion = None):
+        return avion.v_max
+
+    def contar(self, avion, t):
+        # CONGESTIÓN: velocidad < vmax
+        if avion.codigo in EN_APROXIMACION and avion.velocidad_actual < avion.v_max:
+            self.congestion[t] += 1
+
+    def separar(self, avion, minuto_actual):
+        lider = avion.next
+        if lider is not None and lider.codigo in self.lideres:
+            # (las dos _eta escritas en línea: esto corre por avión y por minuto)
+            gap = avion.distancia_mn_aep / (avion.velocidad_actual / 60.0) - lider.distancia_mn_aep / (lider.velocidad_actual / 60.0)
+            if gap < 4.0:
+                nueva_v = lider.velocidad_actual - 20.0
+                if nueva_v < avion.v_min:
+                    # DESVÍO A OUTBOUND (congestión)
+                    avion.desviar()
+                    return True
+                avion.velocidad_actual = nueva_v
+            elif gap >= 5.0:
+                avion.velocidad_actual = self.techo(avion)
+        else:
+            avion.velocidad_actual = self.techo(avion)
+        return False
+
+
+# ============================================================
+# POLÍTICA DE MEJORA: TECHO ESCALONADO v_max - min(pos, i_max) * delta SEGÚN LA POSICIÓN
+# EN LA FILA. (delta, i_max) LOS PRENDE / APAGA UN CONTROL CON LA CONGESTIÓN "REAL" (por debajo
+# del techo) DE LOS MINUTOS ANTERIORES. EL LÍDER CUENTA SI ESTÁ EN FILA O REINSERTADO.
+#
+# PARÁMETROS DEL CONTROL (los valores por defecto son los del trabajo; ver ajuste_control.py):
+#   umbral_fuerte / umbral_suave     → CONGESTIONADOS EN UN MINUTO PARA CONTARLO COMO ALTO / MODERADO
+#                                      (con menos de umbral_suave el minuto es tranquilo)
+#   ventana_fuerte / ventana_suave / ventana_calma → MINUTOS SEGUIDOS QUE TIENE QUE DURAR CADA SITUACIÓN
+#   nivel_fuerte / nivel_suave       → (delta, i_max) QUE SE APLICA EN CADA CASO
+# ============================================================
+
+class politica_mejorada(politica_base):
+    lideres = EN_APROXIMACION
+
+    def __init__(self, umbral_fuerte = 3, umbral_suave = 2, ventana_fuerte = 2, ventana_suave = 2, ventana_calma = 3,
+                 nivel_fuerte = (20.0, 4), nivel_suave = (10.0, 3)):
+        self.umbral_fuerte, self.umbral_suave = umbral_fuerte, umbral_suave
+        self.ventana_fuerte, self.ventana_suave, self.ventana_calma = ventana_fuerte, ventana_suave, ventana_calma
+        self.nivel_fuerte = (float(nivel_fuerte[0]), int(nivel_fuerte[1]))
+        self.nivel_suave = (float(nivel_suave[0]), int(nivel_suave[1]))
+
+    def control(self):
+        # PARÁMETROS DEL CONTROL COMO DICCIONARIO (politica_mejorada(**control) la vuelve a armar)
+        return {"umbral_fuerte": self.umbral_fuerte, "umbral_suave": self.umbral_suave,
+                "ventana_fuerte": self.ventana_fuerte, "ventana_suave": self.ventana_suave,
+                "ventana_calma": self.ventana_calma, "nivel_fuerte": self.nivel_fuerte, "nivel_suave": self.nivel_suave}
+
+    def preparar(self, minutos):
+        super().preparar(minutos)
+        self.congestion_control = array("q", [0]) * minutos
+        self.delta = 0.0       # 0 = APAGADO; SI NO, EL delta DE nivel_fuerte O nivel_suave (kts)
+        self.i_max = 0
+        self.consec_fuerte = 0 # minutos consecutivos con >= umbral_fuerte congestionados
+        self.consec_suave = 0  # minutos consecutivos con >= umbral_suave congestionados
+        self.consec_calma = 0  # minutos consecutivos con < umbral_suave congestionados
+        self._escalones()
+
+    def series(self):
+        return {"congestion": self.congestion, "congestion_control": self.congestion_control}
+
+    def saltar(self, desde, hasta):
+        # LOS MINUTOS SALTEADOS (espacio aéreo vacío) NO TUVIERON CONGESTIÓN: LOS CONTADORES AVANZAN COMO MINUTO A MINUTO
+        if hasta > desde:
+            self.consec_fuerte = self.consec_suave = 0
+            self.consec_calma += hasta - desde
+            if self.consec_calma >= self.ventana_calma:
+                self.delta, self.i_max = 0.0, 0
+                self._escalones()
+
+    def inicio_minuto(self, t):
+        # CONGESTIÓN DEL MINUTO ANTERIOR
+        cong_prev = self.congestion_control[t - 1] if t > 0 else 0
+        self.consec_fuerte = self.consec_fuerte + 1 if cong_prev >= self.umbral_fuerte else 0
+        self.consec_suave = self.consec_suave + 1 if cong_prev >= self.umbral_suave else 0
+        self.consec_calma = self.consec_calma + 1 if cong_prev < self.umbral_suave else 0
+
+        # FUERTE CON CONGESTIÓN ALTA SOSTENIDA, SUAVE CON MODERADA, APAGADA SOLO SI ESTUVO TRANQUILO UN RATO
+        # (si no se cumple nada, mantiene lo anterior)
+        if self.consec_fuerte >= self.ventana_fuerte:
+            self.delta, self.i_max = self.nivel_fuerte
+        elif self.consec_suave >= self.ventana_suave:
+            self.delta, self.i_max = self.nivel_suave
+        elif self.consec_calma >= self.ventana_calma:
+            self.delta, self.i_max = 0.0, 0
+        self._escalones()
+
+    def _escalones(self):
+        # REBAJA DEL TECHO POR POSICIÓN (0, delta, 2·delta, ... hasta i_max·delta), UNA VEZ POR MINUTO.
+        # DE i_max EN ADELANTE TODOS TIENEN LA MISMA, ASÍ QUE SOLO IMPORTAN LOS PRIMEROS i_max DE LA FILA
+        self.rebajas = [k * self.delta for k in range(self.i_max + 1)] if self.delta > 0 else [0.0]
+
+    def llegada(self, avion, rng):
+        avion.calcular_rango_velocidad()
+        avion.velocidad_actual = self.techo(avion)
+        return None
+
+    def techo(self, avion, posicion = None):
+        # v_max - min(pos, i_max) * delta, ACOTADO A [v_min, v_max]
+        # (pos = 0 si es el primero; al reinsertarse se usa la posición del gap pedido)
+        rebajas = self.rebajas
+        i_max = len(rebajas) - 1
+        if i_max == 0:
+            return avion.v_max
+        if posicion is None:
+            # POSICIÓN ACTUAL EN LA FILA (cambia dentro del minuto con aterrizajes, desvíos y
+            # reinserciones): ALCANZA CON MIRAR LA CABEZA, NO HACE FALTA EL ÍNDICE DE TODA LA FILA
+            cabeza = avion.espacio.fila.aviones
+            posicion = 0
+            while posicion < i_max and posicion < len(cabeza) and cabeza[posicion] is not avion:
+                posicion += 1
+        return max(avion.v_min, avion.v_max - rebajas[min(posicion, i_max)])
+
+    def contar(self, avion, t):
+        if avion.codigo in EN_APROXIMACION:
+            # CONTROL: SOLO COMPRESIÓN REAL, POR DEBAJO DEL TECHO DEL MINUTO
+            if avion.velocidad_actual < self.techo(avion) - 1e-6:
+                self.congestion_control[t] += 1
+            # REPORTE: COMO EN EL MODELO BASE (incluye el efecto de la política)
+            if avion.velocidad_actual < avion.v_max - 1e-6:
+                self.congestion[t] += 1
+
+
+# ============================================================
+# CLASES DE PRIORIDAD: CADA AVIÓN QUE APARECE SORTEA SU CLASE (según las proporciones) Y USA
+# LA SEPARACIÓN Y LA REDUCCIÓN DE VELOCIDAD DE SU CLASE. LAS CLASES VAN DE MAYOR A MENOR PRIORIDAD.
+# SI UNA CLASE QUE abre_paso NO LOGRA SU SEPARACIÓN, EL LÍDER ACELERA Y, SI AUN ASÍ NO ALCANZA Y
+# EL LÍDER ES DE UNA CLASE DE MENOR PRIORIDAD, SE DESVÍA PARA DEJARLO PASAR.
+# ============================================================
+
+class clase_vuelo(NamedTuple):
+    nombre: str
+    proporcion: float           # FRACCIÓN DE LOS ARRIBOS
+    separacion: float           # MINUTOS DE SEPARACIÓN QUE PIDE CON SU LÍDER (con 1 min más vuelve a vmax)
+    reduccion: float            # KN POR DEBAJO DEL LÍDER CUANDO NO LA TIENE
+    abre_paso: bool = False     # SI NO LA LOGRA: INSISTE A vmin Y PIDE PASO AL LÍDER (si no, mantiene velocidad)
+
+
+def clases_aep(p_medico = 0.01, p_combustible = 0.01, p_general = 0.10):
+    """
+    Ejemplo de cuatro clases: sanitarios y emergencias de combustible (3 min, abren paso),
+    vuelos regulares (5 min, abren paso a la aviación general) y aviación general.
+    Los regulares son el resto: las otras tres proporciones no pueden sumar más de 1.
+    """
+    if min(p_medico, p_combustible, p_general) < 0 or p_medico + p_combustible + p_general > 1:
+        raise ValueError("las proporciones de sanitarios, combustible y aviación general tienen que ser "
+                         f"no negativas y sumar a lo sumo 1 (se recibió {p_medico!r}, {p_combustible!r}, {p_general!r})")
+    return (clase_vuelo("sanitario", p_medico, 3.0, 10.0, True),
+            clase_vuelo("combustible", p_combustible, 3.0, 10.0, True),
+            clase_vuelo("regular", 1.0 - p_medico - p_combustible - p_general, 5.0, 20.0, True),
+            clase_vuelo("general", p_general, 5.0, 20.0))
+
+
+class politica_clases(politica_base):
+    lideres = EN_APROXIMACION
+
+    def __init__(self, clases):
+        self.clases = tuple(clases)
+        if not self.clases:
+            raise ValueError("hace falta al menos una clase de vuelo")
+        # LA ÚLTIMA SE LLEVA EL RESTO: LAS DEMÁS NO PUEDEN SER NEGATIVAS NI SUMAR MÁS DE 1
+        if any(clase.proporcion < 0 for clase in self.clases) or sum(c.proporcion for c in self.clases[:-1]) > 1:
+            raise ValueError("las proporciones de las clases tienen que ser no negativas y sumar a lo sumo 1 "
+                             f"(sin contar la última; se recibió {[c.proporcion for c in self.clases]})")
+        self.nombres = tuple(clase.nombre for clase in self.clases)
+        # PROPORCIONES ACUMULADAS: UN SOLO SORTEO POR AVIÓN (la última clase se lleva el resto)
+        acumulada, self._cortes = 0.0, []
+        for clase in self.clases[:-1]:
+            acumulada += clase.proporcion
+            self._cortes.append(acumulada)
+        # EL LÍDER QUE ACELERA PARA ABRIR PASO RESPETA CON SU PROPIO LÍDER LA REGLA DE LA ÚLTIMA CLASE
+        # (la más exigente: no usa ningún privilegio propio)
+        self._general = self.clases[-1]
+
+    def llegada(self, avion, rng):
+        # CLASE DEL AVIÓN (0 = la de mayor prioridad; es la que queda en la historia); "prioritario" = CUALQUIERA SALVO LA ÚLTIMA
+        u = rng.random()
+        nivel = 0
+        while nivel < len(self._cortes) and u >= self._cortes[nivel]:
+            nivel += 1
+        avion.clase = nivel
+        avion.prioritario = nivel < len(self._cortes)
+        return nivel
+
+    def separar(self, avion, minuto_actual):
+        lider = avion.next
+        if lider is None or lider.codigo not in EN_APROXIMACION:
+            avion.velocidad_actual = avion.v_max
+            return False
+
+        clase = self.clases[avion.clase]
+        sep_req = clase.separacion
+        gap = _eta(avion.distancia_mn_aep, avion.velocidad_actual) - _eta(lider.distancia_mn_aep, lider.velocidad_actual)
+        if gap < sep_req:
+            nueva_v = lider.velocidad_actual - clase.reduccion
+            if nueva_v < avion.v_min:
+                # ÚLTIMO INTENTO A vmin (una clase que no abre paso mantiene su velocidad)
+                if clase.abre_paso and avion.v_min > 0:
+                    avion.velocidad_actual = avion.v_min
+            else:
+                avion.velocidad_actual = nueva_v
+            if clase.abre_paso and _eta(avion.distancia_mn_aep, avion.velocidad_actual) - _eta(lider.distancia_mn_aep, lider.velocidad_actual) < sep_req:
+                return self._abrir_paso(avion, lider, sep_req, minuto_actual)
+        elif gap >= sep_req + 1.0:
+            avion.velocidad_actual = avion.v_max
+        # sep_req <= gap < sep_req + 1: MANTIENE VELOCIDAD
+        return False
+
+    def _abrir_paso(self, avion, lider, sep_req, minuto_actual):
+        # EL LÍDER ACELERA (sin violar el gap con su propio líder). SOLO SE TOCAN EL LÍDER Y EL LÍDER
+        # DEL LÍDER POR SUS PUNTEROS, Y LA FILA ACTUALIZA SOLO LA BRECHA DEL LÍDER: NO SE RECORRE NI SE REORDENA
+        lider.calcular_rango_velocidad()
+        lider_del_lider = lider.next
+        if lider_del_lider is not None and lider_del_lider.codigo in EN_APROXIMACION:
+            gap_lider = _eta(lider.distancia_mn_aep, max(lider.velocidad_actual, 1.0)) - \
+                        _eta(lider_del_lider.distancia_mn_aep, max(lider_del_lider.velocidad_actual, 1.0))
+            if gap_lider < self._general.separacion:
+                # (puede quedar por debajo de su vmin, e incluso negativa, como en el modelo original)
+                lider.velocidad_actual = min(lider.v_max, lider_del_lider.velocidad_actual - self._general.reduccion)
+                if lider.velocidad_actual == 0.0:
+                    # EXACTAMENTE 0 ES EL ÚNICO CASO EN QUE EL ORIGINAL SE CAÍA (división por cero en el ETA)
+                    lider.velocidad_actual = 1.0
+            else:
+                lider.velocidad_actual = lider.v_max
+        else:
+            lider.velocidad_actual = lider.v_max
+        espacio = avion.espacio
+        espacio.fila.refrescar_eta(lider)
+
+        # SI AUN ASÍ NO ALCANZA Y EL LÍDER ES DE MENOR PRIORIDAD → EL LÍDER SE DESVÍA Y EL AVIÓN
+        # SIGUE A VMAX (termina su minuto acá)
+        if _eta(avion.distancia_mn_aep, avion.velocidad_actual) - _eta(lider.distancia_mn_aep, lider.velocidad_actual) < sep_req \
+           and lider.clase > avion.clase:
+            if espacio.historia is not None:
+                espacio.historia.registrar(lider.id, minuto_actual if minuto_actual is not None else 0,
+                                           lider.distancia_mn_aep, lider.velocidad_actual, DESVIADO, lider.v_max)
+            lider.desviar()
+            avion.calcular_rango_velocidad()
+            avion.velocidad_actual = avion.v_max
+            espacio.fila.actualizar_orden()
+            return True
+        return False
+
+
+# ============================================================
+# PRIORITARIOS: DOS CLASES. UNA PROPORCIÓN p_prioritario TIENE SEPARACIÓN DE 3 MIN, REDUCE
+# 10 KN EN LUGAR DE 20 Y ABRE PASO; LOS NORMALES USAN 5 MIN Y, SI NO LLEGAN, MANTIENEN VELOCIDAD.
+# ============================================================
+
+class politica_prioritaria(politica_clases):
+    def __init__(self, p_prioritario = 0.05):
+        self.p_prioritario = p_prioritario
+        super().__init__((clase_vuelo("prioritario", p_prioritario, 3.0, 10.0, True),
+                          clase_vuelo("normal", 1.0 - p_prioritario, 5.0, 20.0)))
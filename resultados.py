@@ -0,0 +1,218 @@
+import os
+import shutil
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+from pyarrow import fs
+from collections.abc import Mapping
+from historia import historia_vuelos
+from analisis import serie_por_minuto
+
+# ============================================================
+# GUARDAR Y LEER RESULTADOS DE correr_experimentos (Parquet / Arrow)
+#
+# ruta/
+#   metricas/escenario=<esc>/part-0.parquet
+#       → UNA FILA POR (λ, rep) CON LAS MÉTRICAS ESCALARES
+#         (y las series por minuto de la mejora como listas)
+#   trayectorias/escenario=<esc>/lambda=<λ>/rep=<rep>/part-0.parquet
+#       → historia.tabla(): UNA FILA POR REGISTRO (id, t, x, v, vmax, estado, prio)
+#
+# formato = "parquet" (comprimido) o "arrow" (Arrow IPC sin comprimir: se lee
+# directo del archivo mapeado en memoria). LA LECTURA ES PEREZOSA: SOLO SE LEEN
+# LAS COLUMNAS Y LAS PARTICIONES QUE SE PIDEN.
+# ============================================================
+
+_PARTICIONES = {
+    "metricas": pa.schema([("escenario", pa.string())]),
+    "trayectorias": pa.schema([("escenario", pa.string()), ("lambda", pa.float64()), ("rep", pa.int64())]),
+}
+_FORMATOS = {"parquet": ("parquet", "parquet"), "arrow": ("ipc", "arrow")}
+# SERIES POR MINUTO (arreglos de enteros) QUE PUEDE TRAER EL DATAFRAME DE LA MEJORA
+_SERIES = ("congestion", "congestion_control")
+
+
+def _directorio(ruta, tabla, escenario):
+    return os.path.join(ruta, tabla, f"escenario={escenario}")
+
+
+def _escribir(tabla, ruta, nombre, formato):
+    formato_ds, extension = _FORMATOS[formato]
+    ds.write_dataset(
+        tabla,
+        os.path.join(ruta, nombre),
+        format = formato_ds,
+        partitioning = ds.partitioning(_PARTICIONES[nombre], flavor = "hive"),
+        basename_template = "part-{i}." + extension,
+        existing_data_behavior = "overwrite_or_ignore",
+    )
+
+
+def _dataset(ruta, nombre, escenario = None):
+    # CON UN ESCENARIO SE ABRE SOLO SU CARPETA (todas sus partes tienen las mismas columnas);
+    # SIN ESCENARIO SE JUNTAN LAS COLUMNAS DE TODOS (p. ej. prio_share solo está en "prioritario").
+    # EL FORMATO SALE DE LA EXTENSIÓN DE LOS ARCHIVOS; SE ABREN MAPEADOS EN MEMORIA
+    base = os.path.join(ruta, nombre) if escenario is None else _directorio(ruta, nombre, escenario)
+    particiones = _PARTICIONES[nombre] if escenario is None else pa.schema(list(_PARTICIONES[nombre])[1:])
+    formato = "parquet"
+    for _, _, archivos in os.walk(base):
+        if archivos:
+            formato = "ipc" if archivos[0].endswith(".arrow") else "parquet"
+            break
+    abrir = lambda schema = None: ds.dataset(
+        base,
+        format = formato,
+        partitioning = ds.partitioning(particiones, flavor = "hive") if len(particiones) else None,
+        filesystem = fs.LocalFileSystem(use_mmap = True),
+        schema = schema,
+    )
+    dataset = abrir()
+    if escenario is None:
+        schema = pa.unify_schemas([f.physical_schema for f in dataset.get_fragments()] + [particiones])
+        dataset = abrir(schema)
+    return dataset
+
+
+def _filtro(lambdas = None, reps = None):
+    condiciones = []
+    if lambdas is not None:
+        condiciones.append(ds.field("lambda").isin(list(np.atleast_1d(lambdas))))
+    if reps is not None:
+        condiciones.append(ds.field("rep").isin(list(np.atleast_1d(reps))))
+    if not condiciones:
+        return None
+    filtro = condiciones[0]
+    for c in condiciones[1:]:
+        filtro = filtro & c
+    return filtro
+
+
+# ============================================================
+# GUARDAR
+# ============================================================
+
+def guardar_resultados(df, ruta, escenario, formato = "parquet"):
+    """
+    Guarda el DataFrame de correr_experimentos en ruta/ bajo el escenario dado
+    (reemplaza lo que hubiera guardado para ese escenario).
+    """
+    if formato not in _FORMATOS:
+        raise ValueError(f"formato debe ser 'parquet' o 'arrow' (se recibió {formato!r})")
+
+    for nombre in _PARTICIONES:
+        shutil.rmtree(_directorio(ruta, nombre, escenario), ignore_errors = True)
+
+    # MÉTRICAS: TODO SALVO LA HISTORIA; LAS SERIES POR MINUTO VAN COMO LISTAS
+    metricas = df.drop(columns = ["historia"], errors = "ignore").copy()
+    for columna in _SERIES:
+        if columna in metricas:
+            metricas[columna] = [None if s is None else serie_por_minuto(s) for s in metricas[columna]]
+    metricas.insert(0, "escenario", escenario)
+    _escribir(pa.Table.from_pandas(metricas, preserve_index = False), ruta, "metricas", formato)
+
+    # TRAYECTORIAS: SE ESCRIBEN DE A UN λ PARA NO ARMAR TODA LA TABLA LARGA EN MEMORIA
+    if "historia" not in df:
+        return
+    for lam, grupo in df.groupby("lambda", sort = False):
+        partes = []
+        for rep, historia in zip(grupo["rep"], grupo["historia"]):
+            if historia is None:
+                continue
+            tabla = historia.tabla()
+            tabla.insert(0, "escenario", escenario)
+            tabla.insert(1, "lambda", lam)
+            tabla.insert(2, "rep", rep)
+            partes.append(tabla)
+        if partes:
+            tabla = pd.concat(partes, ignore_index = True)
+            _escribir(pa.Table.from_pandas(tabla, preserve_index = False), ruta, "trayectorias", formato)
+
+
+# ============================================================
+# LEER (perezoso: columnas y particiones a pedido)
+# ============================================================
+
+def escenarios_guardados(ruta):
+    base = os.path.join(ruta, "metricas")
+    if not os.path.isdir(base):
+        return []
+    return sorted(d.split("=", 1)[1] for d in os.listdir(base) if d.startswith("escenario="))
+
+
+def leer_metricas(ruta, escenario = None, columnas = None, lambdas = None):
+    """
+    Métricas escalares guardadas (una fila por λ y rep), solo con las columnas pedidas.
+    """
+    if columnas is not None:
+        columnas = list(dict.fromkeys(["lambda", "rep", *columnas]))
+    tabla = _dataset(ruta, "metricas", escenario).to_table(columns = columnas, filter = _filtro(lambdas))
+    df = tabla.to_pandas()
+    for columna in _SERIES:
+        if columna in df:
+            df[columna] = [None if s is None else np.asarray(s, dtype = np.int64) for s in df[columna]]
+    return df.sort_values(["lambda", "rep"], kind = "stable").reset_index(drop = True)
+
+
+def leer_trayectorias(ruta, escenario, lambdas = None, reps = None, columnas = None):
+    """
+    Tabla larga de trayectorias (una fila por registro) de las particiones pedidas.
+    """
+    tabla = _dataset(ruta, "trayectorias", escenario).to_table(columns = columnas, filter = _filtro(lambdas, reps))
+    return tabla.to_pandas()
+
+
+def leer_historia(ruta, escenario, lam, rep):
+    """
+    historia_vuelos de una réplica, armada desde su partición de trayectorias.
+    """
+    return historia_vuelos.desde_tabla(leer_trayectorias(ruta, escenario, lam, rep))
+
+
+class historia_guardada(Mapping):
+    # HISTORIA DE UNA RÉPLICA QUE RECIÉN SE LEE DEL DISCO LA PRIMERA VEZ QUE SE USA
+    def __init__(self, ruta, escenario, lam, rep):
+        self.ruta, self.escenario, self.lam, self.rep = ruta, escenario, lam, rep
+        self._historia = None
+
+    def cargar(self):
+        if self._historia is None:
+            self._historia = leer_historia(self.ruta, self.escenario, self.lam, self.rep)
+        return self._historia
+
+    @property
+    def resumen(self):
+        return self.cargar().resumen
+
+    def tabla(self):
+        return self.cargar().tabla()
+
+    def items(self):
+        return self.cargar().items()
+
+    def values(self):
+        return self.cargar().values()
+
+    def __getitem__(self, id_avion):
+        return self.cargar()[id_avion]
+
+    def __iter__(self):
+        return iter(self.cargar())
+
+    def __len__(self):
+        return len(self.cargar())
+
+    def __repr__(self):
+        return f"<historia_guardada: {self.escenario} λ={self.lam} rep={self.rep}>"
+
+
+def cargar_resultados(ruta, escenario, columnas = None, con_historia = True):
+    """
+    Arma un DataFrame como el de correr_experimentos desde lo guardado.
+    La columna 'historia' tiene historias que se leen recién cuando se usan,
+    así que las funciones de analisis y graficos que no la tocan no leen trayectorias.
+    """
+    df = leer_metricas(ruta, escenario, columnas)
+    if con_historia and os.path.isdir(_directorio(ruta, "trayectorias", escenario)):
+        df["historia"] = [historia_guardada(ruta, escenario, lam, rep) for lam, rep in zip(df["lambda"], df["rep"])]
+    return df
@@ -0,0 +1,453 @@
+import numpy as np
+import random
+from analisis import MetricasSimulacion
+from historia import historia_vuelos
+from estados import EN_FILA, REINSERTADO, DESVIADO, RIO, TORMENTA, ATERRIZO, MONTEVIDEO
+
+# ============================================================
+# ENUNCIADO / PARTES 1, 4, 5 y 6
+# MOTOR VECTORIZADO (NUMPY) DE simular_con_historia.
+# EN LUGAR DE UN OBJETO plane POR AVIÓN, EL ESTADO VIVE EN ARREGLOS
+# (distancia, velocidad, vmax, estado, go-around) DE FORMA (réplicas × aviones),
+# Y LAS FILAS SON MATRICES DE IDs ORDENADAS (una fila de la matriz por réplica).
+# DEVUELVE EXACTAMENTE LO MISMO QUE simular_con_historia (misma historia y métricas).
+#
+# SOLO TIENE LAS REGLAS DEL MODELO BASE (politica_base): LA MEJORA Y LOS PRIORITARIOS
+# CORREN SIEMPRE EN EL MOTOR DE OBJETOS (correr_experimentos rechaza lote = True para ellos).
+# CONVIENE PARA MUCHAS RÉPLICAS A λ ALTO: CON 150 RÉPLICAS A λ = 0.5 y 1.0 EL LOTE TARDA
+# UNAS 2.5–3 VECES MENOS QUE LAS RÉPLICAS EN SERIE; CON POCAS RÉPLICAS, O A λ = 0.1,
+# EL MOTOR DE OBJETOS ES MÁS RÁPIDO.
+# ============================================================
+
+# TRAMOS DE VELOCIDAD: searchsorted SOBRE LOS CORTES 5 / 15 / 50 / 100 MN
+_CORTES = np.array([5.0, 15.0, 50.0, 100.0])
+_VMIN = np.array([120.0, 150.0, 200.0, 250.0, 300.0])
+_VMAX = np.array([150, 200, 250, 300, 500])
+
+# TIPOS DE REGISTRO DE HISTORIA (qué campos se agregan)
+_REG_COMPLETO = 0     # t, x, v, estado, vmax (avión en fila)
+_REG_ESTADO = 1       # t, estado (aterrizó / montevideo)
+_REG_SALIDA = 2       # t, x, v, vmax (sale a montevideo desde outbound)
+
+DURACION_TORMENTA = 30
+
+
+def _tramo(d):
+    # ÍNDICE DE TRAMO (0 = final, 4 = más allá de 100 mn); igual que calcular_rango_velocidad
+    return np.searchsorted(_CORTES, d, side = "left")
+
+
+def _clave_semilla(seed):
+    # MISMA CLAVE QUE USA random.seed(int): |seed| EN PALABRAS DE 32 BITS
+    n = abs(int(seed))
+    clave = []
+    while True:
+        clave.append(n & 0xFFFFFFFF)
+        n >>= 32
+        if not n:
+            return clave
+
+
+# ------------------------------------------------------------
+# NÚMEROS ALEATORIOS: UN MT19937 POR RÉPLICA, SEMBRADO COMO random.Random(seed),
+# ASÍ CADA RÉPLICA REPRODUCE LA MISMA SECUENCIA QUE EL SIMULADOR CON OBJETOS.
+# EN LUGAR DE UNA SEMILLA TAMBIÉN SE PUEDE PASAR UN random.Random: SE COPIA SU ESTADO
+# (el generador original no avanza).
+# ------------------------------------------------------------
+
+def _generador(semilla):
+    if isinstance(semilla, random.Random):
+        _, estado, _ = semilla.getstate()
+        g = np.random.RandomState()
+        g.set_state(("MT19937", np.array(estado[:-1], dtype = np.uint32), estado[-1]))
+        return g
+    return np.random.RandomState(None if semilla is None else _clave_semilla(semilla))
+
+
+class _Flujos:
+    def __init__(self, seeds, bloque = 256):
+        self.generadores = [_generador(s) for s in seeds]
+        self.bloque = bloque
+        self.buffer = np.stack([g.random_sample(bloque) for g in self.generadores])
+        self.cursor = np.zeros(len(seeds), dtype = np.intp)
+
+    def tomar(self, reps):
+        # UN random() PARA CADA RÉPLICA DE reps (en el orden del flujo de cada una)
+        c = self.cursor[reps]
+        agotadas = c >= self.bloque
+        if agotadas.any():
+            for r in reps[agotadas]:
+                self.buffer[r] = self.generadores[r].random_sample(self.bloque)
+                self.cursor[r] = 0
+            c = self.cursor[reps]
+        self.cursor[reps] = c + 1
+        return self.buffer[reps, c]
+
+
+# ------------------------------------------------------------
+# FILAS: MATRIZ (réplicas × ancho) DE IDs GLOBALES DE AVIÓN (réplica * S + id - 1).
+# LA COLUMNA 0 Y LAS QUE SOBRAN AL FINAL TIENEN AL "CENTINELA" (un avión ficticio a distancia
+# infinita), ASÍ EL LÍDER DEL PRIMERO Y EL SEGUIDOR DEL ÚLTIMO SE LEEN SIN CASOS ESPECIALES.
+# LOS AVIONES DE LA FILA OCUPAN LAS COLUMNAS 1..n.
+# ------------------------------------------------------------
+
+class _Filas:
+    def __init__(self, reps, centinela, ancho = 16):
+        self.centinela = centinela
+        self.ids = np.full((reps, ancho), centinela, dtype = np.intp)
+        self.n = np.zeros(reps, dtype = np.intp)
+
+    def _asegurar_lugar(self):
+        # SIEMPRE QUEDA AL MENOS UN CENTINELA DETRÁS DEL ÚLTIMO
+        ancho = self.ids.shape[1]
+        if self.n.max() + 2 > ancho:
+            extra = np.full((self.ids.shape[0], ancho), self.centinela, dtype = np.intp)
+            self.ids = np.concatenate([self.ids, extra], axis = 1)
+
+    def columna(self, rr, gg):
+        return np.argmax(self.ids[rr] == gg[:, None], axis = 1)
+
+    def insertar(self, rr, gg, preferida, D):
+        # COMO heap.insertar_avion: EN "preferida", LIMITADA A LA ZONA DONDE QUEDA ORDENADA
+        self._asegurar_lugar()
+        filas = self.ids[rr]
+        dv = D[filas]
+        d = D[gg][:, None]
+        q = np.minimum(np.maximum(preferida, (dv < d).sum(axis = 1)), (dv <= d).sum(axis = 1))
+        q = q[:, None] + 1
+        cols = np.arange(filas.shape[1])
+        corrida = np.concatenate([filas[:, :1], filas[:, :-1]], axis = 1)
+        self.ids[rr] = np.where(cols < q, filas, np.where(cols == q, gg[:, None], corrida))
+        self.n[rr] += 1
+
+    def quitar(self, rr, col):
+        filas = self.ids[rr]
+        corrida = np.concatenate([filas[:, 1:], filas[:, -1:]], axis = 1)
+        self.ids[rr] = np.where(np.arange(filas.shape[1]) < col[:, None], filas, corrida)
+        self.n[rr] -= 1
+
+    # LAS FILAS OUTBOUND SE REORDENAN COMPLETAS (SORT ESTABLE) EN CADA ALTA/BAJA, COMO heap(ordenar_al_modificar = True)
+
+    def _ordenar(self, rr, D):
+        filas = self.ids[rr, 1:]
+        orden = np.argsort(D[filas], axis = 1, kind = "stable")
+        self.ids[rr, 1:] = filas[np.arange(len(rr))[:, None], orden]
+
+    def agregar_ordenando(self, rr, gg, D):
+        self._asegurar_lugar()
+        self.ids[rr, self.n[rr] + 1] = gg
+        self.n[rr] += 1
+        self._ordenar(rr, D)
+
+    def eliminar_ordenando(self, rr, gg, D):
+        self.quitar(rr, self.columna(rr, gg))
+        self._ordenar(rr, D)
+
+
+# ============================================================
+# SIMULACIÓN DE UN LOTE DE RÉPLICAS (MISMO λ, UNA SEMILLA POR RÉPLICA)
+# ============================================================
+
+def _simular_lote(lambda_por_min, minutos, seeds, dia_ventoso, inicio_tormenta, metricas):
+    R = len(seeds)
+    S = max(minutos, 1)          # A LO SUMO UN AVIÓN NUEVO POR MINUTO Y RÉPLICA
+    C = R * S                    # CENTINELA
+    flujos = _Flujos(seeds)
+    todas = np.arange(R)
+
+    # ESTADO DE LOS AVIONES, INDEXADO POR ID GLOBAL (réplica * S + id - 1)
+    D = np.full(C + 1, 100.0)             # DISTANCIA A AEP
+    V = np.full(C + 1, 300.0)             # VELOCIDAD ACTUAL
+    E = np.full(C + 1, EN_FILA, dtype = np.int8)
+    evaluado = np.zeros(C + 1, dtype = bool)
+    decidido = np.zeros(C + 1, dtype = bool)
+    disparo = np.full(C + 1, np.nan)      # DISTANCIA DE GO-AROUND (nan = no tiene)
+    D[C], V[C], E[C] = np.inf, 60.0, ATERRIZO
+    nuevos = np.zeros(R, dtype = np.intp)
+
+    fila = _Filas(R, C)
+    desviados, viento, tormenta = _Filas(R, C), _Filas(R, C), _Filas(R, C)
+    # LÍDER ASIGNADO A MANO (heap.enlazar): DURA HASTA LA PRÓXIMA OPERACIÓN SOBRE LA FILA
+    pendiente = np.full(R, C, dtype = np.intp)
+    objetivo = np.full(R, C, dtype = np.intp)
+
+    congestion = np.zeros((R, minutos), dtype = np.int64)
+    desvios_montevideo = np.zeros((R, minutos), dtype = np.int64)
+    desvios_fila = np.zeros((R, minutos), dtype = np.int64)
+    desvios_viento = np.zeros((R, minutos), dtype = np.int64)
+    desvios_tormenta = np.zeros((R, minutos), dtype = np.int64)
+    registros = []
+
+    def registrar(gg, t, tipo, x = None, v = None, e = None, vmax = None):
+        registros.append((gg, t, tipo, x, v, e, vmax))
+
+    def desviar(rr, gg, col, codigo, destino):
+        E[gg] = codigo
+        destino.agregar_ordenando(rr, gg, D)
+        V[gg] = 200.0
+        # plane._descolar_y_reenlazar: EL SEGUIDOR QUEDA APUNTANDO AL "next" QUE EL AVIÓN
+        # TENÍA DESPUÉS DE ENTRAR A SU FILA OUTBOUND (su antecesor en esa fila)
+        objetivo[rr] = destino.ids[rr, destino.columna(rr, gg) - 1]
+        pendiente[rr] = fila.ids[rr, col + 1]
+        fila.quitar(rr, col)
+
+    for t in range(minutos):
+        tormenta_activa = (
+            inicio_tormenta is not None and
+            inicio_tormenta <= t < inicio_tormenta + DURACION_TORMENTA
+        )
+
+        # ----------------------------------------------
+        # GENERACIÓN DE NUEVOS AVIONES SEGÚN λ
+        # ----------------------------------------------
+
+        rr = todas[flujos.tomar(todas) < lambda_por_min]
+        if len(rr):
+            gg = rr * S + nuevos[rr]
+            nuevos[rr] += 1
+            metricas.registrar_aviones(len(rr))
+            fila.insertar(rr, gg, fila.n[rr], D)
+            pendiente[rr] = C
+
+        # ----------------------------------------------
+        # AVANZA LA FILA PRINCIPAL: UN PASO POR POSICIÓN, TODAS LAS RÉPLICAS A LA VEZ
+        # (la regla de separación depende del líder ya actualizado, así que las posiciones van en orden)
+        # ----------------------------------------------
+
+        foto = fila.ids.copy()
+        largo = fila.n.copy()
+        for k in range(1, int(largo.max(initial = 0)) + 1):
+            rr = todas[k <= largo]
+            gg = foto[rr, k]
+            d = D[gg]
+            tramo = _tramo(d)
+            vmin, vmax = _VMIN[tramo], _VMAX[tramo]
+            col = fila.columna(rr, gg)
+
+            # LÍDER: EL DE ADELANTE EN LA FILA, SALVO UN ENLACE MANUAL PENDIENTE
+            lider = np.where(pendiente[rr] == gg, objetivo[rr], fila.ids[rr, col - 1])
+            tiene = E[lider] == EN_FILA
+            v = V[gg]
+            vl = V[lider]
+            gap = d / (v / 60.0) - D[lider] / (vl / 60.0)
+            frena = tiene & (gap < 4.0)
+            nueva_v = vl - 20.0
+            desvia = frena & (nueva_v < vmin)
+            v = np.where(frena, nueva_v, np.where(~tiene | (gap >= 5.0), vmax, v))
+
+            gd = gg[desvia]
+            if len(gd):
+                desviar(rr[desvia], gd, col[desvia], DESVIADO, desviados)
+                registrar(gd, t, _REG_COMPLETO, D[gd], V[gd], E[gd], vmax[desvia])
+                sigue = ~desvia
+                rr, gg, v, col, d, vmax = rr[sigue], gg[sigue], v[sigue], col[sigue], d[sigue], vmax[sigue]
+
+            V[gg] = v
+            d = np.maximum(0.0, d - v / 60.0)
+            D[gg] = d
+            final = (0.0 < d) & (d <= 5.0)
+            sale = np.zeros(len(rr), dtype = bool)
+
+            if tormenta_activa:
+                sale = final
+                if sale.any():
+                    metricas.registrar_desvio_tormenta(int(sale.sum()))
+                    desviar(rr[sale], gg[sale], col[sale], TORMENTA, tormenta)
+            elif final.any():
+                nueva = final & ~evaluado[gg]
+                evaluado[gg[nueva]] = True
+                if dia_ventoso and nueva.any():
+                    dec = flujos.tomar(rr[nueva]) < 0.1
+                    decidido[gg[nueva]] = dec
+                    if dec.any():
+                        disparo[gg[nueva][dec]] = 0.0 + (5.0 - 0.0) * flujos.tomar(rr[nueva][dec])
+                sale = final & decidido[gg] & (d <= disparo[gg])
+                if sale.any():
+                    metricas.registrar_desvio_viento(int(sale.sum()))
+                    desviar(rr[sale], gg[sale], col[sale], RIO, viento)
+
+            aterriza = ~sale & (d <= 0.0)
+            if aterriza.any():
+                ga = gg[aterriza]
+                E[ga] = ATERRIZO
+                metricas.registrar_aterrizaje(len(ga))
+                fila.quitar(rr[aterriza], col[aterriza])
+                pendiente[rr[aterriza]] = C
+                registrar(ga, t, _REG_ESTADO, e = E[ga])
+
+            # EL RESTO SIGUE EN FILA: SE REUBICA SOLO SI QUEDÓ FUERA DE ORDEN CON SUS VECINOS
+            queda = ~sale & ~aterriza
+            rq, gq, cq, dq = rr[queda], gg[queda], col[queda], d[queda]
+            E[gq] = EN_FILA
+            fuera = ((cq > 1) & (D[fila.ids[rq, cq - 1]] > dq)) | (D[fila.ids[rq, cq + 1]] < dq)
+            if fuera.any():
+                fila.quitar(rq[fuera], cq[fuera])
+                fila.insertar(rq[fuera], gq[fuera], cq[fuera] - 1, D)
+            pendiente[rq] = C
+
+            # MÉTRICA DE CONGESTIÓN E HISTORIA (los que salieron registran su estado nuevo)
+            congestion[rq[v[queda] < vmax[queda]], t] += 1
+            if sale.any():
+                gs = gg[sale]
+                registrar(gs, t, _REG_COMPLETO, D[gs], V[gs], E[gs], vmax[sale])
+            registrar(gq, t, _REG_COMPLETO, dq, v[queda], E[gq], vmax[queda])
+
+        # ----------------------------------------------
+        # OUTBOUND: DESVIADOS (congestión), VIENTO Y TORMENTA, EN ESE ORDEN
+        # ----------------------------------------------
+
+        # CADA AVIÓN OUTBOUND BUSCA UN GAP EN LA FILA PRINCIPAL, QUE SOLO CAMBIA CUANDO ALGUIEN SE REINSERTA,
+        # Y SU FILA SOLO SE REORDENA CUANDO ALGUIEN SALE. POR ESO SE RESUELVEN DE UNA VEZ TODOS LOS AVIONES
+        # HASTA EL PRÓXIMO "EVENTO" (reinserción o salida a Montevideo) DE CADA RÉPLICA, Y SE SIGUE DESDE AHÍ.
+
+        a_montevideo = []
+        for outbound, conteo in ((desviados, desvios_fila), (viento, desvios_viento), (tormenta, desvios_tormenta)):
+            foto = outbound.ids.copy()
+            largo = outbound.n.copy()
+            conteo[:, t] = largo
+            inicio = np.ones(R, dtype = np.intp)
+            rr = todas[largo > 0]
+            pendiente[rr] = C     # buscar_gap EMPIEZA CON fila.actualizar_orden()
+            while len(rr):
+                m = np.arange(len(rr))
+                G = foto[rr]
+                cols = np.arange(G.shape[1])
+                en_tramo = (cols >= inicio[rr, None]) & (cols <= largo[rr, None])
+                d = D[G]
+
+                # PRIMER GAP ≥ 10 MIN DENTRO DE LA FILA (vale para los que están a más de 5 MN)
+                filas = fila.ids[rr]
+                n = fila.n[rr]
+                eta = D[filas] / (V[filas] / 60.0)
+                with np.errstate(invalid = "ignore"):     # inf - inf ENTRE CENTINELAS
+                    huecos = eta[:, 2:] - eta[:, 1:-1] >= 10.0
+                    # SI NO, AL FINAL DE LA FILA (O EN 0 SI ESTÁ VACÍA)
+                    al_final = (d <= 100.0) & (d / (V[G] / 60.0) - eta[m, n][:, None] >= 10.0)
+                huecos &= np.arange(1, huecos.shape[1] + 1) < n[:, None]
+                interno = huecos.any(axis = 1)
+                vuelve = (interno[:, None] & (d > 5.0)) | (n == 0)[:, None] | al_final
+                nueva_d = d + (200.0 / 60.0)
+                evento = en_tramo & (vuelve | (nueva_d >= 100.0))
+                hay_evento = evento.any(axis = 1)
+                e = np.where(hay_evento, np.argmax(evento, axis = 1), largo[rr] + 1)
+
+                # LOS ANTERIORES AL EVENTO NO ENCONTRARON GAP: SIGUEN SALIENDO A 200 KN
+                mueve = en_tramo & (cols < e[:, None])
+                D[G[mueve]] = nueva_d[mueve]
+
+                fe, ce = m[hay_evento], e[hay_evento]
+                re, ge, reinserta = rr[fe], G[fe, ce], vuelve[fe, ce]
+
+                # REINSERCIÓN EN EL GAP INTERNO, AL FINAL O EN UNA FILA VACÍA
+                if reinserta.any():
+                    fv = fe[reinserta]
+                    rv, gv = re[reinserta], ge[reinserta]
+                    posicion = np.where(interno[fv] & (D[gv] > 5.0), np.argmax(huecos[fv], axis = 1) + 1, n[fv])
+                    fila.insertar(rv, gv, posicion, D)
+                    outbound.eliminar_ordenando(rv, gv, D)
+                    V[gv] = _VMAX[_tramo(D[gv])]
+                    E[gv] = REINSERTADO
+                    if outbound is desviados:
+                        for avion_id in (gv % S + 1).tolist():
+                            metricas.registrar_reinsercion(avion_id)
+
+                # PASÓ LOS 100 MN → SE VA A MONTEVIDEO
+                if not reinserta.all():
+                    sale = ~reinserta
+                    rm, gm = re[sale], ge[sale]
+                    vmax = _VMAX[_tramo(D[gm])]
+                    D[gm] = nueva_d[fe[sale], ce[sale]]
+                    registrar(gm, t, _REG_SALIDA, D[gm], V[gm], vmax = vmax)
+                    outbound.eliminar_ordenando(rm, gm, D)
+                    E[gm] = MONTEVIDEO
+                    metricas.registrar_desvio_montevideo(len(gm))
+                    a_montevideo.append((rm, gm))
+
+                inicio[re] = ce + 1
+                rr = re[ce < largo[re]]
+
+        # ----------------------------------------------
+        # AVIONES QUE SE FUERON A MONTEVIDEO ESTE MINUTO
+        # ----------------------------------------------
+
+        for rm, gm in a_montevideo:
+            desvios_montevideo[rm, t] += 1
+            registrar(gm, t, _REG_ESTADO, e = E[gm])
+
+    # AL FINAL: CUÁNTOS AVIONES QUEDARON EN EL AIRE
+    metricas.en_vuelo(int(fila.n.sum() + desviados.n.sum() + viento.n.sum() + tormenta.n.sum()))
+
+    historias = _armar_historias(registros, nuevos, S)
+    return [
+        {
+            "historia": historias[r],
+            "resumen": historias[r].resumen,
+            "congestion": congestion[r],
+            "desvios_montevideo": desvios_montevideo[r],
+            "desvios_fila": desvios_fila[r],
+            "desvios_viento": desvios_viento[r],
+            "desvios_tormenta": desvios_tormenta[r],
+        }
+        for r in range(R)
+    ]
+
+
+def _armar_historias(registros, nuevos, S):
+    # PASA LOS REGISTROS (en orden cronológico) A UNA historia_vuelos POR RÉPLICA (las mismas columnas
+    # que llena el simulador con objetos, así que historia[id] da exactamente lo mismo)
+    R = len(nuevos)
+    if not registros:
+        return [historia_vuelos.desde_columnas(np.arange(1, nuevos[r] + 1), *([[]] * 8)) for r in range(R)]
+    largos = [len(r[0]) for r in registros]
+
+    def columna(i, dtype):
+        # LOS CAMPOS QUE UN TIPO DE REGISTRO NO TIENE QUEDAN EN CERO (se descartan abajo)
+        return np.concatenate([np.zeros(m, dtype) if r[i] is None else r[i] for r, m in zip(registros, largos)])
+
+    gg = np.concatenate([r[0] for r in registros])
+    t = np.repeat([r[1] for r in registros], largos)
+    tipo = np.repeat([r[2] for r in registros], largos)
+    x, v, e, vmax = columna(3, float), columna(4, float), columna(5, np.int8), columna(6, float)
+    orden = np.argsort(gg, kind = "stable")
+    gg, t, tipo, x, v, e, vmax = (a[orden] for a in (gg, t, tipo, x, v, e, vmax))
+
+    con_x = tipo != _REG_ESTADO
+    con_estado = tipo != _REG_SALIDA
+    cortes = np.searchsorted(gg, np.arange(R + 1) * S).tolist()
+    historias = []
+    for r in range(R):
+        tramo = slice(cortes[r], cortes[r + 1])
+        ids = gg[tramo] - r * S + 1
+        cx, ce = con_x[tramo], con_estado[tramo]
+        historias.append(historia_vuelos.desde_columnas(
+            np.arange(1, nuevos[r] + 1),
+            ids, t[tramo],
+            ids[cx], x[tramo][cx], v[tramo][cx], vmax[tramo][cx],
+            ids[ce], e[tramo][ce]))
+    return historias
+
+
+# ============================================================
+# MISMA INTERFAZ QUE simulacion.simular_con_historia
+# ============================================================
+
+def simular_con_historia_vectorizada(lambda_por_min, minutos, seed = None, dia_ventoso = True,
+                                     inicio_tormenta = None, metricas = None, rng = None):
+    if metricas is None:
+        metricas = MetricasSimulacion()
+    return _simular_lote(lambda_por_min, minutos, [seed if rng is None else rng], dia_ventoso, inicio_tormenta, metricas)[0]
+
+# ============================================================
+# PARTES 4, 5 y 6: TODAS LAS RÉPLICAS DE UN λ A LA VEZ
+# CADA SEMILLA (o random.Random) ES UNA RÉPLICA CON SUS PROPIOS ARRIBOS Y GO-AROUNDS; TODAS AVANZAN JUNTAS
+# EN EL MISMO BUCLE DE MINUTOS. DEVUELVE UNA LISTA CON EL RESULTADO DE CADA RÉPLICA,
+# IGUAL AL DE LLAMAR A simular_con_historia CON ESA SEMILLA (las métricas se acumulan en "metricas").
+# ============================================================
+
+def simular_lote_con_historia(lambda_por_min, minutos, seeds, dia_ventoso = True,
+                              inicio_tormenta = None, metricas = None):
+    if metricas is None:
+        metricas = MetricasSimulacion()
+    if len(seeds) == 0:
+        return []
+    return _simular_lote(lambda_por_min, minutos, list(seeds), dia_ventoso, inicio_tormenta, metricas)
@@ -0,0 +1,54 @@
+import functools
+import os
+import sys
+import pytest
+
+# LOS MÓDULOS DEL TRABAJO ESTÁN SUELTOS EN LA RAÍZ DEL REPOSITORIO (no es un paquete)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from simulacion import simular_con_historia
+from simulacion_mejorado import simular_con_historia_v2
+from simulacion_prioritarios import simular_con_historia_prioritarios
+from analisis import MetricasSimulacion
+from experimentos import correr_experimentos
+
+# ============================================================
+# LO QUE COMPARTEN LOS TESTS
+# ============================================================
+
+# SERIES POR MINUTO DE UNA CORRIDA (las que se comparan entre dos corridas que tienen que ser la misma)
+CONTADORES = ("congestion", "desvios_montevideo", "desvios_fila", "desvios_viento", "desvios_tormenta")
+
+# LOS TRES CASOS DEL TRABAJO: MODELO BASE, MEJORA Y PRIORITARIOS (mismo motor, otra política)
+SIMULADORES = {
+    "normal": simular_con_historia,
+    "mejora": simular_con_historia_v2,
+    "prioritario": simular_con_historia_prioritarios,
+}
+
+
+@pytest.fixture(params = list(SIMULADORES))
+def caso(request):
+    # UN TEST QUE USA caso (o simular) CORRE CON LOS TRES; parametrize("caso", ...) ELIGE OTROS
+    return request.param
+
+
+@pytest.fixture
+def simular(caso):
+    # EL SIMULADOR DEL CASO, CON p_prioritario = 0.2 PARA LOS PRIORITARIOS
+    extra = {"p_prioritario": 0.2} if caso == "prioritario" else {}
+    return functools.partial(SIMULADORES[caso], **extra)
+
+
+# BARRIDO CORTO DE correr_experimentos: 240 MINUTOS, record = "summary" Y MÉTRICAS NUEVAS POR λ
+LAMBDAS = [0.1, 0.5]
+
+
+@pytest.fixture(scope = "session")
+def correr():
+    # correr(n_rep = ..., **kwargs) → (DataFrame, {λ: resumen de sus métricas}); kwargs PISA LO DE ARRIBA
+    def correr(lambdas = LAMBDAS, **kwargs):
+        metricas = {lam: MetricasSimulacion() for lam in lambdas}
+        df = correr_experimentos(lambdas, metricas_lambda = metricas, **{"minutos": 240, "record": "summary", **kwargs})
+        return df, {lam: m.resumen() for lam, m in metricas.items()}
+    return correr
@@ -0,0 +1,43 @@
+import pytest
+from experimentos import _semiancho_ic
+
+# ============================================================
+# MODO ADAPTATIVO DE correr_experimentos (objetivo_ic)
+# CORRIDAS CORTAS (240 minutos) PARA QUE EL TEST SEA RÁPIDO
+# ============================================================
+
+LAMBDAS = [0.02, 0.5]
+
+
+def test_cada_lambda_corta_por_su_cuenta(correr):
+    # CON 5 RÉPLICAS λ = 0.02 YA TIENE EL ATRASO CON SEMIANCHO < 0.5; λ = 0.5 NO LO LOGRA NI CON 40
+    df, _ = correr(LAMBDAS, n_rep = 40, objetivo_ic = {"atraso_prom": 0.5}, tanda = 5)
+    assert df.attrs["reps_usadas"] == {0.02: 5, 0.5: 40}
+    assert df.attrs["semiancho_ic"][0.02]["atraso_prom"] <= 0.5
+    assert df.attrs["semiancho_ic"][0.5]["atraso_prom"] > 0.5
+
+    # SON LAS MISMAS RÉPLICAS (seed + rep) QUE CON n_rep FIJO, Y EL SEMIANCHO ES EL DE ESAS FILAS
+    fijo, _ = correr(LAMBDAS, n_rep = 40)
+    for lam, n in df.attrs["reps_usadas"].items():
+        filas = df[df["lambda"] == lam].reset_index(drop = True)
+        esperadas = fijo[fijo["lambda"] == lam].head(n).reset_index(drop = True)
+        assert filas.equals(esperadas)
+        assert df.attrs["semiancho_ic"][lam]["atraso_prom"] == pytest.approx(
+            _semiancho_ic(filas.to_dict("records"), "atraso_prom"))
+
+
+def test_corta_en_n_rep_aunque_no_llegue(correr):
+    df, _ = correr(LAMBDAS, n_rep = 3, objetivo_ic = {"atraso_prom": 1e-9}, tanda = 2)
+    assert df.attrs["reps_usadas"] == {0.02: 3, 0.5: 3}
+    assert len(df) == 6
+
+
+@pytest.mark.parametrize("n_rep, tanda", [(0, 5), (-1, 5), (10, 0)])
+def test_parametros_invalidos(correr, n_rep, tanda):
+    with pytest.raises(ValueError):
+        correr(LAMBDAS, n_rep = n_rep, objetivo_ic = {"atraso_prom": 0.5}, tanda = tanda)
+
+
+def test_metrica_inexistente(correr):
+    with pytest.raises(ValueError, match = "no_existe"):
+        correr(LAMBDAS, n_rep = 4, objetivo_ic = {"no_existe": 0.5}, tanda = 2)
@@ -0,0 +1,49 @@
+import pytest
+from concurrent.futures import ProcessPoolExecutor
+from ajuste_control import ajustar_control, grilla_control, frente_pareto
+
+# ============================================================
+# AJUSTE DEL CONTROL DE LA MEJORA POR HALVING SUCESIVO
+# ============================================================
+
+LAMBDAS = [0.1, 0.5]
+ARGUMENTOS = {"n_muestras": 6, "n_rep_inicial": 2, "n_rep_max": 8, "minutos": 240, "todos": True}
+
+
+def test_grilla_sin_umbrales_invertidos():
+    grilla = grilla_control()
+    assert len(grilla) == 1458
+    assert all(c["umbral_suave"] < c["umbral_fuerte"] for c in grilla)
+
+
+def test_frente_pareto():
+    valores = [[1.0, 5.0], [2.0, 2.0], [3.0, 3.0], [5.0, 1.0], [1.0, 5.0]]
+    assert frente_pareto(valores).tolist() == [True, True, False, True, True]
+
+
+def test_en_paralelo_igual_que_en_serie():
+    serie = ajustar_control(LAMBDAS, **ARGUMENTOS)
+    with ProcessPoolExecutor(max_workers = 2) as pool:
+        paralelo = ajustar_control(LAMBDAS, executor = pool, **ARGUMENTOS)
+    assert paralelo.equals(serie)
+
+
+def test_los_que_siguen_completan_sus_replicas():
+    tabla = ajustar_control(LAMBDAS, **ARGUMENTOS)
+    finalistas = tabla[tabla["ronda_eliminado"].isna()]
+    assert (finalistas["n_rep"] == 8).all()
+    assert (tabla.loc[tabla["ronda_eliminado"] == 0, "n_rep"] == 2).all()
+    assert finalistas["frente"].any() and not tabla.loc[tabla["ronda_eliminado"].notna(), "frente"].any()
+
+    # LAS RÉPLICAS QUE SE AGREGAN EN CADA RONDA DAN EL MISMO PROMEDIO QUE CORRERLAS TODAS DE UNA VEZ
+    nombres = list(grilla_control()[0])
+    for _, fila in finalistas.iterrows():
+        control = {nombre: fila[nombre] for nombre in nombres}
+        sola = ajustar_control([fila["lambda"]], candidatos = [control], n_rep_inicial = 8, n_rep_max = 8, minutos = 240)
+        assert sola["atraso_prom"].iloc[0] == pytest.approx(fila["atraso_prom"])
+        assert sola["montevideo_freq"].iloc[0] == pytest.approx(fila["montevideo_freq"])
+
+
+def test_eta_invalido():
+    with pytest.raises(ValueError, match = "eta"):
+        ajustar_control(LAMBDAS, eta = 1)
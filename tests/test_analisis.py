@@ -0,0 +1,139 @@
+import numpy as np
+import pandas as pd
+import pytest
+from simulacion import simular_con_historia
+from analisis import (estadisticas_por_minuto, calcular_congestion_total, calcular_congestion_por_tramo, analizar_congestion,
+                      tabla_trayectorias, congestion_por_avion, analizar_congestion_montevideo,
+                      analizar_congestion_por_clase)
+
+# ============================================================
+# ANÁLISIS SOBRE ARREGLOS, TABLA LARGA Y RESÚMENES: LOS MISMOS NÚMEROS QUE LAS CUENTAS
+# ORIGINALES, QUE RECORRÍAN LA HISTORIA (dict por avión) MINUTO A MINUTO. ESAS CUENTAS
+# ESTÁN COPIADAS ACÁ COMO REFERENCIA
+# ============================================================
+
+TRAMOS = ("lejos", "medio", "cerca")
+
+
+def _como_dict(historia):
+    # LA HISTORIA EN EL FORMATO VIEJO: {id: {"t": [...], "x": [...], ...}}
+    return {id_avion: dict(datos) for id_avion, datos in historia.items()}
+
+
+def _minutos_por_avion(datos):
+    # (congestión total, {tramo: congestión}, minutos recorridos) DE UN AVIÓN, COMO EN EL ORIGINAL
+    total, minutos, tramos = 0, 0, dict.fromkeys(TRAMOS, 0)
+    for distancia, estado, velocidad, vmax in zip(datos["x"], datos["estado"], datos["v"], datos["vmax"]):
+        minutos += 1
+        if estado in ["En fila", "Reinsertado"] and velocidad < vmax:
+            total += 1
+            tramos["lejos" if distancia > 50 else "medio" if distancia > 15 else "cerca"] += 1
+    return total, tramos, minutos
+
+
+def _congestion_de(aviones):
+    # PROMEDIO POR AVIÓN (total y tramos) Y FRECUENCIA DE UN GRUPO DE AVIONES (0 si no hay)
+    if not aviones:
+        return {"congestion_prom": 0.0, "frecuencia_congestion": 0.0, **{f"congestion_{t}": 0.0 for t in TRAMOS}}
+    cuentas = [_minutos_por_avion(datos) for datos in aviones]
+    minutos = sum(m for _, _, m in cuentas)
+    return {"congestion_prom": np.mean([c for c, _, _ in cuentas]),
+            "frecuencia_congestion": sum(c for c, _, _ in cuentas) / minutos if minutos > 0 else 0.0,
+            **{f"congestion_{t}": np.mean([tramos[t] for _, tramos, _ in cuentas]) for t in TRAMOS}}
+
+
+def _montevideo_original(df):
+    filas = []
+    for lam, historia in zip(df["lambda"], df["historia"]):
+        aviones = [datos for datos in historia.values() if "Montevideo" in datos["estado"]]
+        filas.append({"lambda": lam, **{f"{c}_montevideo": v for c, v in _congestion_de(aviones).items()}})
+    return pd.DataFrame(filas)
+
+
+@pytest.fixture(scope = "module")
+def experimentos(correr):
+    return {caso: correr([0.1, 0.5, 1.0], n_rep = 3, dia_ventoso = True, hay_tormenta = True, record = "full", **kwargs)[0]
+            for caso, kwargs in {"normal": {}, "prioritario": {"p_prioritario": 0.2}}.items()}
+
+
+def test_estadisticas_por_minuto():
+    series = [simular_con_historia(lam, 300, seed = seed, record = "off")["congestion"] for lam in (0.1, 0.5, 1.0)
+              for seed in (1, 7)]
+    por_replica = estadisticas_por_minuto(np.stack(series))
+    for i, serie in enumerate(series):
+        # EL FORMATO VIEJO {t: valor} DA LO MISMO QUE EL ARREGLO Y QUE LA FILA DE LA MATRIZ
+        como_dict = dict(enumerate(serie.tolist()))
+        minutos = len(como_dict)
+        original = {"frecuencia_congestion": sum(1 for c in como_dict.values() if c > 0) / minutos,
+                    "congestion_promedio": sum(como_dict.values()) / minutos,
+                    "congestion_maxima": max(como_dict.values()),
+                    "minutos_totales_congestion": sum(como_dict.values())}
+        assert calcular_congestion_total(serie) == pytest.approx(original)
+        assert calcular_congestion_total(como_dict) == pytest.approx(original)
+        assert [por_replica[c][i] for c in ("frecuencia", "promedio", "maxima", "total")] == \
+            pytest.approx(list(original.values()))
+
+
+def test_congestion_de_los_aterrizados(experimentos):
+    for historia in experimentos["normal"]["historia"]:
+        aterrizados = [datos for datos in _como_dict(historia).values() if "Aterrizó" in datos["estado"]]
+        original = _congestion_de(aterrizados)
+        for h in (historia, _como_dict(historia)):
+            assert analizar_congestion({"historia": h})["promedio"] == pytest.approx(original["congestion_prom"])
+            assert calcular_congestion_por_tramo(h) == pytest.approx({t: original[f"congestion_{t}"] for t in TRAMOS})
+
+
+def test_tabla_trayectorias_y_congestion_por_avion(experimentos):
+    df = experimentos["normal"]
+    tabla = tabla_trayectorias(df, escenario = "normal")
+    # LA MISMA TABLA DESDE LAS historia_vuelos QUE DESDE LAS HISTORIAS VIEJAS (dict)
+    viejas = tabla_trayectorias(df.assign(historia = df["historia"].map(_como_dict)), escenario = "normal")
+    columnas = ["escenario", "lambda", "rep", "id", "t", "x", "v", "vmax"]
+    # (solo cambian los tipos: enteros de 32 bits y estado categórico)
+    pd.testing.assert_frame_equal(tabla[columnas], viejas[columnas], check_dtype = False)
+    assert tabla["estado"].astype(object).fillna("").tolist() == viejas["estado"].fillna("").tolist()
+    assert len(tabla) == sum(len(datos["t"]) for h in df["historia"] for datos in h.values())
+
+    por_avion = congestion_por_avion(tabla).set_index(["lambda", "rep", "id"])
+    for lam, rep, historia in zip(df["lambda"], df["rep"], df["historia"]):
+        for id_avion, datos in historia.items():
+            fila = por_avion.loc[(lam, rep, id_avion)]
+            total, tramos, minutos = _minutos_por_avion(datos)
+            assert (fila["congestion"], fila["minutos"]) == (total, minutos)
+            assert [fila[t] for t in TRAMOS] == [tramos[t] for t in TRAMOS]
+            assert fila["aterrizo"] == ("Aterrizó" in datos["estado"])
+            assert fila["montevideo"] == ("Montevideo" in datos["estado"])
+
+
+@pytest.mark.parametrize("caso", ["normal", "prioritario"])
+def test_montevideo_por_los_tres_caminos(experimentos, caso):
+    df = experimentos[caso]
+    original = _montevideo_original(df)
+    assert (original["congestion_prom_montevideo"] > 0).any()
+    # RESÚMENES DE LAS HISTORIAS, TABLA LARGA E HISTORIAS VIEJAS (dict)
+    for resultado in (analizar_congestion_montevideo(df),
+                      analizar_congestion_montevideo(tabla_trayectorias(df)),
+                      analizar_congestion_montevideo(df.assign(historia = df["historia"].map(_como_dict)))):
+        assert resultado.columns.tolist() == original.columns.tolist()
+        assert np.allclose(resultado.to_numpy(dtype = float), original.to_numpy(dtype = float))
+
+
+def test_congestion_por_clase(experimentos):
+    df = experimentos["prioritario"]
+    esperado = []
+    for lam, rep, historia in zip(df["lambda"], df["rep"], df["historia"]):
+        aterrizados = [datos for datos in historia.values() if "Aterrizó" in datos["estado"]]
+        for clase, prio in (("prioritario", True), ("normal", False)):
+            aviones = [datos for datos in aterrizados if datos["prio"] == prio]
+            if aviones:
+                esperado.append({"lambda": lam, "rep": rep, "clase": clase, "aviones": len(aviones),
+                                 **_congestion_de(aviones)})
+    esperado = pd.DataFrame(esperado).sort_values(["lambda", "rep", "clase"]).reset_index(drop = True)
+
+    # DESDE LAS historia_vuelos (clase con nombre) Y DESDE LAS VIEJAS (solo la marca prio)
+    for resultado in (analizar_congestion_por_clase(df),
+                      analizar_congestion_por_clase(df.assign(historia = df["historia"].map(_como_dict)))):
+        resultado = resultado.astype({"clase": str}).sort_values(["lambda", "rep", "clase"]).reset_index(drop = True)
+        assert resultado[["lambda", "rep", "clase", "aviones"]].equals(esperado[["lambda", "rep", "clase", "aviones"]])
+        columnas = [c for c in esperado.columns if c.startswith("congestion") or c.startswith("frecuencia")]
+        assert np.allclose(resultado[columnas].to_numpy(dtype = float), esperado[columnas].to_numpy(dtype = float))
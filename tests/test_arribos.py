@@ -0,0 +1,42 @@
+import math
+import numpy as np
+import pytest
+from simulacion import simular_arribos, estimar_prob_arribos, run_simulacion, simular_con_historia
+
+# ============================================================
+# PARTE 3: ARRIBOS SORTEADOS COMO MATRIZ (simular_arribos / estimar_prob_arribos)
+# ============================================================
+
+
+def _binomial(k, lam, minutos):
+    # UN ARRIBO POR MINUTO CON PROBABILIDAD λ: N ~ Binomial(minutos, λ)
+    return math.comb(minutos, k) * lam ** k * (1 - lam) ** (minutos - k)
+
+
+@pytest.mark.parametrize("k, lam", [(5, 1 / 60), (0, 1 / 60), (1, 1 / 60), (3, 0.05)])
+def test_estimacion_igual_a_la_binomial(k, lam):
+    p_hat, se, (inferior, superior) = estimar_prob_arribos(k, lambda_por_min = lam, minutos = 60, n_sim = 200_000, seed = 42)
+    assert abs(p_hat - _binomial(k, lam, 60)) < 4 * se
+    assert inferior < p_hat < superior and superior - inferior == pytest.approx(2 * 1.96 * se)
+
+
+@pytest.mark.parametrize("lam, seed", [(0.1, 1), (0.5, 7), (1 / 60, 42)])
+def test_mismos_arribos_que_la_simulacion(lam, seed):
+    # LA VENTANA 0 USA LOS NÚMEROS DE random.Random(seed): SIN DÍA VENTOSO NI TORMENTA LA SIMULACIÓN
+    # SOLO SORTEA ARRIBOS, ASÍ QUE LOS MINUTOS DE APARICIÓN SON LOS MISMOS
+    arribos = simular_arribos(lam, 300, n_sim = 1, seed = seed)
+    assert arribos["ventana"].tolist() == [0] * int(arribos["conteos"][0])
+    historia = simular_con_historia(lam, 300, seed = seed, dia_ventoso = False)["historia"]
+    assert arribos["minuto"].tolist() == sorted(vuelo["t"][0] for vuelo in historia.values())
+    assert arribos["minuto"].tolist() == [a.minuto_aparicion for a in run_simulacion(lam, 300, seed = seed)]
+
+
+def test_bloques_y_tiempos():
+    # EL TAMAÑO DEL BLOQUE NO CAMBIA EL SORTEO, Y LOS TIEMPOS CUADRAN CON LOS CONTEOS
+    entero = simular_arribos(0.2, 60, n_sim = 1000, seed = 3)
+    en_bloques = simular_arribos(0.2, 60, n_sim = 1000, seed = 3, bloque = 77)
+    for c in ("conteos", "ventana", "minuto"):
+        assert np.array_equal(entero[c], en_bloques[c])
+    assert np.array_equal(np.bincount(entero["ventana"], minlength = 1000), entero["conteos"])
+    assert np.all(np.diff(entero["ventana"] * 60 + entero["minuto"]) > 0)
+    assert simular_arribos(0.2, 60, n_sim = 1000, seed = 3, con_tiempos = False).keys() == {"conteos"}
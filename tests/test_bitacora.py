@@ -0,0 +1,57 @@
+import os
+import numpy as np
+import pytest
+from analisis import MetricasSimulacion
+from bitacora import bitacora_barrido
+from conftest import LAMBDAS
+
+# ============================================================
+# BITÁCORA DE UN BARRIDO: NOMBRES DE ARCHIVO Y RETOMAR UN BARRIDO CORTADO
+# ============================================================
+
+
+def test_nombre_de_archivo_canonico(tmp_path):
+    registro = bitacora_barrido(tmp_path, "normal", 240, 0, False, None, 0, "summary")
+    registro.anotar(np.float64(0.1), [0, 1], [{}, {}], MetricasSimulacion())
+    registro.anotar(0.5, range(2, 4), [{}, {}], MetricasSimulacion())
+    assert sorted(os.listdir(registro.ruta)) == ["0.1_0-1.bin", "0.5_2-3.bin"]
+    assert [(lam, reps) for lam, reps, _, _ in registro.tramos()] == [(0.1, [0, 1]), (0.5, [2, 3])]
+
+
+def test_retoma_lo_que_falta(tmp_path, correr):
+    completo, metricas_completo = correr(n_rep = 4)
+
+    primera, _ = correr(n_rep = 4, bitacora = tmp_path)
+    assert primera.equals(completo)
+    carpeta = [c.path for c in os.scandir(tmp_path)]
+    assert len(carpeta) == 1
+    archivos = sorted(os.listdir(carpeta[0]))
+    assert len(archivos) == len(LAMBDAS) * 4
+
+    # SE "CORTA" EL BARRIDO: SE PIERDEN DOS TRAMOS Y QUEDA UN TEMPORAL A MEDIO ESCRIBIR
+    for nombre in archivos[:2]:
+        os.remove(os.path.join(carpeta[0], nombre))
+    with open(os.path.join(carpeta[0], "0.5_3-3.bin.123.tmp"), "wb") as f:
+        f.write(b"a medio escribir")
+
+    retomado, metricas_retomado = correr(n_rep = 4, bitacora = tmp_path)
+    assert retomado.equals(completo)
+    assert metricas_retomado == metricas_completo
+    assert len([a for a in os.listdir(carpeta[0]) if a.endswith(".bin")]) == len(LAMBDAS) * 4
+
+
+def test_no_mezcla_barridos_distintos(tmp_path, correr):
+    correr(n_rep = 4, bitacora = tmp_path)
+    correr(n_rep = 4, bitacora = tmp_path, dia_ventoso = True)
+    assert len(os.listdir(tmp_path)) == 2
+
+
+def test_no_se_combina_con_objetivo_ic(tmp_path, correr):
+    with pytest.raises(ValueError):
+        correr(n_rep = 4, bitacora = tmp_path, objetivo_ic = {"atraso_prom": 1.0})
+
+
+def test_mismo_barrido_con_tipos_de_numpy(tmp_path):
+    python = bitacora_barrido(tmp_path, "prioritario", 240, 3, False, None, 0.2, "summary")
+    numpy = bitacora_barrido(tmp_path, "prioritario", np.int64(240), np.int64(3), np.bool_(False), None, np.float64(0.2), "summary")
+    assert numpy.barrido == python.barrido
@@ -0,0 +1,60 @@
+import os
+import numpy as np
+import cache_corridas as modulo_cache
+from cache_corridas import cache_corridas
+
+# ============================================================
+# CACHE EN DISCO DE CORRIDAS: ACIERTOS Y DESALOJO LRU
+# ============================================================
+
+
+def _simular(cache, seed):
+    return cache.simular("normal", 0.5, 240, seed = seed, record = "summary")
+
+
+def test_segunda_pasada_sale_del_cache(tmp_path, correr):
+    sin_cache, metricas_sin_cache = correr(n_rep = 3)
+    cache = cache_corridas(tmp_path)
+    primera, _ = correr(n_rep = 3, cache = cache)
+    assert (cache.aciertos, cache.fallos) == (0, 6)
+    segunda, metricas_segunda = correr(n_rep = 3, cache = cache)
+    assert (cache.aciertos, cache.fallos) == (6, 6)
+    assert primera.equals(sin_cache) and segunda.equals(sin_cache)
+    assert metricas_segunda == metricas_sin_cache
+
+    # OTRO cache SOBRE LA MISMA CARPETA ENCUENTRA LAS CORRIDAS (y su tamaño) AL ABRIRSE
+    reabierto = cache_corridas(tmp_path)
+    assert reabierto._total == cache._total == reabierto.tamanio()
+    assert correr(n_rep = 3, cache = reabierto)[0].equals(sin_cache)
+    assert reabierto.aciertos == 6
+
+
+def test_desaloja_la_menos_usada_sin_recorrer_la_carpeta(tmp_path, monkeypatch):
+    cache = cache_corridas(tmp_path)
+    for seed in range(3):
+        _simular(cache, seed)
+    tam = max(cache._indice.values())
+
+    # DESPUÉS DE ABRIR EL CACHE NO SE VUELVE A RECORRER LA CARPETA
+    def sin_scandir(*args):
+        raise AssertionError("desalojar recorrió la carpeta")
+    monkeypatch.setattr(modulo_cache.os, "scandir", sin_scandir)
+
+    cache.max_bytes = 3 * tam
+    _simular(cache, 0)                  # LA SEMILLA 0 PASA A SER LA MÁS USADA
+    _simular(cache, 3)                  # NO ENTRA: SE VA LA MENOS USADA (semilla 1)
+    claves = [os.path.basename(a) for a in cache._indice]
+    esperadas = [cache.clave("normal", 0.5, 240, seed, True, None, 0.05, "summary") + ".bin" for seed in (2, 0, 3)]
+    assert claves == esperadas
+    assert cache._total == sum(cache._indice.values()) <= cache.max_bytes
+    monkeypatch.undo()
+    assert cache._total == cache.tamanio()
+    assert not os.path.exists(cache._archivo(cache.clave("normal", 0.5, 240, 1, True, None, 0.05, "summary")))
+
+
+def test_clave_igual_con_tipos_de_numpy(tmp_path):
+    cache = cache_corridas(tmp_path)
+    python = cache.clave("prioritario", 0.5, 240, 3, True, None, 0.2, "summary")
+    numpy = cache.clave("prioritario", np.float64(0.5), np.int64(240), np.arange(5)[3], np.bool_(True), None,
+                        np.float64(0.2), "summary")
+    assert numpy == python
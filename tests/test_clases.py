@@ -0,0 +1,118 @@
+import random
+import numpy as np
+import pandas as pd
+import pytest
+from plane import plane
+from heap import heap, espacio_aereo
+from estados import DESVIADO, EN_FILA
+from politicas import clase_vuelo, clases_aep, politica_clases
+from simulacion_prioritarios import simular_con_historia_prioritarios
+from analisis import analizar_congestion_por_clase, tabla_aviones
+
+# ============================================================
+# CLASES DE PRIORIDAD (politica_clases / clases_aep): SORTEO DE LA CLASE, QUIÉN SE DESVÍA
+# PARA ABRIR PASO, CLASE GUARDADA EN LA HISTORIA Y VALIDACIÓN DE LAS PROPORCIONES
+# ============================================================
+
+TRES_CLASES = (clase_vuelo("alta", 0.1, 3.0, 10.0, True),
+               clase_vuelo("media", 0.1, 3.0, 10.0, True),
+               clase_vuelo("baja", 0.8, 5.0, 20.0))
+
+
+def test_proporciones_de_la_llegada():
+    politica = politica_clases(clases_aep(0.05, 0.1, 0.25))
+    rng = random.Random(0)
+    avion = plane(1, 0, None)
+    n = 200_000
+    niveles = np.array([politica.llegada(avion, rng) for _ in range(n)])
+    for nivel, clase in enumerate(politica.clases):
+        p = clase.proporcion
+        assert abs(np.mean(niveles == nivel) - p) < 4 * np.sqrt(p * (1 - p) / n)
+
+
+def test_proporciones_en_la_historia():
+    clases = clases_aep(0.1, 0.1, 0.2)
+    aviones = pd.concat([simular_con_historia_prioritarios(1.0, 1000, seed = seed, clases = clases, record = "summary")
+                         ["resumen"].tabla() for seed in range(3)])
+    assert aviones["clase"].cat.categories.tolist() == [c.nombre for c in clases]
+    n = len(aviones)
+    for clase in clases:
+        p = clase.proporcion
+        assert abs(np.mean(aviones["clase"] == clase.nombre) - p) < 4 * np.sqrt(p * (1 - p) / n)
+    # prio ES CUALQUIER CLASE SALVO LA ÚLTIMA
+    assert aviones["prio"].equals(aviones["clase"] != "general")
+
+
+def _fila(politica, *aviones):
+    # aviones = (distancia, velocidad, clase) DEL MÁS CERCANO AL MÁS LEJANO
+    fila = heap()
+    espacio = espacio_aereo(fila, *(heap(ordenar_al_modificar = True) for _ in range(4)), politica = politica)
+    armados = []
+    for i, (distancia, velocidad, clase) in enumerate(aviones):
+        avion = plane(i + 1, 0, espacio)
+        avion.distancia_mn_aep, avion.velocidad_actual, avion.clase = distancia, velocidad, clase
+        avion.calcular_rango_velocidad()
+        fila.agregar_avion(avion)
+        armados.append(avion)
+    return armados
+
+
+@pytest.mark.parametrize("clase_lider, clase_avion", [(2, 0), (2, 1), (1, 0)])
+def test_desvia_al_lider_de_menor_prioridad(clase_lider, clase_avion):
+    # EL AVIÓN NO LOGRA LOS 3 MIN NI A vmin; EL LÍDER ACELERA A vmax Y AUN ASÍ NO ALCANZA
+    politica = politica_clases(TRES_CLASES)
+    lider, avion = _fila(politica, (29.0, 200.0, clase_lider), (30.0, 250.0, clase_avion))
+    assert politica.separar(avion, 7)
+    assert lider.codigo == DESVIADO and lider in avion.espacio.desviados.aviones
+    assert avion.velocidad_actual == avion.v_max and avion.next is None
+
+
+@pytest.mark.parametrize("clase_lider, clase_avion", [(0, 0), (1, 1), (0, 1), (0, 2), (1, 2)])
+def test_no_desvia_al_lider_de_igual_o_mayor_prioridad(clase_lider, clase_avion):
+    politica = politica_clases(TRES_CLASES)
+    lider, avion = _fila(politica, (29.0, 200.0, clase_lider), (30.0, 250.0, clase_avion))
+    assert not politica.separar(avion, 7)
+    assert lider.codigo == EN_FILA and avion.next is lider
+    if TRES_CLASES[clase_avion].abre_paso:
+        # PIDIÓ PASO: EL LÍDER (sin nadie adelante) ACELERA A SU vmax
+        assert lider.velocidad_actual == lider.v_max
+
+
+def test_lider_que_frenaria_a_0_kn():
+    # EL LÍDER DEL LÍDER VA A 20 KN: CON LA REDUCCIÓN DE LA ÚLTIMA CLASE (20) EL LÍDER QUEDARÍA EN 0 KN
+    # Y EL ETA DIVIDIRÍA POR CERO; QUEDA EN 1 KN
+    politica = politica_clases(TRES_CLASES)
+    _, lider, avion = _fila(politica, (28.9, 20.0, 0), (29.0, 200.0, 0), (30.0, 250.0, 0))
+    assert not politica.separar(avion, 7)
+    assert lider.velocidad_actual == 1.0 and lider.codigo == EN_FILA
+
+
+def test_historia_y_congestion_por_clase():
+    clases = clases_aep(0.1, 0.1, 0.2)
+    corridas = [simular_con_historia_prioritarios(0.5, 300, seed = seed, clases = clases) for seed in (1, 2)]
+    df = pd.DataFrame({"lambda": [0.5, 0.5], "rep": [0, 1], "historia": [c["historia"] for c in corridas]})
+    aviones = tabla_aviones(df)
+    assert aviones["clase"].cat.categories.tolist() == [c.nombre for c in clases]
+    # LA VISTA DE DICCIONARIO SIGUE DANDO SOLO prio, DE ACUERDO CON LA CLASE
+    historia = corridas[0]["historia"]
+    clase_de = dict(zip(historia.tabla()["id"], historia.tabla()["clase"]))
+    assert all(datos["prio"] == (clase_de[id_avion] != "general") for id_avion, datos in historia.items())
+
+    por_clase = analizar_congestion_por_clase(df)
+    assert set(por_clase["clase"]) <= {c.nombre for c in clases}
+    aterrizados = aviones[aviones["estado"] == "Aterrizó"]
+    esperados = aterrizados.groupby(["rep", "clase"], observed = True).size()
+    assert por_clase.set_index(["rep", "clase"])["aviones"].to_dict() == esperados.to_dict()
+
+
+@pytest.mark.parametrize("proporciones", [(0.6, 0.5, 0.1), (0.01, -0.01, 0.1), (0.0, 0.0, 1.2)])
+def test_clases_aep_rechaza_proporciones_invalidas(proporciones):
+    with pytest.raises(ValueError, match = "proporciones"):
+        clases_aep(*proporciones)
+
+
+@pytest.mark.parametrize("proporciones", [(0.7, 0.4, 0.0), (0.5, -0.1, 0.6), (0.1, 0.1, -0.2)])
+def test_politica_clases_rechaza_proporciones_invalidas(proporciones):
+    clases = [clase._replace(proporcion = p) for clase, p in zip(TRES_CLASES, proporciones)]
+    with pytest.raises(ValueError, match = "proporciones"):
+        politica_clases(clases)
@@ -0,0 +1,54 @@
+import random
+import numpy as np
+from simulacion import run_simulacion, simular_con_historia, simular_por_minuto
+from analisis import MetricasSimulacion
+from conftest import CONTADORES
+
+# ============================================================
+# CADA CORRIDA CON SU PROPIO GENERADOR ALEATORIO (nada usa el random global)
+# ============================================================
+
+
+def _mismo_resultado(a, b):
+    for c in CONTADORES:
+        assert np.array_equal(a[c], b[c])
+    assert a["historia"].tabla().equals(b["historia"].tabla())
+
+
+def test_arribos_iguales_al_modelo_original():
+    # VALORES DEL CÓDIGO ORIGINAL (random.seed(seed) Y EL random GLOBAL)
+    for lam, seed, n, primeros in ((0.1, 1, 57, [8, 9, 13, 19, 20, 26]), (0.5, 7, 313, [0, 1, 3, 5, 6, 8])):
+        aviones = run_simulacion(lam, 600, seed = seed)
+        assert len(aviones) == n
+        assert [a.minuto_aparicion for a in aviones[:6]] == primeros
+
+
+def test_no_toca_el_random_global():
+    random.seed(123)
+    esperado = random.random()
+    random.seed(123)
+    simular_con_historia(0.5, 300, seed = 7, metricas = MetricasSimulacion())
+    run_simulacion(0.5, 300, seed = 7)
+    assert random.random() == esperado
+
+
+def test_rng_propio_igual_a_seed():
+    con_seed = simular_con_historia(0.5, 300, seed = 7, inicio_tormenta = 100, metricas = MetricasSimulacion())
+    con_rng = simular_con_historia(0.5, 300, rng = random.Random(7), inicio_tormenta = 100, metricas = MetricasSimulacion())
+    _mismo_resultado(con_seed, con_rng)
+
+
+def test_corridas_intercaladas_no_se_mezclan():
+    # DOS CORRIDAS AVANZANDO DE A UN MINUTO, ALTERNADAS, DAN LO MISMO QUE CADA UNA SOLA
+    solas = [simular_con_historia(lam, 300, seed = seed, metricas = MetricasSimulacion()) for lam, seed in ((0.5, 1), (1.0, 2))]
+    pasos = [simular_por_minuto(lam, 300, seed = seed, record = "full") for lam, seed in ((0.5, 1), (1.0, 2))]
+    finales = [None, None]
+    while None in finales:
+        for k, g in enumerate(pasos):
+            if finales[k] is None:
+                try:
+                    next(g)
+                except StopIteration as fin:
+                    finales[k] = fin.value
+    for sola, intercalada in zip(solas, finales):
+        _mismo_resultado(sola, intercalada)
@@ -0,0 +1,118 @@
+import matplotlib
+matplotlib.use("Agg")
+import matplotlib.pyplot as plt
+import numpy as np
+import pandas as pd
+import pytest
+from analisis import tiempo_ideal
+from graficos import cambio_data, plot_congestion_montevideo, plot_atraso_prioritarios_vs_normales
+
+# ============================================================
+# GRÁFICOS SOBRE LA TABLA POR AVIÓN (tabla_aviones): LOS MISMOS NÚMEROS QUE LAS CUENTAS
+# ORIGINALES, QUE RECORRÍAN LA HISTORIA (dict por avión) DE CADA RÉPLICA. ESAS CUENTAS
+# ESTÁN COPIADAS ACÁ COMO REFERENCIA
+# ============================================================
+
+
+def _como_dict(historia):
+    return {id_avion: dict(datos) for id_avion, datos in historia.items()}
+
+
+def _avion_original(datos, t_ideal):
+    # (estado final, minutos de congestión, atraso) COMO EN EL ORIGINAL
+    estado_final = datos["estado"][-1]
+    minutos_cong = sum(1 for est, vel, vmax in zip(datos["estado"], datos["v"], datos["vmax"])
+                       if est in ["En fila", "Reinsertado"] and vel < vmax)
+    atraso = 0
+    if estado_final in ("Aterrizó", "Montevideo"):
+        atraso = datos["t"][datos["estado"].index(estado_final)] - datos["t"][0] - t_ideal
+    return estado_final, minutos_cong, atraso
+
+
+def _cambio_data_original(df):
+    resultados = []
+    t_ideal = tiempo_ideal()
+    for lam, grupo in df.groupby("lambda"):
+        cong, atrasos, freq, mvd_rates = [], [], 0.0, []
+        for historia in grupo["historia"]:
+            total_minutos = max(max(datos["t"]) for datos in historia.values()) + 1
+            aviones = [_avion_original(datos, t_ideal) for datos in historia.values()]
+            desvios = sum(1 for estado, _, _ in aviones if estado == "Montevideo")
+            cong += [c for estado, c, _ in aviones if estado == "Aterrizó"]
+            atrasos += [a for estado, _, a in aviones if estado == "Aterrizó"]
+            mvd_rates.append(desvios / total_minutos)
+            freq += desvios / len(historia)
+        resultados.append({"lambda": lam, "aterrizajes": len(cong) / len(grupo), "prom_min_cong_aterrizados": np.mean(cong),
+                           "atraso_aterrizados": np.mean(atrasos), "montevideo_prom": np.mean(mvd_rates),
+                           "freq_montevideo": freq / len(grupo)})
+    return pd.DataFrame(resultados)
+
+
+def _montevideo_original(df):
+    # LAS CURVAS DE plot_congestion_montevideo, PANEL POR PANEL
+    t_ideal = tiempo_ideal()
+    curvas = []
+    for lam, grupo in df.groupby("lambda"):
+        por_estado = {"Aterrizó": ([], []), "Montevideo": ([], [])}
+        freq = 0.0
+        for historia in grupo["historia"]:
+            aviones = [_avion_original(datos, t_ideal) for datos in historia.values()]
+            for estado, c, a in aviones:
+                if estado in por_estado:
+                    por_estado[estado][0].append(c)
+                    por_estado[estado][1].append(a)
+            freq += len([1 for estado, _, _ in aviones if estado == "Montevideo"]) / len(historia)
+        (cong_at, atr_at), (cong_mvd, atr_mvd) = por_estado["Aterrizó"], por_estado["Montevideo"]
+        n = len(grupo)
+        curvas.append([len(cong_at) / n, len(cong_mvd) / n, np.mean(cong_at), np.mean(cong_mvd) if cong_mvd else 0,
+                       np.mean(atr_at), np.mean(atr_mvd) if atr_mvd else 0, freq / n])
+    return np.array(curvas).T
+
+
+@pytest.fixture(scope = "module")
+def experimentos(correr):
+    return {caso: correr([0.1, 0.5, 1.0], n_rep = 3, dia_ventoso = True, hay_tormenta = True, record = "full", **kwargs)[0]
+            for caso, kwargs in {"normal": {}, "prioritario": {"p_prioritario": 0.2}}.items()}
+
+
+@pytest.fixture
+def sin_ventanas(monkeypatch):
+    monkeypatch.setattr(plt, "show", lambda: None)
+    yield
+    plt.close("all")
+
+
+@pytest.mark.parametrize("caso", ["normal", "prioritario"])
+def test_cambio_data(experimentos, caso):
+    df = experimentos[caso]
+    original = _cambio_data_original(df)
+    for resultado in (cambio_data(df), cambio_data(df.assign(historia = df["historia"].map(_como_dict)))):
+        assert resultado.columns.tolist() == original.columns.tolist()
+        assert np.allclose(resultado.to_numpy(dtype = float), original.to_numpy(dtype = float))
+
+
+def test_plot_congestion_montevideo(experimentos, sin_ventanas):
+    df = experimentos["normal"]
+    plot_congestion_montevideo(df)
+    curvas = [linea.get_ydata() for ax in plt.gcf().axes for linea in ax.lines]
+    assert np.allclose(np.array(curvas, dtype = float), _montevideo_original(df))
+
+
+def test_plot_atraso_prioritarios_vs_normales(experimentos, sin_ventanas):
+    df = experimentos["prioritario"]
+    t_ideal = tiempo_ideal()
+    por_replica = []
+    for lam, historia in zip(df["lambda"], df["historia"]):
+        atrasos = {True: [], False: []}
+        for datos in historia.values():
+            if "Aterrizó" in datos["estado"]:
+                atrasos[datos["prio"]].append(datos["t"][datos["estado"].index("Aterrizó")] - datos["t"][0] - t_ideal)
+        por_replica.append((lam, np.mean(atrasos[True]) if atrasos[True] else np.nan, np.mean(atrasos[False])))
+    esperado = pd.DataFrame(por_replica, columns = ["lambda", "prio", "normal"]).groupby("lambda").mean()
+
+    plot_atraso_prioritarios_vs_normales(df)
+    atraso, total = plt.gcf().axes
+    for ax, corrimiento in ((atraso, 0.0), (total, t_ideal)):
+        prio, normal = (np.asarray(c.lines[0].get_ydata(), dtype = float) for c in ax.containers)
+        assert np.allclose(prio, esperado["prio"] + corrimiento, equal_nan = True)
+        assert np.allclose(normal, esperado["normal"] + corrimiento)
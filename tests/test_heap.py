@@ -0,0 +1,77 @@
+import random
+import pytest
+from heap import heap, _CONSULTAS_SIN_ARBOL
+
+# ============================================================
+# FILA PRINCIPAL (heap): ORDEN, ENLACES, POSICIONES Y BÚSQUEDA DE GAPS
+# SE COMPARA CONTRA LA CUENTA DIRECTA SOBRE LA LISTA, CON ALTAS, BAJAS Y MOVIMIENTOS AL AZAR
+# ============================================================
+
+
+class avion_prueba:
+    def __init__(self, distancia, velocidad):
+        self.distancia_mn_aep = distancia
+        self.velocidad_actual = velocidad
+        self.next = None
+        self.seguidor = None
+
+
+def _primer_gap_directo(aviones, umbral):
+    etas = [a.distancia_mn_aep / (a.velocidad_actual / 60.0) for a in aviones]
+    return next((k for k in range(1, len(etas)) if etas[k] - etas[k - 1] >= umbral), None)
+
+
+def _revisar(fila):
+    aviones = fila.aviones
+    assert [a.distancia_mn_aep for a in aviones] == sorted(a.distancia_mn_aep for a in aviones)
+    for i, a in enumerate(aviones):
+        assert a.next is (aviones[i - 1] if i else None)
+        assert a.seguidor is (aviones[i + 1] if i + 1 < len(aviones) else None)
+        assert fila.get_index(a) == i
+
+
+@pytest.mark.parametrize("seed", [0, 1, 2])
+def test_operaciones_al_azar(seed):
+    rng = random.Random(seed)
+    fila = heap()
+    for paso in range(600):
+        op = rng.random()
+        if op < 0.35 or not fila.aviones:
+            fila.agregar_avion(avion_prueba(rng.uniform(5, 100), rng.choice((150.0, 200.0, 250.0, 300.0))))
+        elif op < 0.45:
+            fila.eliminar_avion(fila.aviones[0])
+        elif op < 0.55:
+            fila.eliminar_avion(rng.choice(fila.aviones))
+        elif op < 0.65:
+            fila.insertar_avion(avion_prueba(rng.uniform(5, 100), 200.0), rng.randrange(len(fila.aviones) + 1))
+        elif op < 0.8:
+            a = rng.choice(fila.aviones)
+            a.distancia_mn_aep = max(0.0, a.distancia_mn_aep + rng.uniform(-8, 2))
+            fila.reubicar(a)
+        else:
+            # VARIAS CONSULTAS SEGUIDAS: LAS PRIMERAS RECORREN LA FILA, LAS DEMÁS USAN EL ÁRBOL
+            for _ in range(_CONSULTAS_SIN_ARBOL + 2):
+                umbral = rng.uniform(0, 12)
+                assert fila.primer_gap(umbral) == _primer_gap_directo(fila.aviones, umbral)
+        _revisar(fila)
+
+
+def test_cambio_de_velocidad_invalida_el_arbol():
+    fila = heap()
+    aviones = [avion_prueba(10.0 * (k + 1), 300.0) for k in range(8)]
+    for a in aviones:
+        fila.agregar_avion(a)
+    for _ in range(_CONSULTAS_SIN_ARBOL + 1):
+        assert fila.primer_gap(3.0) is None
+    # MÁS LENTO, EL SEGUNDO AVIÓN QUEDA LEJOS DE SU LÍDER (Y EL TERCERO CERCA DEL SUYO)
+    aviones[1].velocidad_actual = 150.0
+    fila.refrescar_eta(aviones[1])
+    for _ in range(_CONSULTAS_SIN_ARBOL + 1):
+        assert fila.primer_gap(3.0) == 1
+
+
+def test_eliminar_un_avion_que_no_esta():
+    fila = heap()
+    fila.agregar_avion(avion_prueba(10.0, 200.0))
+    with pytest.raises(ValueError):
+        fila.eliminar_avion(avion_prueba(20.0, 200.0))
@@ -0,0 +1,111 @@
+import random
+import pytest
+from estados import ESTADOS, EN_FILA, REINSERTADO, DESVIADO, ATERRIZO, MONTEVIDEO
+from historia import historia_vuelos
+from politicas import clases_aep
+from simulacion_prioritarios import simular_con_historia_prioritarios
+
+# ============================================================
+# HISTORIA EN COLUMNAS (historia_vuelos): SE LEE COMO EL dict POR AVIÓN DE SIEMPRE
+# Y SE PUEDE REARMAR DESDE SU TABLA
+# ============================================================
+
+
+class historia_dict:
+    # LA HISTORIA ORIGINAL: {id: {"t": [...], "x": [...], "v": [...], "estado": [...], "vmax": [...]}}
+    # CON LOS MISMOS append QUE HACÍAN Simulacion.py Y plane.py
+    def __init__(self, clases = None):
+        self.datos = {}
+        self.clases = clases
+
+    def nuevo_avion(self, id_avion, clase = None):
+        self.datos[id_avion] = {"t": [], "x": [], "v": [], "estado": [], "vmax": []}
+        if clase is not None:
+            self.datos[id_avion]["prio"] = clase < len(self.clases) - 1
+
+    def registrar(self, id_avion, t, x, v, codigo, vmax):
+        datos = self.datos[id_avion]
+        datos["t"].append(t)
+        datos["x"].append(x)
+        datos["v"].append(v)
+        datos["estado"].append(ESTADOS[codigo])
+        datos["vmax"].append(vmax)
+
+    def registrar_estado(self, id_avion, t, codigo):
+        self.datos[id_avion]["t"].append(t)
+        self.datos[id_avion]["estado"].append(ESTADOS[codigo])
+
+    def registrar_salida(self, id_avion, t, x, v, vmax):
+        datos = self.datos[id_avion]
+        datos["t"].append(t)
+        datos["x"].append(x)
+        datos["v"].append(v)
+        datos["vmax"].append(vmax)
+
+
+def _misma_corrida_al_azar(seed, clases):
+    # VARIOS AVIONES EN EL AIRE A LA VEZ, CON LOS REGISTROS INTERCALADOS COMO EN UNA CORRIDA
+    rng = random.Random(seed)
+    historias = (historia_vuelos(clases), historia_dict(clases))
+    en_vuelo, proximo = [], 1
+    for t in range(200):
+        if rng.random() < 0.3:
+            clase = None if clases is None else rng.randrange(len(clases))
+            for h in historias:
+                h.nuevo_avion(proximo, clase)
+            en_vuelo.append(proximo)
+            proximo += 1
+        for id_avion in list(en_vuelo):
+            x, v, codigo = rng.uniform(0, 120), rng.uniform(120, 500), rng.choice((EN_FILA, REINSERTADO, DESVIADO))
+            final = rng.random()
+            for h in historias:
+                if final < 0.05:
+                    h.registrar_estado(id_avion, t, ATERRIZO)
+                elif final < 0.08:
+                    h.registrar_salida(id_avion, t, x, v, 500.0)
+                    h.registrar_estado(id_avion, t, MONTEVIDEO)
+                else:
+                    h.registrar(id_avion, t, x, v, codigo, 500.0)
+            if final < 0.08:
+                en_vuelo.remove(id_avion)
+    return historias
+
+
+@pytest.mark.parametrize("clases", [None, ("prioritario", "normal"), ("a", "b", "c")])
+@pytest.mark.parametrize("seed", [0, 1])
+def test_lectura_como_dict(seed, clases):
+    historia, original = _misma_corrida_al_azar(seed, clases)
+    assert len(historia) == len(original.datos) and list(historia) == list(original.datos)
+    assert dict(historia.items()) == original.datos
+    assert list(historia.values()) == list(original.datos.values())
+    for id_avion in original.datos:
+        assert historia[id_avion] == original.datos[id_avion] and id_avion in historia
+    assert 0 not in historia and len(original.datos) + 1 not in historia
+    with pytest.raises(KeyError):
+        historia[len(original.datos) + 1]
+
+
+@pytest.mark.parametrize("clases", [None, ("prioritario", "normal")])
+def test_desde_tabla_al_azar(clases):
+    historia, original = _misma_corrida_al_azar(2, clases)
+    rearmada = historia_vuelos.desde_tabla(historia.tabla())
+    assert rearmada.tabla().equals(historia.tabla())
+    assert dict(rearmada.items()) == original.datos
+    assert rearmada.resumen.tabla().equals(historia.resumen.tabla())
+
+
+@pytest.mark.parametrize("lam, seed", [(0.1, 1), (0.5, 7), (1.0, 2025)])
+def test_desde_tabla_de_una_corrida(simular, lam, seed):
+    historia = simular(lam, 300, seed = seed, inicio_tormenta = 100)["historia"]
+    rearmada = historia_vuelos.desde_tabla(historia.tabla())
+    assert rearmada.tabla().equals(historia.tabla())
+    assert dict(rearmada.items()) == dict(historia.items())
+    assert rearmada.resumen.tabla().equals(historia.resumen.tabla())
+
+
+def test_desde_tabla_con_clases():
+    historia = simular_con_historia_prioritarios(0.5, 300, seed = 3, clases = clases_aep())["historia"]
+    rearmada = historia_vuelos.desde_tabla(historia.tabla())
+    assert rearmada.clases == historia.clases == ("sanitario", "combustible", "regular", "general")
+    assert rearmada.tabla().equals(historia.tabla())
+    assert dict(rearmada.items()) == dict(historia.items())
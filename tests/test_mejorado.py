@@ -0,0 +1,46 @@
+import pytest
+from politicas import politica_mejorada
+from simulacion_mejorado import simular_con_historia_v2
+from analisis import MetricasSimulacion
+
+# ============================================================
+# TECHO ESCALONADO DE LA MEJORA: LA TABLA DE REBAJAS DEL MINUTO Y LA MIRADA A LA CABEZA DE LA FILA
+# DAN LO MISMO QUE LA CUENTA DIRECTA v_max - min(posición, i_max) · delta CON LA POSICIÓN EN LA FILA
+# ============================================================
+
+CASOS = [
+    # (λ, seed, día ventoso, inicio tormenta, congestión de control total y máxima: VALORES DEL CÓDIGO ORIGINAL)
+    (0.1, 1, False, None, 131, 3),
+    (0.5, 7, True, 120, 443, 3),
+    (1.0, 2025, True, None, 495, 3),
+]
+
+
+@pytest.mark.parametrize("lam, seed, dia_ventoso, inicio_tormenta, total, maxima", CASOS)
+def test_techo_igual_a_la_cuenta_directa(monkeypatch, lam, seed, dia_ventoso, inicio_tormenta, total, maxima):
+    techo = politica_mejorada.techo
+    consultas = []
+
+    def techo_revisado(self, avion, posicion = None):
+        valor = techo(self, avion, posicion)
+        if posicion is None and self.delta > 0:
+            pos = avion.espacio.fila.get_index(avion)
+            assert valor == max(avion.v_min, avion.v_max - min(pos, self.i_max) * self.delta)
+            consultas.append(pos)
+        return valor
+
+    monkeypatch.setattr(politica_mejorada, "techo", techo_revisado)
+    sim_data = simular_con_historia_v2(lam, 300, seed = seed, dia_ventoso = dia_ventoso, inicio_tormenta = inicio_tormenta,
+                                       metricas = MetricasSimulacion())
+    assert consultas and max(consultas) > politica_mejorada().nivel_fuerte[1]
+    assert sum(sim_data["congestion_control"]) == total
+    assert max(sim_data["congestion_control"]) == maxima
+
+
+def test_control_a_medida():
+    # SIN NIVELES (delta = 0) EL TECHO ES SIEMPRE v_max: LA CONGESTIÓN DE CONTROL ES LA DEL REPORTE
+    apagado = {"nivel_fuerte": (0.0, 4), "nivel_suave": (0.0, 3)}
+    politica = politica_mejorada(**apagado)
+    assert politica_mejorada(**politica.control()).control() == politica.control()
+    sim_data = simular_con_historia_v2(0.5, 300, seed = 7, metricas = MetricasSimulacion(), control = apagado)
+    assert list(sim_data["congestion_control"]) == list(sim_data["congestion"])
@@ -0,0 +1,33 @@
+from concurrent.futures import ProcessPoolExecutor
+import pytest
+
+# ============================================================
+# correr_experimentos EN PARALELO (n_workers / executor): LAS MISMAS FILAS, EN EL MISMO ORDEN,
+# Y LAS MISMAS MÉTRICAS QUE EN SERIE
+# ============================================================
+
+VARIANTES = {"normal": {}, "mejora": {"mejora": True}, "prioritario": {"p_prioritario": 0.2}}
+
+
+def _sin_historia(df):
+    return df.drop(columns = "historia", errors = "ignore")
+
+
+@pytest.mark.parametrize("record", ["full", "summary"])
+@pytest.mark.parametrize("variante", list(VARIANTES))
+def test_con_n_workers_igual_que_en_serie(correr, variante, record):
+    kwargs = dict(n_rep = 5, dia_ventoso = True, hay_tormenta = True, record = record, **VARIANTES[variante])
+    serie, metricas_serie = correr(**kwargs)
+    paralelo, metricas_paralelo = correr(n_workers = 2, **kwargs)
+    assert _sin_historia(paralelo).equals(_sin_historia(serie))
+    assert metricas_paralelo == metricas_serie
+
+
+def test_con_executor_propio_igual_que_en_serie(correr):
+    serie, metricas_serie = correr(n_rep = 5, dia_ventoso = True, record = "full")
+    with ProcessPoolExecutor(max_workers = 2) as executor:
+        paralelo, metricas_paralelo = correr(n_rep = 5, dia_ventoso = True, record = "full", executor = executor)
+        # EL EXECUTOR ES DE QUIEN LO PASÓ: correr_experimentos NO LO CIERRA
+        assert executor.submit(int, "3").result() == 3
+    assert _sin_historia(paralelo).equals(_sin_historia(serie))
+    assert metricas_paralelo == metricas_serie
@@ -0,0 +1,40 @@
+import inspect
+import pytest
+from analisis import MetricasSimulacion, calcular_atraso_promedio, tiempo_ideal
+
+# ============================================================
+# EL MOTOR ÚNICO CON POLÍTICAS DA LAS MISMAS CORRIDAS QUE LAS TRES CLASES DE AVIÓN ORIGINALES
+# VALORES FIJADOS CON EL CÓDIGO ORIGINAL (plane.py, plane_mejorado.py, plane_prioritarios.py),
+# 300 MINUTOS, p_prioritario = 0.2:
+# (aterrizajes, aviones, reinserciones, desvíos a Montevideo, congestión total, atraso promedio)
+# ============================================================
+
+ESPERADOS = [
+    ("normal", 0.1, 1, False, None, 30, 34, 38, 0, 134, 10.8),
+    ("normal", 0.5, 7, True, 120, 26, 154, 148, 119, 639, 12.523076923),
+    ("normal", 1.0, 2025, True, None, 30, 300, 66, 261, 729, -1.366666667),
+    ("mejora", 0.1, 1, False, None, 30, 34, 40, 0, 170, 14.133333333),
+    ("mejora", 0.5, 7, True, 120, 32, 158, 75, 117, 947, 3.88125),
+    ("mejora", 1.0, 2025, True, None, 43, 300, 51, 249, 1383, 0.6),
+    ("prioritario", 0.1, 1, False, None, 28, 31, 2, 0, 87, -0.364285714),
+    ("prioritario", 0.5, 7, True, 120, 98, 153, 20, 33, 2426, 6.365306122),
+    ("prioritario", 1.0, 2025, True, None, 168, 300, 36, 108, 3737, 2.921428571),
+]
+
+
+@pytest.mark.parametrize("caso, lam, seed, dia_ventoso, inicio_tormenta, aterrizajes, aviones, reinserciones, montevideo, congestion, atraso",
+                         ESPERADOS)
+def test_igual_al_modelo_original(simular, caso, lam, seed, dia_ventoso, inicio_tormenta, aterrizajes, aviones,
+                                  reinserciones, montevideo, congestion, atraso):
+    metricas = MetricasSimulacion()
+    sim_data = simular(lam, 300, seed = seed, dia_ventoso = dia_ventoso, inicio_tormenta = inicio_tormenta, metricas = metricas)
+    resumen = metricas.resumen()
+    assert (resumen["aterrizajes"], resumen["aviones"], resumen["reinserciones"], resumen["desvios_montevideo"]) == \
+        (aterrizajes, aviones, reinserciones, montevideo)
+    assert int(sum(sim_data["congestion"])) == congestion
+    assert calcular_atraso_promedio(sim_data, tiempo_ideal()) == pytest.approx(atraso, abs = 1e-8)
+
+
+def test_sin_metricas_compartidas_por_defecto(simular):
+    # UN MetricasSimulacion() COMO VALOR POR DEFECTO SERÍA EL MISMO OBJETO EN TODAS LAS LLAMADAS
+    assert inspect.signature(simular).parameters["metricas"].default is None
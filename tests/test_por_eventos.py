@@ -0,0 +1,25 @@
+import numpy as np
+import pytest
+from analisis import MetricasSimulacion
+from conftest import CONTADORES
+
+# ============================================================
+# MODO POR EVENTOS (por_eventos = True): SALTA LOS MINUTOS SIN AVIONES Y DA LA MISMA CORRIDA
+# ============================================================
+
+
+def _correr(simular, lam, seed, inicio_tormenta, por_eventos):
+    metricas = MetricasSimulacion()
+    sim_data = simular(lam, 400, seed = seed, dia_ventoso = True, inicio_tormenta = inicio_tormenta, metricas = metricas,
+                       por_eventos = por_eventos)
+    return sim_data, metricas.resumen()
+
+
+@pytest.mark.parametrize("lam, seed, inicio_tormenta", [(0.02, 1, None), (0.1, 7, 200), (0.5, 2025, None)])
+def test_misma_corrida_que_minuto_a_minuto(simular, lam, seed, inicio_tormenta):
+    por_minuto, metricas_minuto = _correr(simular, lam, seed, inicio_tormenta, False)
+    por_eventos, metricas_eventos = _correr(simular, lam, seed, inicio_tormenta, True)
+    assert metricas_eventos == metricas_minuto
+    for c in CONTADORES:
+        assert np.array_equal(por_eventos[c], por_minuto[c])
+    assert por_eventos["historia"].tabla().equals(por_minuto["historia"].tabla())
@@ -0,0 +1,66 @@
+import numpy as np
+import pytest
+from simulacion import simular_con_historia, simular_por_minuto
+from analisis import MetricasSimulacion
+from conftest import CONTADORES
+from estados import ESTADOS, ATERRIZO, MONTEVIDEO
+
+# ============================================================
+# simular_por_minuto: UNA FOTO POR MINUTO Y, AL TERMINAR, EL MISMO RESULTADO QUE simular_con_historia
+# ============================================================
+
+CASOS = [(0.02, 1, None), (0.5, 7, 120), (1.0, 2025, None)]
+
+
+def _fotos(lam, seed, inicio_tormenta, **kwargs):
+    pasos = simular_por_minuto(lam, 300, seed = seed, inicio_tormenta = inicio_tormenta, **kwargs)
+    fotos = []
+    while True:
+        try:
+            fotos.append(next(pasos))
+        except StopIteration as fin:
+            return fotos, fin.value
+
+
+def _misma_foto(a, b):
+    assert a.t == b.t
+    for campo in ("id", "x", "v", "vmax", "estado"):
+        assert np.array_equal(getattr(a, campo), getattr(b, campo))
+    assert [getattr(a, c) for c in CONTADORES] == [getattr(b, c) for c in CONTADORES]
+
+
+@pytest.mark.parametrize("lam, seed, inicio_tormenta", CASOS)
+def test_resultado_igual_a_simular_con_historia(lam, seed, inicio_tormenta):
+    metricas_fotos, metricas_historia = MetricasSimulacion(), MetricasSimulacion()
+    fotos, resultado = _fotos(lam, seed, inicio_tormenta, record = "full", metricas = metricas_fotos)
+    historia = simular_con_historia(lam, 300, seed = seed, inicio_tormenta = inicio_tormenta, metricas = metricas_historia)
+    assert metricas_fotos.resumen() == metricas_historia.resumen()
+    for c in CONTADORES:
+        assert np.array_equal(resultado[c], historia[c])
+    assert resultado["historia"].tabla().equals(historia["historia"].tabla())
+
+    # UNA FOTO POR MINUTO, CON LOS CONTADORES DE ESE MINUTO
+    assert [f.t for f in fotos] == list(range(300))
+    for c in CONTADORES:
+        assert [getattr(f, c) for f in fotos] == historia[c].tolist()
+
+    # EN LA ÚLTIMA FOTO ESTÁN LOS QUE NO ATERRIZARON NI SE FUERON A MONTEVIDEO
+    terminados = (ESTADOS[ATERRIZO], ESTADOS[MONTEVIDEO])
+    en_el_aire = {i for i, vuelo in historia["historia"].items() if vuelo["estado"][-1] not in terminados}
+    assert set(fotos[-1].id.tolist()) == en_el_aire
+
+
+@pytest.mark.parametrize("lam, seed, inicio_tormenta", CASOS)
+def test_mismas_fotos_con_cualquier_record_y_por_eventos(lam, seed, inicio_tormenta):
+    fotos, _ = _fotos(lam, seed, inicio_tormenta, record = "full")
+    for kwargs in ({"record": "off"}, {"record": "summary"}, {"por_eventos": True}):
+        otras, _ = _fotos(lam, seed, inicio_tormenta, **kwargs)
+        assert len(otras) == len(fotos)
+        for a, b in zip(fotos, otras):
+            _misma_foto(a, b)
+
+
+def test_fotos_de_solo_lectura():
+    foto = next(simular_por_minuto(0.5, 10, seed = 1))
+    with pytest.raises(ValueError):
+        foto.x[0] = 0.0
@@ -0,0 +1,46 @@
+import numpy as np
+import pytest
+from analisis import MetricasSimulacion, calcular_atraso_promedio, tiempo_ideal, analizar_montevideo
+from experimentos import correr_experimentos
+from conftest import CONTADORES
+
+# ============================================================
+# NIVELES DE DETALLE DE LA HISTORIA (record = "full" / "summary" / "off"):
+# LA CORRIDA ES LA MISMA, SOLO CAMBIA LO QUE SE GUARDA
+# ============================================================
+
+
+def _correr(simular, record):
+    metricas = MetricasSimulacion()
+    sim_data = simular(0.5, 300, seed = 7, dia_ventoso = True, inicio_tormenta = 120, metricas = metricas, record = record)
+    return sim_data, metricas.resumen()
+
+
+def test_misma_corrida_en_los_tres_niveles(simular):
+    full, metricas_full = _correr(simular, "full")
+    summary, metricas_summary = _correr(simular, "summary")
+    off, metricas_off = _correr(simular, "off")
+    assert metricas_full == metricas_summary == metricas_off
+    for c in CONTADORES:
+        assert np.array_equal(full[c], summary[c]) and np.array_equal(full[c], off[c])
+    assert summary["historia"] is None and off["historia"] is None and off["resumen"] is None
+
+    # EL RESUMEN ACUMULADO DURANTE LA CORRIDA ES EL QUE SALE DE LA HISTORIA COMPLETA
+    assert summary["resumen"].tabla().equals(full["historia"].resumen.tabla())
+    assert calcular_atraso_promedio(summary, tiempo_ideal()) == calcular_atraso_promedio(full, tiempo_ideal())
+    assert analizar_montevideo(summary) == analizar_montevideo(full)
+
+
+def test_experimentos_summary_igual_a_full():
+    lambdas = [0.1, 0.5]
+    dfs = {record: correr_experimentos(lambdas, n_rep = 3, minutos = 240, record = record,
+                                       metricas_lambda = {lam: MetricasSimulacion() for lam in lambdas})
+           for record in ("full", "summary")}
+    assert "historia" not in dfs["summary"]
+    assert dfs["full"].drop(columns = "historia").equals(dfs["summary"])
+
+
+@pytest.mark.parametrize("caso", ["normal"])
+def test_nivel_desconocido(simular):
+    with pytest.raises(ValueError, match = "record"):
+        _correr(simular, "todo")
@@ -0,0 +1,69 @@
+import numpy as np
+import pytest
+from analisis import tabla_aviones
+from resultados import guardar_resultados, cargar_resultados, leer_metricas, leer_historia, escenarios_guardados, historia_guardada
+
+# ============================================================
+# RESULTADOS GUARDADOS EN PARQUET / ARROW: LO QUE SE LEE ES LO QUE SE GUARDÓ
+# ============================================================
+
+SERIES = ("congestion", "congestion_control")
+CASOS = {"normal": {}, "mejora": {"mejora": True}, "prioritario": {"p_prioritario": 0.2}}
+
+
+@pytest.fixture(scope = "module")
+def experimentos(correr):
+    return {caso: correr(n_rep = 3, hay_tormenta = True, record = "full", **kwargs)[0] for caso, kwargs in CASOS.items()}
+
+
+@pytest.mark.parametrize("formato", ["parquet", "arrow"])
+@pytest.mark.parametrize("caso", list(CASOS))
+def test_ida_y_vuelta(tmp_path, experimentos, caso, formato):
+    df = experimentos[caso]
+    guardar_resultados(df, tmp_path, caso, formato)
+    leido = cargar_resultados(tmp_path, caso)
+
+    escalares = [c for c in df.columns if c != "historia" and c not in SERIES]
+    assert leido[escalares].equals(df[escalares])
+    for serie in SERIES:
+        if serie in df:
+            assert all(np.array_equal(a, b) for a, b in zip(leido[serie], df[serie]))
+
+    # LAS HISTORIAS SE LEEN RECIÉN AL USARLAS Y SON LAS MISMAS
+    assert all(isinstance(h, historia_guardada) and h._historia is None for h in leido["historia"])
+    for guardada, original in zip(leido["historia"], df["historia"]):
+        assert guardada.tabla().equals(original.tabla())
+    assert tabla_aviones(leido).equals(tabla_aviones(df))
+
+
+def test_lectura_parcial(tmp_path, experimentos):
+    df = experimentos["normal"]
+    guardar_resultados(df, tmp_path, "normal")
+    metricas = leer_metricas(tmp_path, "normal", columnas = ["atraso_prom"], lambdas = [0.5])
+    assert metricas.columns.tolist() == ["lambda", "rep", "atraso_prom"]
+    esperadas = df[df["lambda"] == 0.5][["lambda", "rep", "atraso_prom"]].reset_index(drop = True)
+    assert metricas.equals(esperadas)
+    fila = df.iloc[4]
+    assert leer_historia(tmp_path, "normal", fila["lambda"], fila["rep"]).tabla().equals(fila["historia"].tabla())
+
+
+def test_escenarios_y_reemplazo(tmp_path, experimentos):
+    guardar_resultados(experimentos["normal"], tmp_path, "a")
+    guardar_resultados(experimentos["mejora"], tmp_path, "b", "arrow")
+    assert escenarios_guardados(tmp_path) == ["a", "b"]
+    # VOLVER A GUARDAR UN ESCENARIO REEMPLAZA LO ANTERIOR (no se suman filas)
+    solo_summary = experimentos["normal"].drop(columns = "historia").head(2)
+    guardar_resultados(solo_summary, tmp_path, "a")
+    leido = cargar_resultados(tmp_path, "a")
+    assert len(leido) == 2 and "historia" not in leido
+
+
+def test_guardar_en_desde_experimentos(tmp_path, correr):
+    df, _ = correr(n_rep = 3, hay_tormenta = True, guardar_en = tmp_path)
+    assert escenarios_guardados(tmp_path) == ["normal-tormenta"]
+    assert cargar_resultados(tmp_path, "normal-tormenta").equals(df)
+
+
+def test_formato_desconocido(tmp_path, experimentos):
+    with pytest.raises(ValueError, match = "formato"):
+        guardar_resultados(experimentos["normal"], tmp_path, "a", "csv")
@@ -0,0 +1,85 @@
+import random
+import numpy as np
+import pytest
+from simulacion import simular_con_historia
+from simulacion_vectorizada import simular_con_historia_vectorizada, simular_lote_con_historia
+from analisis import MetricasSimulacion
+from conftest import CONTADORES
+
+# ============================================================
+# MOTOR VECTORIZADO (simulacion_vectorizada): LA MISMA CORRIDA QUE EL MOTOR DE OBJETOS
+# (misma historia, mismas series por minuto y mismas métricas)
+# ============================================================
+
+ESCENARIOS = [(False, None), (True, None), (False, 120), (True, 120)]   # (dia_ventoso, inicio_tormenta)
+
+
+def _misma_corrida(a, metricas_a, b, metricas_b):
+    assert metricas_a.resumen() == metricas_b.resumen()
+    assert metricas_a.reinserciones_unicas == metricas_b.reinserciones_unicas
+    for c in CONTADORES:
+        assert np.array_equal(a[c], b[c])
+    assert a["historia"].tabla().equals(b["historia"].tabla())
+    assert a["resumen"].tabla().equals(b["resumen"].tabla())
+
+
+@pytest.mark.parametrize("dia_ventoso, inicio_tormenta", ESCENARIOS)
+@pytest.mark.parametrize("seed", [1, 2025])
+@pytest.mark.parametrize("lam", [0.1, 0.5, 1.0])
+def test_igual_al_motor_de_objetos(lam, seed, dia_ventoso, inicio_tormenta):
+    metricas_objetos, metricas_vectorizado = MetricasSimulacion(), MetricasSimulacion()
+    objetos = simular_con_historia(lam, 240, seed = seed, dia_ventoso = dia_ventoso, inicio_tormenta = inicio_tormenta,
+                                   metricas = metricas_objetos)
+    vectorizado = simular_con_historia_vectorizada(lam, 240, seed = seed, dia_ventoso = dia_ventoso,
+                                                   inicio_tormenta = inicio_tormenta, metricas = metricas_vectorizado)
+    _misma_corrida(objetos, metricas_objetos, vectorizado, metricas_vectorizado)
+
+
+def test_con_rng_igual_que_con_semilla():
+    # CON UN random.Random SE COPIA SU ESTADO: MISMA CORRIDA QUE CON LA SEMILLA Y EL GENERADOR NO AVANZA
+    rng = random.Random(7)
+    metricas_semilla, metricas_rng = MetricasSimulacion(), MetricasSimulacion()
+    con_semilla = simular_con_historia_vectorizada(0.5, 240, seed = 7, metricas = metricas_semilla)
+    con_rng = simular_con_historia_vectorizada(0.5, 240, rng = rng, metricas = metricas_rng)
+    _misma_corrida(con_semilla, metricas_semilla, con_rng, metricas_rng)
+    assert rng.getstate() == random.Random(7).getstate()
+
+
+# ============================================================
+# LOTE (simular_lote_con_historia / correr_experimentos(lote = True)): CADA RÉPLICA ES LA CORRIDA
+# DEL MOTOR DE OBJETOS CON SU SEMILLA, Y LAS MÉTRICAS SE ACUMULAN IGUAL
+# ============================================================
+
+@pytest.mark.parametrize("dia_ventoso, inicio_tormenta", ESCENARIOS)
+@pytest.mark.parametrize("lam", [0.1, 0.5, 1.0])
+def test_lote_igual_a_las_replicas(lam, dia_ventoso, inicio_tormenta):
+    seeds = [3, 4, 5]
+    metricas_objetos, metricas_lote = MetricasSimulacion(), MetricasSimulacion()
+    objetos = [simular_con_historia(lam, 240, seed = seed, dia_ventoso = dia_ventoso, inicio_tormenta = inicio_tormenta,
+                                    metricas = metricas_objetos) for seed in seeds]
+    lote = simular_lote_con_historia(lam, 240, seeds, dia_ventoso = dia_ventoso, inicio_tormenta = inicio_tormenta,
+                                     metricas = metricas_lote)
+    assert len(lote) == len(seeds)
+    assert metricas_lote.resumen() == metricas_objetos.resumen()
+    for a, b in zip(objetos, lote):
+        _misma_corrida(a, MetricasSimulacion(), b, MetricasSimulacion())
+
+
+@pytest.mark.parametrize("record", ["full", "summary"])
+@pytest.mark.parametrize("dia_ventoso, hay_tormenta", [(False, False), (True, True)])
+def test_experimentos_en_lote_igual_que_en_serie(correr, record, dia_ventoso, hay_tormenta):
+    kwargs = dict(lambdas = [0.1, 0.5, 1.0], n_rep = 4, seed = 3, dia_ventoso = dia_ventoso, hay_tormenta = hay_tormenta,
+                  record = record)
+    serie, metricas_serie = correr(**kwargs)
+    lote, metricas_lote = correr(lote = True, **kwargs)
+    assert metricas_lote == metricas_serie
+    if record == "full":
+        for a, b in zip(serie.pop("historia"), lote.pop("historia")):
+            assert a.tabla().equals(b.tabla())
+    assert lote.equals(serie)
+
+
+@pytest.mark.parametrize("variante", [{"mejora": True}, {"p_prioritario": 0.2}])
+def test_lote_solo_para_el_modelo_base(correr, variante):
+    with pytest.raises(ValueError, match = "lote"):
+        correr(n_rep = 2, lote = True, **variante)